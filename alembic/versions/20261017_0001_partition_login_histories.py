@@ -0,0 +1,72 @@
+"""partition login_histories by month
+
+Revision ID: 0001_login_history_partitions
+Revises:
+Create Date: 2026-10-17 00:00:00.000000
+
+Tables themselves are created by the application on startup; this revision
+only adds the MySQL partitioning. MySQL requires the partition column in
+every unique key, so the primary key becomes (id, login_at). Monthly
+partitions cover the oldest existing row through MONTHS_AHEAD months from
+now; later months are split off p_future by scripts/purge_login_history.py
+(LOGIN_HISTORY_PARTITION_MONTHS_AHEAD). The DDL helpers are copied here so
+the revision does not change when the application code does. The ALTER rebuilds the table:
+run it in a maintenance window on large tables. Other dialects keep a single
+table and are purged in batches.
+"""
+from collections.abc import Sequence
+from datetime import date, datetime, timezone
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0001_login_history_partitions"
+down_revision: str | None = None
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+MONTHS_AHEAD = 3
+FUTURE_PARTITION = "p_future"
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _partition_definitions(first_month: date, last_month: date) -> str:
+    parts = []
+    month = first_month
+    while month <= last_month:
+        upper = _add_months(month, 1)
+        parts.append(f"PARTITION p{month:%Y%m} VALUES LESS THAN ('{upper:%Y-%m-%d}')")
+        month = upper
+    parts.append(f"PARTITION {FUTURE_PARTITION} VALUES LESS THAN (MAXVALUE)")
+    return ", ".join(parts)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "mysql":
+        return
+
+    today = datetime.now(timezone.utc).date()
+    oldest = bind.execute(sa.text("SELECT MIN(login_at) FROM login_histories")).scalar()
+    first_month = (oldest.date() if oldest else today).replace(day=1)
+    last_month = _add_months(today.replace(day=1), MONTHS_AHEAD)
+
+    op.execute("ALTER TABLE login_histories DROP PRIMARY KEY, ADD PRIMARY KEY (id, login_at)")
+    op.execute(
+        "ALTER TABLE login_histories PARTITION BY RANGE COLUMNS(login_at) "
+        f"({_partition_definitions(first_month, last_month)})"
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "mysql":
+        return
+
+    op.execute("ALTER TABLE login_histories REMOVE PARTITIONING")
+    op.execute("ALTER TABLE login_histories DROP PRIMARY KEY, ADD PRIMARY KEY (id)")
@@ -1,12 +1,11 @@
-import redis.asyncio as aioredis
 from fastapi import APIRouter, Depends, Header, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import get_settings
 from app.core.rate_limit import limiter
 from app.dependencies.auth import CurrentUser, get_current_user
-from app.dependencies.database import get_db
-from app.dependencies.redis import get_redis
+from app.dependencies.database import get_db, get_recent_write_marker
+from app.dependencies.token_store import get_token_store
 from app.repositories.login_history import LoginHistoryRepository
 from app.repositories.user import UserRepository
 from app.repositories.user_device import UserDeviceRepository
@@ -22,6 +21,7 @@ from app.schemas.auth import (
 from app.schemas.common import APIResponse, MessageResponse
 from app.services.auth import AuthService
 from app.services.jwt import JWTService, get_jwt_service
+from app.services.read_routing import RecentWriteMarker
 from app.services.token_store import TokenStore
 
 settings = get_settings()
@@ -31,15 +31,17 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 def _get_auth_service(
     db: AsyncSession = Depends(get_db),
-    redis: aioredis.Redis = Depends(get_redis),
+    token_store: TokenStore = Depends(get_token_store),
     jwt_service: JWTService = Depends(get_jwt_service),
+    recent_writes: RecentWriteMarker = Depends(get_recent_write_marker),
 ) -> AuthService:
     return AuthService(
         user_repo=UserRepository(db),
         device_repo=UserDeviceRepository(db),
         history_repo=LoginHistoryRepository(db),
         jwt_service=jwt_service,
-        token_store=TokenStore(redis),
+        token_store=token_store,
+        recent_writes=recent_writes,
     )
 
 
@@ -125,8 +127,6 @@ async def logout(
     await service.logout(
         user_id=current_user.user_id,
         device_id=current_user.device_id,
-        access_token_jti=current_user.token_jti,
-        access_token_exp=current_user.token_exp,
     )
     trace_id = getattr(request.state, "request_id", None)
     return MessageResponse(
@@ -141,11 +141,7 @@ async def logout_all(
     current_user: CurrentUser = Depends(get_current_user),
     service: AuthService = Depends(_get_auth_service),
 ) -> APIResponse[LogoutAllResponse]:
-    count = await service.logout_all(
-        user_id=current_user.user_id,
-        access_token_jti=current_user.token_jti,
-        access_token_exp=current_user.token_exp,
-    )
+    count = await service.logout_all(user_id=current_user.user_id)
     trace_id = getattr(request.state, "request_id", None)
     return APIResponse(
         success=True,
@@ -1,14 +1,14 @@
-import redis.asyncio as aioredis
 from fastapi import APIRouter, Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.dependencies.auth import CurrentUser, get_current_user
-from app.dependencies.database import get_db
-from app.dependencies.redis import get_redis
+from app.dependencies.database import get_db, get_read_db, get_recent_write_marker
+from app.dependencies.token_store import get_token_store
 from app.repositories.user_device import UserDeviceRepository
 from app.schemas.common import APIResponse, MessageResponse
 from app.schemas.device import DeviceResponse
 from app.services.device import DeviceService
+from app.services.read_routing import RecentWriteMarker
 from app.services.token_store import TokenStore
 
 router = APIRouter(prefix="/users/me/devices", tags=["Devices"])
@@ -16,11 +16,25 @@ router = APIRouter(prefix="/users/me/devices", tags=["Devices"])
 
 def _get_device_service(
     db: AsyncSession = Depends(get_db),
-    redis: aioredis.Redis = Depends(get_redis),
+    token_store: TokenStore = Depends(get_token_store),
+    recent_writes: RecentWriteMarker = Depends(get_recent_write_marker),
 ) -> DeviceService:
     return DeviceService(
         device_repo=UserDeviceRepository(db),
-        token_store=TokenStore(redis),
+        token_store=token_store,
+        recent_writes=recent_writes,
+    )
+
+
+def _get_read_device_service(
+    db: AsyncSession = Depends(get_read_db),
+    token_store: TokenStore = Depends(get_token_store),
+    recent_writes: RecentWriteMarker = Depends(get_recent_write_marker),
+) -> DeviceService:
+    return DeviceService(
+        device_repo=UserDeviceRepository(db),
+        token_store=token_store,
+        recent_writes=recent_writes,
     )
 
 
@@ -28,7 +42,7 @@ def _get_device_service(
 async def list_devices(
     request: Request,
     current_user: CurrentUser = Depends(get_current_user),
-    service: DeviceService = Depends(_get_device_service),
+    service: DeviceService = Depends(_get_read_device_service),
 ) -> APIResponse[list[DeviceResponse]]:
     result = await service.get_devices(
         user_id=current_user.user_id,
@@ -0,0 +1,41 @@
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.dependencies.auth import CurrentUser, get_current_user
+from app.dependencies.database import get_read_db
+from app.repositories.login_history import LoginHistoryRepository
+from app.schemas.common import APIResponse
+from app.schemas.login_history import LoginHistoryPage
+from app.services.login_history import LoginHistoryService
+
+router = APIRouter(prefix="/users/me/login-history", tags=["Login History"])
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def _get_login_history_service(
+    db: AsyncSession = Depends(get_read_db),
+) -> LoginHistoryService:
+    return LoginHistoryService(history_repo=LoginHistoryRepository(db))
+
+
+@router.get("", response_model=APIResponse[LoginHistoryPage])
+async def list_login_history(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(None, max_length=200),
+    success: bool | None = Query(None),
+    device_id: str | None = Query(None, max_length=100),
+    current_user: CurrentUser = Depends(get_current_user),
+    service: LoginHistoryService = Depends(_get_login_history_service),
+) -> APIResponse[LoginHistoryPage]:
+    result = await service.get_history(
+        user_id=current_user.user_id,
+        limit=limit,
+        cursor=cursor,
+        success=success,
+        device_id=device_id,
+    )
+    trace_id = getattr(request.state, "request_id", None)
+    return APIResponse(success=True, data=result, trace_id=trace_id)
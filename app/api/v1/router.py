@@ -2,9 +2,11 @@ from fastapi import APIRouter
 
 from app.api.v1.auth import router as auth_router
 from app.api.v1.devices import router as devices_router
+from app.api.v1.login_history import router as login_history_router
 from app.api.v1.users import router as users_router
 
 api_v1_router = APIRouter(prefix="/api/v1")
 api_v1_router.include_router(auth_router)
 api_v1_router.include_router(users_router)
 api_v1_router.include_router(devices_router)
+api_v1_router.include_router(login_history_router)
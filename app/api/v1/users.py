@@ -1,10 +1,9 @@
-import redis.asyncio as aioredis
 from fastapi import APIRouter, Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.dependencies.auth import CurrentUser, get_current_user
-from app.dependencies.database import get_db
-from app.dependencies.redis import get_redis
+from app.dependencies.database import get_db, get_read_db, get_recent_write_marker
+from app.dependencies.token_store import get_token_store
 from app.repositories.user import UserRepository
 from app.repositories.user_device import UserDeviceRepository
 from app.schemas.common import APIResponse, MessageResponse
@@ -15,6 +14,7 @@ from app.schemas.user import (
     UserUpdateRequest,
     UserUpdateResponse,
 )
+from app.services.read_routing import RecentWriteMarker
 from app.services.token_store import TokenStore
 from app.services.user import UserService
 
@@ -23,12 +23,27 @@ router = APIRouter(prefix="/users", tags=["Users"])
 
 def _get_user_service(
     db: AsyncSession = Depends(get_db),
-    redis: aioredis.Redis = Depends(get_redis),
+    token_store: TokenStore = Depends(get_token_store),
+    recent_writes: RecentWriteMarker = Depends(get_recent_write_marker),
 ) -> UserService:
     return UserService(
         user_repo=UserRepository(db),
         device_repo=UserDeviceRepository(db),
-        token_store=TokenStore(redis),
+        token_store=token_store,
+        recent_writes=recent_writes,
+    )
+
+
+def _get_read_user_service(
+    db: AsyncSession = Depends(get_read_db),
+    token_store: TokenStore = Depends(get_token_store),
+    recent_writes: RecentWriteMarker = Depends(get_recent_write_marker),
+) -> UserService:
+    return UserService(
+        user_repo=UserRepository(db),
+        device_repo=UserDeviceRepository(db),
+        token_store=token_store,
+        recent_writes=recent_writes,
     )
 
 
@@ -36,7 +51,7 @@ def _get_user_service(
 async def get_me(
     request: Request,
     current_user: CurrentUser = Depends(get_current_user),
-    service: UserService = Depends(_get_user_service),
+    service: UserService = Depends(_get_read_user_service),
 ) -> APIResponse[UserResponse]:
     result = await service.get_me(current_user.user_id)
     trace_id = getattr(request.state, "request_id", None)
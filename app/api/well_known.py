@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends, Request, Response
+
+from app.core.config import get_settings
+from app.services.jwt import JWTService, get_jwt_service
+
+settings = get_settings()
+
+router = APIRouter(prefix="/.well-known", tags=["Well-Known"])
+
+
+@router.get("/jwks.json")
+async def jwks(
+    request: Request,
+    jwt_service: JWTService = Depends(get_jwt_service),
+) -> Response:
+    keyring = jwt_service.keyring
+    headers = {
+        "ETag": keyring.etag,
+        "Cache-Control": f"public, max-age={settings.jwks_cache_max_age_seconds}",
+    }
+    if request.headers.get("If-None-Match") == keyring.etag:
+        return Response(status_code=304, headers=headers)
+    return Response(
+        content=keyring.jwks_json,
+        media_type="application/json",
+        headers=headers,
+    )
@@ -0,0 +1,105 @@
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+from app.core.metrics import metrics
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, name: str, retry_after: float) -> None:
+        super().__init__(f"Circuit {name!r} is open")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Fails fast after ``failure_threshold`` consecutive failures.
+
+    While open, calls raise ``CircuitOpenError`` without touching the
+    dependency. After ``reset_timeout`` seconds one trial call is let through
+    (half-open); success closes the circuit, failure opens it again. Only
+    exceptions in ``failure_types`` count as failures; anything else passes
+    through and leaves the breaker as it was.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int,
+        reset_timeout: float,
+        failure_types: tuple[type[BaseException], ...] = (Exception,),
+    ) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failure_types = failure_types
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._state_gauge = metrics.gauge(
+            f"{name}_breaker_state", "0 = closed, 1 = half-open, 2 = open"
+        )
+        self._opened_total = metrics.counter(
+            f"{name}_breaker_opened_total", "Times the breaker tripped open"
+        )
+        self._rejected_total = metrics.counter(
+            f"{name}_breaker_rejected_total", "Calls failed fast while open"
+        )
+        self._state_gauge.set(0)
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            return HALF_OPEN
+        return self._state
+
+    def _set_state(self, state: str) -> None:
+        self._state = state
+        self._state_gauge.set(_STATE_VALUES[state])
+
+    def _admit(self) -> bool:
+        """Return True if this call is the half-open trial."""
+        state = self.state
+        if state == CLOSED:
+            return False
+        if state == HALF_OPEN and not self._trial_in_flight:
+            self._set_state(HALF_OPEN)
+            self._trial_in_flight = True
+            return True
+        self._rejected_total.inc()
+        retry_after = max(self.reset_timeout - (time.monotonic() - self._opened_at), 0.0)
+        raise CircuitOpenError(self.name, retry_after)
+
+    def record_success(self) -> None:
+        self._failures = 0
+        if self._state != CLOSED:
+            self._set_state(CLOSED)
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+            if self._state != OPEN:
+                self._opened_total.inc()
+            self._set_state(OPEN)
+
+    async def call(self, fn: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any) -> T:
+        trial = self._admit()
+        try:
+            result = await fn(*args, **kwargs)
+        except self.failure_types:
+            self.record_failure()
+            raise
+        finally:
+            if trial:
+                self._trial_in_flight = False
+        self.record_success()
+        return result
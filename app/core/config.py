@@ -1,5 +1,6 @@
 from functools import lru_cache
 from pathlib import Path
+from typing import Literal
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -28,9 +29,39 @@ class Settings(BaseSettings):
     database_pool_size: int = Field(default=10)
     database_max_overflow: int = Field(default=20)
     database_pool_timeout: int = Field(default=30)
+    # Read replica for read-only endpoints (unset = everything on the primary)
+    database_replica_url: str | None = None
+    database_replica_max_lag_seconds: float = 5.0  # reads stay on the primary after a write
+
+    # Login history write-behind: batch INSERTs off the request path
+    login_history_write_behind: bool = False
+    login_history_batch_size: int = 500
+    login_history_flush_interval_ms: int = 200
+    login_history_queue_size: int = 10000  # beyond this, rows are written in the request
+    login_history_retention_days: int = 180
+    login_history_partition_months_ahead: int = 3  # MySQL monthly partitions created ahead
+    login_history_purge_batch_size: int = 1000  # rows per DELETE where partitions aren't used
 
     # Redis
     redis_url: str = "redis://localhost:6379/0"
+    redis_cluster: bool = False
+    redis_key_scheme: Literal["legacy", "tagged"] = "legacy"
+    redis_legacy_key_fallback: bool = False  # migrate legacy keys on access (standalone only)
+    redis_max_connections: int = 50
+    redis_pool_timeout: float = 1.0  # wait for a free pooled connection
+    redis_socket_connect_timeout: float = 1.0
+    redis_socket_timeout: float = 0.5
+    redis_health_check_interval: int = 30
+    redis_breaker_failure_threshold: int = 5
+    redis_breaker_reset_seconds: float = 10.0
+    redis_revocation_fail_open: bool = False  # accept tokens when revocation can't be checked
+    blacklist_cache_enabled: bool = True
+    blacklist_cache_fallback: bool = True
+    token_store_backend: Literal["redis", "memory"] = "redis"
+    token_store_layout: Literal["keys", "hash"] = "keys"
+    token_store_dual_read: bool = False
+    max_sessions_per_user: int = 0  # 0 = unlimited
+    refresh_grace_seconds: int = 5  # 0 = every repeated refresh is treated as reuse
 
     # JWT
     jwt_issuer: str = "sample-auth-api"
@@ -40,9 +71,22 @@ class Settings(BaseSettings):
     jwt_private_key_path: Path = Path("keys/private.pem")
     jwt_public_key_path: Path = Path("keys/public.pem")
     jwt_algorithm: str = "RS256"
+    jwt_verification_keys_dir: Path | None = None
+    jwt_key_reload_interval_seconds: int = 30
+    jwks_cache_max_age_seconds: int = 300
+    jwt_verify_cache_size: int = 10000
+    jwt_executor_workers: int = 4
 
     # Security
+    password_hash_scheme: Literal["bcrypt", "argon2id"] = "bcrypt"
     bcrypt_rounds: int = 12
+    argon2_time_cost: int = 2
+    argon2_memory_cost: int = 19456  # KiB
+    argon2_parallelism: int = 1
+    password_hash_workers: int = 2
+    password_hash_queue_size: int = 64
+    password_hash_queue_timeout_seconds: float = 5.0
+    password_hash_retry_after_seconds: int = 1
     cors_origins: list[str] = ["http://localhost:3000", "http://localhost:8080"]
 
     # Rate Limiting
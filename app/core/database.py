@@ -1,26 +1,57 @@
 from typing import Any
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import DeclarativeBase
 
 from app.core.config import get_settings
 
 settings = get_settings()
 
-_is_sqlite = settings.database_url.startswith("sqlite")
 
-engine_kwargs: dict[str, Any] = {
-    "echo": settings.debug,
+def _engine_kwargs(url: str) -> dict[str, Any]:
+    kwargs: dict[str, Any] = {
+        "echo": settings.debug,
+    }
+    if not url.startswith("sqlite"):
+        kwargs.update(
+            pool_pre_ping=True,
+            pool_size=settings.database_pool_size,
+            max_overflow=settings.database_max_overflow,
+            pool_timeout=settings.database_pool_timeout,
+        )
+    return kwargs
+
+
+# Run on every new replica connection, so a write routed there fails instead
+# of diverging from the primary.
+_READ_ONLY_STATEMENTS = {
+    "mysql": "SET SESSION TRANSACTION READ ONLY",
+    "postgresql": "SET SESSION default_transaction_read_only = on",
+    "sqlite": "PRAGMA query_only = ON",
 }
-if not _is_sqlite:
-    engine_kwargs.update(
-        pool_pre_ping=True,
-        pool_size=settings.database_pool_size,
-        max_overflow=settings.database_max_overflow,
-        pool_timeout=settings.database_pool_timeout,
-    )
 
-engine = create_async_engine(settings.database_url, **engine_kwargs)
+
+def enforce_read_only(read_engine: AsyncEngine) -> AsyncEngine:
+    statement = _READ_ONLY_STATEMENTS.get(read_engine.dialect.name)
+    if statement is None:
+        raise RuntimeError(f"Cannot make a {read_engine.dialect.name} replica read-only")
+
+    @event.listens_for(read_engine.sync_engine, "connect")
+    def _set_read_only(dbapi_connection: Any, connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        cursor.execute(statement)
+        cursor.close()
+
+    return read_engine
+
+
+engine = create_async_engine(settings.database_url, **_engine_kwargs(settings.database_url))
 
 async_session_factory = async_sessionmaker(
     engine,
@@ -28,6 +59,33 @@ async_session_factory = async_sessionmaker(
     expire_on_commit=False,
 )
 
+# Read-only endpoints run on the replica when one is configured. Connections
+# are in autocommit, so every SELECT is its own implicit read-only transaction
+# (no BEGIN/COMMIT round trips and no snapshot held open between statements),
+# and the session itself is read-only.
+replica_engine = (
+    enforce_read_only(
+        create_async_engine(
+            settings.database_replica_url,
+            isolation_level="AUTOCOMMIT",
+            **_engine_kwargs(settings.database_replica_url),
+        )
+    )
+    if settings.database_replica_url
+    else None
+)
+
+replica_session_factory = (
+    async_sessionmaker(
+        replica_engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autoflush=False,
+    )
+    if replica_engine is not None
+    else None
+)
+
 
 class Base(DeclarativeBase):
     pass
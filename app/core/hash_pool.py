@@ -0,0 +1,139 @@
+import asyncio
+import multiprocessing
+import os
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, TypeVar
+
+from app.core.config import get_settings
+from app.core.metrics import metrics
+from app.exceptions.system import ServerBusyError
+
+settings = get_settings()
+
+T = TypeVar("T")
+
+_queue_depth = metrics.gauge("password_hash_queue_depth", "Hash jobs waiting for a worker")
+_in_flight = metrics.gauge("password_hash_in_flight", "Hash jobs running on a worker")
+_wait_seconds = metrics.summary("password_hash_wait_seconds", "Time spent queued before running")
+_jobs_total = metrics.counter("password_hash_jobs_total", "Hash jobs executed")
+_rejected_total = metrics.counter("password_hash_rejected_total", "Hash jobs rejected by admission")
+
+
+def _worker_context() -> multiprocessing.context.BaseContext:
+    # Workers start lazily, after the JWT signing threads and the event loop
+    # exist; forking a multi-threaded process can copy a held lock into the
+    # child and deadlock it. A forkserver (spawn where unavailable) starts
+    # them from a clean single-threaded process instead.
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(method)
+
+
+class PasswordHashPool:
+    """Runs CPU-bound password hashing outside the event loop.
+
+    Jobs are handed to a process pool so bcrypt work never blocks the worker's
+    event loop. At most ``max_in_flight`` jobs (the worker count by default)
+    run at once and at most ``queue_size`` wait behind them; anything beyond
+    that, or anything that waits longer than ``queue_timeout`` seconds, is
+    rejected with ``ServerBusyError`` so callers fail fast instead of holding
+    connections open.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        queue_size: int,
+        queue_timeout: float = 5.0,
+        retry_after: int = 1,
+        max_in_flight: int | None = None,
+    ) -> None:
+        self.workers = workers
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self._executor: Executor | None = (
+            ProcessPoolExecutor(max_workers=workers, mp_context=_worker_context())
+            if workers > 0
+            else None
+        )
+        if max_in_flight is None:
+            max_in_flight = workers if workers > 0 else (os.cpu_count() or 1)
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._waiting = 0
+
+    @property
+    def queue_depth(self) -> int:
+        return self._waiting
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        await self._admit()
+        try:
+            _in_flight.inc()
+            _jobs_total.inc()
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, fn, *args)
+        finally:
+            _in_flight.dec()
+            self._slots.release()
+
+    async def _admit(self) -> None:
+        if self._slots.locked() and self._waiting >= self.queue_size:
+            _rejected_total.inc()
+            raise ServerBusyError(retry_after=self.retry_after)
+
+        self._waiting += 1
+        _queue_depth.inc()
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+        except TimeoutError:
+            _rejected_total.inc()
+            raise ServerBusyError(retry_after=self.retry_after) from None
+        finally:
+            self._waiting -= 1
+            _queue_depth.dec()
+            _wait_seconds.observe(time.perf_counter() - started)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+hash_pool: PasswordHashPool | None = None
+
+# Used until init_hash_pool() runs (e.g. tests without lifespan): jobs go to the
+# loop's default thread executor, which still keeps them off the event loop.
+_fallback_pool: PasswordHashPool | None = None
+
+
+def _create_pool(workers: int) -> PasswordHashPool:
+    return PasswordHashPool(
+        workers=workers,
+        queue_size=settings.password_hash_queue_size,
+        queue_timeout=settings.password_hash_queue_timeout_seconds,
+        retry_after=settings.password_hash_retry_after_seconds,
+    )
+
+
+def init_hash_pool() -> PasswordHashPool:
+    global hash_pool
+    hash_pool = _create_pool(settings.password_hash_workers)
+    return hash_pool
+
+
+def close_hash_pool() -> None:
+    global hash_pool
+    if hash_pool:
+        hash_pool.shutdown()
+        hash_pool = None
+
+
+def get_hash_pool() -> PasswordHashPool:
+    global _fallback_pool
+    if hash_pool is not None:
+        return hash_pool
+    if _fallback_pool is None:
+        _fallback_pool = _create_pool(workers=0)
+    return _fallback_pool
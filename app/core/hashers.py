@@ -0,0 +1,85 @@
+from abc import ABC, abstractmethod
+
+import bcrypt
+from argon2 import PasswordHasher as _Argon2PasswordHasher
+from argon2 import Type
+from argon2.exceptions import InvalidHashError, VerificationError
+
+
+class PasswordHasher(ABC):
+    scheme: str
+
+    @abstractmethod
+    def hash(self, password: str) -> str: ...
+
+    @abstractmethod
+    def verify(self, password: str, hashed: str) -> bool: ...
+
+    @abstractmethod
+    def identify(self, hashed: str) -> bool:
+        """Return True if ``hashed`` was produced by this scheme."""
+
+    @abstractmethod
+    def needs_rehash(self, hashed: str) -> bool:
+        """Return True if ``hashed`` uses parameters other than the configured ones."""
+
+
+class BcryptHasher(PasswordHasher):
+    scheme = "bcrypt"
+    _prefixes = ("$2a$", "$2b$", "$2y$")
+
+    def __init__(self, rounds: int) -> None:
+        self.rounds = rounds
+
+    def hash(self, password: str) -> str:
+        return bcrypt.hashpw(password.encode(), bcrypt.gensalt(self.rounds)).decode()
+
+    def verify(self, password: str, hashed: str) -> bool:
+        try:
+            return bcrypt.checkpw(password.encode(), hashed.encode())
+        except ValueError:
+            return False
+
+    def identify(self, hashed: str) -> bool:
+        return hashed.startswith(self._prefixes)
+
+    def needs_rehash(self, hashed: str) -> bool:
+        # $2b$12$<salt+digest>
+        try:
+            rounds = int(hashed[4:6])
+        except ValueError:
+            return True
+        return not hashed.startswith("$2b$") or rounds != self.rounds
+
+
+class Argon2idHasher(PasswordHasher):
+    scheme = "argon2id"
+
+    def __init__(self, time_cost: int, memory_cost: int, parallelism: int) -> None:
+        self.time_cost = time_cost
+        self.memory_cost = memory_cost
+        self.parallelism = parallelism
+        self._hasher = _Argon2PasswordHasher(
+            time_cost=time_cost,
+            memory_cost=memory_cost,
+            parallelism=parallelism,
+            type=Type.ID,
+        )
+
+    def hash(self, password: str) -> str:
+        return self._hasher.hash(password)
+
+    def verify(self, password: str, hashed: str) -> bool:
+        try:
+            return self._hasher.verify(hashed, password)
+        except (VerificationError, InvalidHashError):
+            return False
+
+    def identify(self, hashed: str) -> bool:
+        return hashed.startswith("$argon2id$")
+
+    def needs_rehash(self, hashed: str) -> bool:
+        try:
+            return self._hasher.check_needs_rehash(hashed)
+        except InvalidHashError:
+            return True
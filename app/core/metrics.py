@@ -0,0 +1,88 @@
+"""In-process metrics registry exposed at ``GET /metrics``.
+
+Values are per worker process; scrape every worker (or aggregate in the
+collector) for fleet-wide numbers.
+"""
+from typing import Any
+
+
+class Counter:
+    def __init__(self, description: str) -> None:
+        self.description = description
+        self.value = 0
+
+    def inc(self, amount: int = 1) -> None:
+        self.value += amount
+
+    def snapshot(self) -> dict[str, Any]:
+        return {"type": "counter", "value": self.value}
+
+
+class Gauge:
+    def __init__(self, description: str) -> None:
+        self.description = description
+        self.value: float = 0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        self.value -= amount
+
+    def snapshot(self) -> dict[str, Any]:
+        return {"type": "gauge", "value": self.value}
+
+
+class Summary:
+    def __init__(self, description: str) -> None:
+        self.description = description
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "type": "summary",
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "avg": round(self.sum / self.count, 6) if self.count else 0.0,
+            "max": round(self.max, 6),
+        }
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, Counter | Gauge | Summary] = {}
+
+    def counter(self, name: str, description: str = "") -> Counter:
+        return self._get_or_create(name, Counter, description)
+
+    def gauge(self, name: str, description: str = "") -> Gauge:
+        return self._get_or_create(name, Gauge, description)
+
+    def summary(self, name: str, description: str = "") -> Summary:
+        return self._get_or_create(name, Summary, description)
+
+    def _get_or_create(self, name: str, kind: type, description: str) -> Any:
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = kind(description)
+            self._metrics[name] = metric
+        elif not isinstance(metric, kind):
+            raise TypeError(f"Metric {name!r} already registered as {type(metric).__name__}")
+        return metric
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        return {name: metric.snapshot() for name, metric in sorted(self._metrics.items())}
+
+
+metrics = MetricsRegistry()
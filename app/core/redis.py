@@ -1,32 +1,97 @@
+import time
 from collections.abc import AsyncGenerator
+from typing import Any
 
 import redis.asyncio as aioredis
+from redis.asyncio.cluster import RedisCluster
+from redis.asyncio.connection import BlockingConnectionPool
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import TimeoutError as RedisTimeoutError
 
+from app.core.circuit_breaker import CircuitBreaker
 from app.core.config import get_settings
+from app.core.metrics import metrics
 
 settings = get_settings()
 
-redis_client: aioredis.Redis | None = None
+_pool_wait_seconds = metrics.summary(
+    "redis_pool_wait_seconds", "Time spent waiting for a pooled Redis connection"
+)
+_pool_in_use = metrics.gauge("redis_pool_in_use", "Redis connections checked out of the pool")
 
 
-async def init_redis() -> aioredis.Redis:
+class InstrumentedConnectionPool(BlockingConnectionPool):
+    """Blocking pool that waits at most ``timeout`` seconds for a free connection
+    and records how long callers waited."""
+
+    async def get_connection(self, *args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        connection = await super().get_connection(*args, **kwargs)
+        _pool_wait_seconds.observe(time.perf_counter() - start)
+        _pool_in_use.set(len(self._in_use_connections))
+        return connection
+
+    async def release(self, connection: Any) -> None:
+        await super().release(connection)
+        _pool_in_use.set(len(self._in_use_connections))
+
+
+# Standalone Redis, or Redis Cluster when REDIS_CLUSTER is set
+type RedisClient = aioredis.Redis | RedisCluster
+
+redis_client: RedisClient | None = None
+redis_breaker = CircuitBreaker(
+    "redis",
+    failure_threshold=settings.redis_breaker_failure_threshold,
+    reset_timeout=settings.redis_breaker_reset_seconds,
+    failure_types=(RedisConnectionError, RedisTimeoutError, TimeoutError),
+)
+
+
+async def init_redis() -> RedisClient:
     global redis_client
-    redis_client = aioredis.from_url(
+    if settings.redis_cluster:
+        if settings.redis_key_scheme != "tagged" or settings.redis_legacy_key_fallback:
+            raise RuntimeError(
+                "Redis Cluster needs REDIS_KEY_SCHEME=tagged without legacy key fallback"
+            )
+        # The cluster client keeps a pool per node; max_connections applies to each.
+        redis_client = RedisCluster.from_url(
+            settings.redis_url,
+            decode_responses=True,
+            encoding="utf-8",
+            max_connections=settings.redis_max_connections,
+            socket_connect_timeout=settings.redis_socket_connect_timeout,
+            socket_timeout=settings.redis_socket_timeout,
+            health_check_interval=settings.redis_health_check_interval,
+        )
+        await redis_client.initialize()
+        return redis_client
+
+    pool = InstrumentedConnectionPool.from_url(
         settings.redis_url,
         decode_responses=True,
         encoding="utf-8",
+        max_connections=settings.redis_max_connections,
+        timeout=settings.redis_pool_timeout,
+        socket_connect_timeout=settings.redis_socket_connect_timeout,
+        socket_timeout=settings.redis_socket_timeout,
+        health_check_interval=settings.redis_health_check_interval,
     )
+    redis_client = aioredis.Redis(connection_pool=pool)
     return redis_client
 
 
 async def close_redis() -> None:
     global redis_client
-    if redis_client:
-        await redis_client.close()
-        redis_client = None
+    if isinstance(redis_client, RedisCluster):
+        await redis_client.aclose()
+    elif redis_client:
+        await redis_client.aclose(close_connection_pool=True)
+    redis_client = None
 
 
-async def get_redis() -> AsyncGenerator[aioredis.Redis, None]:
+async def get_redis() -> AsyncGenerator[RedisClient, None]:
     if redis_client is None:
         raise RuntimeError("Redis not initialized. Call init_redis() first.")
     yield redis_client
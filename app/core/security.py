@@ -1,22 +1,52 @@
-from passlib.context import CryptContext
-
 from app.core.config import get_settings
+from app.core.hash_pool import get_hash_pool
+from app.core.hashers import Argon2idHasher, BcryptHasher, PasswordHasher
 
 settings = get_settings()
 
-pwd_context = CryptContext(
-    schemes=["bcrypt"],
-    deprecated="auto",
-    bcrypt__rounds=settings.bcrypt_rounds,
-)
+# Every known scheme stays registered so hashes written under a previous
+# setting keep verifying; new hashes always use ``password_hash_scheme``.
+hashers: dict[str, PasswordHasher] = {
+    "bcrypt": BcryptHasher(rounds=settings.bcrypt_rounds),
+    "argon2id": Argon2idHasher(
+        time_cost=settings.argon2_time_cost,
+        memory_cost=settings.argon2_memory_cost,
+        parallelism=settings.argon2_parallelism,
+    ),
+}
+
+password_hasher = hashers[settings.password_hash_scheme]
 
 # Pre-computed dummy hash for constant-time login checks
-DUMMY_HASH = pwd_context.hash("dummy-constant-time-check")
+DUMMY_HASH = password_hasher.hash("dummy-constant-time-check")
+
+
+def _identify(hashed_password: str) -> PasswordHasher | None:
+    for hasher in hashers.values():
+        if hasher.identify(hashed_password):
+            return hasher
+    return None
 
 
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return password_hasher.hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    hasher = _identify(hashed_password)
+    if hasher is None:
+        return False
+    return hasher.verify(plain_password, hashed_password)
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    hasher = _identify(hashed_password)
+    return hasher is not password_hasher or password_hasher.needs_rehash(hashed_password)
+
+
+async def hash_password_async(password: str) -> str:
+    return await get_hash_pool().run(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await get_hash_pool().run(verify_password, plain_password, hashed_password)
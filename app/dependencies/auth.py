@@ -1,11 +1,10 @@
 from dataclasses import dataclass
 from datetime import datetime
 
-import redis.asyncio as aioredis
 from fastapi import Depends, Header
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
-from app.dependencies.redis import get_redis
+from app.dependencies.token_store import get_token_store
 from app.exceptions.auth import DeviceMismatchError, TokenRevokedError
 from app.services.jwt import AccessTokenPayload, JWTService, get_jwt_service
 from app.services.token_store import TokenStore
@@ -26,18 +25,19 @@ class CurrentUser:
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     x_device_id: str = Header(..., alias="X-Device-Id"),
-    redis: aioredis.Redis = Depends(get_redis),
+    token_store: TokenStore = Depends(get_token_store),
     jwt_service: JWTService = Depends(get_jwt_service),
 ) -> CurrentUser:
     token = credentials.credentials
 
-    payload: AccessTokenPayload = jwt_service.decode_access_token(token)
+    payload: AccessTokenPayload = await jwt_service.decode_access_token_async(token)
 
     if payload.device_id != x_device_id:
         raise DeviceMismatchError()
 
-    token_store = TokenStore(redis)
-    if await token_store.is_token_blacklisted(payload.jti):
+    if await token_store.is_access_token_revoked(
+        payload.jti, payload.sub, payload.device_id, payload.iat
+    ):
         raise TokenRevokedError()
 
     return CurrentUser(
@@ -1,8 +1,29 @@
 from collections.abc import AsyncGenerator
 
+from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core import database as database_module
+from app.core import redis as redis_module
+from app.core.config import get_settings
 from app.core.database import async_session_factory
+from app.core.metrics import metrics
+from app.dependencies.auth import CurrentUser, get_current_user
+from app.exceptions.system import TokenStoreUnavailableError
+from app.services.read_routing import (
+    RecentWriteMarker,
+    RedisRecentWriteMarker,
+    get_memory_recent_write_marker,
+)
+
+settings = get_settings()
+
+_replica_reads_total = metrics.counter(
+    "db_replica_reads_total", "Read-only requests served by the read replica"
+)
+_primary_reads_total = metrics.counter(
+    "db_primary_reads_total", "Read-only requests kept on the primary after a recent write"
+)
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
@@ -13,3 +34,44 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         except Exception:
             await session.rollback()
             raise
+
+
+def get_recent_write_marker() -> RecentWriteMarker:
+    if settings.token_store_backend == "memory":
+        return get_memory_recent_write_marker()
+    if redis_module.redis_client is None:
+        raise RuntimeError("Redis not initialized")
+    return RedisRecentWriteMarker(redis_module.redis_client, breaker=redis_module.redis_breaker)
+
+
+async def get_read_db(
+    current_user: CurrentUser = Depends(get_current_user),
+    recent_writes: RecentWriteMarker = Depends(get_recent_write_marker),
+    primary: AsyncSession = Depends(get_db),
+) -> AsyncGenerator[AsyncSession, None]:
+    """Session for read-only endpoints.
+
+    Served by the read replica when ``DATABASE_REPLICA_URL`` is set, unless
+    the user wrote within ``database_replica_max_lag_seconds`` (read your own
+    writes) or that cannot be checked; those reads, and every read without a
+    replica, use the primary session. The primary session only connects if
+    it is used.
+    """
+    replica_factory = database_module.replica_session_factory
+    if replica_factory is None:
+        yield primary
+        return
+    if await _has_recent_write(recent_writes, current_user.user_id):
+        _primary_reads_total.inc()
+        yield primary
+        return
+    _replica_reads_total.inc()
+    async with replica_factory() as session:
+        yield session
+
+
+async def _has_recent_write(recent_writes: RecentWriteMarker, user_id: str) -> bool:
+    try:
+        return await recent_writes.is_marked(user_id)
+    except TokenStoreUnavailableError:
+        return True
@@ -1,11 +1,10 @@
 from collections.abc import AsyncGenerator
 
-import redis.asyncio as aioredis
-
 from app.core import redis as redis_module
+from app.core.redis import RedisClient
 
 
-async def get_redis() -> AsyncGenerator[aioredis.Redis, None]:
+async def get_redis() -> AsyncGenerator[RedisClient, None]:
     if redis_module.redis_client is None:
         raise RuntimeError("Redis not initialized")
     yield redis_module.redis_client
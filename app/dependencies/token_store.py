@@ -0,0 +1,18 @@
+from app.core import redis as redis_module
+from app.core.config import get_settings
+from app.services.breaker_token_store import CircuitBreakerTokenStore
+from app.services.memory_token_store import get_memory_token_store
+from app.services.redis_token_store import create_redis_token_store
+from app.services.token_store import TokenStore
+
+settings = get_settings()
+
+
+def get_token_store() -> TokenStore:
+    if settings.token_store_backend == "memory":
+        return get_memory_token_store()
+    if redis_module.redis_client is None:
+        raise RuntimeError("Redis not initialized")
+    return CircuitBreakerTokenStore(
+        create_redis_token_store(redis_module.redis_client), redis_module.redis_breaker
+    )
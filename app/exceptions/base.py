@@ -8,8 +8,9 @@ class AppException(HTTPException):
         error_code: str,
         message: str,
         detail: dict | None = None,
+        headers: dict[str, str] | None = None,
     ):
-        super().__init__(status_code=status_code, detail=message)
+        super().__init__(status_code=status_code, detail=message, headers=headers)
         self.error_code = error_code
         self.message = message
         self.extra_detail = detail
@@ -47,6 +47,7 @@ def register_exception_handlers(app: FastAPI) -> None:
                 "timestamp": datetime.now(timezone.utc).isoformat(),
                 "trace_id": trace_id,
             },
+            headers=exc.headers,
         )
 
     @app.exception_handler(RequestValidationError)
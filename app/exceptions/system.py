@@ -0,0 +1,21 @@
+from app.exceptions.base import AppException
+
+
+class ServerBusyError(AppException):
+    def __init__(self, retry_after: int = 1) -> None:
+        super().__init__(
+            status_code=503,
+            error_code="SYS_003",
+            message="요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+class TokenStoreUnavailableError(AppException):
+    def __init__(self, retry_after: int = 1) -> None:
+        super().__init__(
+            status_code=503,
+            error_code="SYS_005",
+            message="인증 저장소에 연결할 수 없습니다. 잠시 후 다시 시도해주세요",
+            headers={"Retry-After": str(retry_after)},
+        )
@@ -89,3 +89,12 @@ class CannotLogoutCurrentDeviceError(AppException):
             error_code="DEVICE_003",
             message="현재 디바이스는 이 방법으로 로그아웃할 수 없습니다",
         )
+
+
+class InvalidHistoryCursorError(AppException):
+    def __init__(self) -> None:
+        super().__init__(
+            status_code=400,
+            error_code="HISTORY_001",
+            message="유효하지 않은 페이지 커서입니다",
+        )
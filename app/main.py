@@ -1,5 +1,6 @@
-from contextlib import asynccontextmanager
+import asyncio
 from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager, suppress
 
 import structlog
 from fastapi import FastAPI
@@ -9,14 +10,22 @@ from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 
 from app.api.v1.router import api_v1_router
+from app.api.well_known import router as well_known_router
 from app.core.config import get_settings
-from app.core.database import init_db
+from app.core.database import engine, init_db
+from app.core.hash_pool import close_hash_pool, init_hash_pool
 from app.core.logging import setup_logging
+from app.core.metrics import metrics
 from app.core.rate_limit import limiter
 from app.core.redis import close_redis, init_redis
 from app.exceptions.handlers import register_exception_handlers
 from app.middleware.logging import LoggingContextMiddleware
 from app.middleware.request_id import RequestIdMiddleware
+from app.repositories.login_history_writer import (
+    close_login_history_writer,
+    init_login_history_writer,
+)
+from app.services.blacklist_cache import close_blacklist_cache, init_blacklist_cache
 
 settings = get_settings()
 logger = structlog.get_logger("app.main")
@@ -30,20 +39,50 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     await init_db()
     await logger.ainfo("Database initialized")
 
+    if settings.login_history_write_behind:
+        init_login_history_writer(engine)
+        await logger.ainfo(
+            "Login history write-behind started",
+            batch_size=settings.login_history_batch_size,
+        )
+
     from app.services.jwt import get_jwt_service
     jwt_svc = get_jwt_service()
     jwt_svc.validate_keys()
-    await logger.ainfo("JWT keys validated")
-
-    try:
-        await init_redis()
-        await logger.ainfo("Redis connected")
-    except Exception as e:
-        await logger.awarning("Redis connection failed, running without Redis", error=str(e))
+    await logger.ainfo("JWT keys validated", signing_kid=jwt_svc.keyring.signing_key.kid)
+
+    key_watcher: asyncio.Task[None] | None = None
+    if settings.jwt_key_reload_interval_seconds > 0:
+        key_watcher = asyncio.create_task(
+            jwt_svc.watch_keys(settings.jwt_key_reload_interval_seconds)
+        )
+
+    init_hash_pool()
+    await logger.ainfo("Password hash pool started", workers=settings.password_hash_workers)
+
+    if settings.token_store_backend == "memory":
+        await logger.ainfo("Using in-process token store; Redis is not used")
+    else:
+        try:
+            redis_client = await init_redis()
+            await logger.ainfo("Redis connected")
+            if settings.blacklist_cache_enabled:
+                await init_blacklist_cache(redis_client)
+        except Exception as e:
+            await logger.awarning("Redis connection failed, running without Redis", error=str(e))
 
     yield
 
+    if key_watcher is not None:
+        key_watcher.cancel()
+        with suppress(asyncio.CancelledError):
+            await key_watcher
+
+    await close_login_history_writer()
+    await close_blacklist_cache()
     await close_redis()
+    close_hash_pool()
+    jwt_svc.close()
     await logger.ainfo("Application shutdown complete")
 
 
@@ -75,11 +114,16 @@ def create_app() -> FastAPI:
     register_exception_handlers(app)
 
     app.include_router(api_v1_router)
+    app.include_router(well_known_router)
 
     @app.get("/health", tags=["Health"])
     async def health_check() -> dict:
         return {"status": "ok", "version": settings.app_version}
 
+    @app.get("/metrics", tags=["Health"])
+    async def metrics_snapshot() -> dict:
+        return metrics.snapshot()
+
     return app
 
 
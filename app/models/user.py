@@ -21,7 +21,8 @@ class User(Base, TimestampMixin, SoftDeleteMixin):
         DateTime(timezone=True), nullable=True
     )
 
+    # Never loaded implicitly; query UserDeviceRepository instead.
     devices: Mapped[list["UserDevice"]] = relationship(  # noqa: F821
         back_populates="user",
-        lazy="selectin",
+        lazy="raise",
     )
@@ -1,11 +1,27 @@
+from collections.abc import Sequence
 from datetime import datetime, timezone
 
+from sqlalchemy import Row, and_, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.login_history import LoginHistory
+from app.repositories.login_history_writer import get_login_history_writer
 
 
 class LoginHistoryRepository:
+    # Columns exposed by the login-history endpoint; user_agent stays server-side.
+    HISTORY_COLUMNS = (
+        LoginHistory.id,
+        LoginHistory.device_id,
+        LoginHistory.ip_address,
+        LoginHistory.os_type,
+        LoginHistory.app_version,
+        LoginHistory.login_at,
+        LoginHistory.login_type,
+        LoginHistory.success,
+        LoginHistory.failure_reason,
+    )
+
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
 
@@ -20,19 +36,62 @@ class LoginHistoryRepository:
         login_type: str = "EMAIL",
         success: bool = True,
         failure_reason: str | None = None,
-    ) -> LoginHistory:
-        history = LoginHistory(
-            user_id=user_id,
-            device_id=device_id,
-            ip_address=ip_address,
-            user_agent=user_agent,
-            os_type=os_type,
-            app_version=app_version,
-            login_at=datetime.now(timezone.utc),
-            login_type=login_type,
-            success=success,
-            failure_reason=failure_reason,
+    ) -> None:
+        row = {
+            "user_id": user_id,
+            "device_id": device_id,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+            "os_type": os_type,
+            "app_version": app_version,
+            "login_at": datetime.now(timezone.utc),
+            "login_type": login_type,
+            "success": success,
+            "failure_reason": failure_reason,
+        }
+        writer = get_login_history_writer()
+        if writer is not None and writer.submit(row):
+            return
+        # Flushed with the rest of the request's unit of work on commit.
+        self.session.add(LoginHistory(**row))
+
+    async def list_for_user(
+        self,
+        user_id: str,
+        limit: int,
+        before: tuple[datetime, int] | None = None,
+        success: bool | None = None,
+        device_id: str | None = None,
+    ) -> Sequence[Row]:
+        """Newest-first page of a user's login history, keyset-paginated.
+
+        ``before`` is the ``(login_at, id)`` of the last row of the previous
+        page. The seek predicate is spelled out as ``login_at <= :t AND
+        (login_at < :t OR (login_at = :t AND id < :id))`` rather than a
+        row-value comparison: the redundant ``login_at <= :t`` bound is what
+        lets both MySQL and SQLite start a range scan of ``ix_user_login_at``
+        (whose entries end with the primary key) at the cursor, so every page
+        costs ``limit`` index entries no matter how deep it is. No OFFSET is
+        ever used.
+        """
+        stmt = (
+            select(*self.HISTORY_COLUMNS)
+            .where(LoginHistory.user_id == user_id)
+            .order_by(LoginHistory.login_at.desc(), LoginHistory.id.desc())
+            .limit(limit)
         )
-        self.session.add(history)
-        await self.session.flush()
-        return history
+        if before is not None:
+            login_at, row_id = before
+            stmt = stmt.where(
+                LoginHistory.login_at <= login_at,
+                or_(
+                    LoginHistory.login_at < login_at,
+                    and_(LoginHistory.login_at == login_at, LoginHistory.id < row_id),
+                ),
+            )
+        if success is not None:
+            stmt = stmt.where(LoginHistory.success == success)
+        if device_id is not None:
+            stmt = stmt.where(LoginHistory.device_id == device_id)
+        result = await self.session.execute(stmt)
+        return result.all()
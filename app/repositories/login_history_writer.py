@@ -0,0 +1,145 @@
+import asyncio
+import time
+from typing import Any
+
+import structlog
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import get_settings
+from app.core.metrics import metrics
+from app.models.login_history import LoginHistory
+
+logger = structlog.get_logger("app.repositories.login_history_writer")
+settings = get_settings()
+
+_queue_depth = metrics.gauge(
+    "login_history_queue_depth", "Login history rows waiting to be written"
+)
+_written_total = metrics.counter("login_history_rows_written_total", "Rows bulk-inserted")
+_spilled_total = metrics.counter(
+    "login_history_spilled_total",
+    "Rows written in the request transaction because the queue was full",
+)
+_dropped_total = metrics.counter("login_history_dropped_total", "Rows lost to failed batch inserts")
+_flush_seconds = metrics.summary("login_history_flush_seconds", "Time spent per batch insert")
+
+
+class LoginHistoryWriter:
+    """Write-behind buffer for ``login_histories`` rows.
+
+    Rows are queued in process and bulk-inserted (one executemany) on a
+    connection of their own whenever ``batch_size`` rows are waiting or
+    ``flush_interval`` seconds have passed since the first of them. Login
+    requests never wait on the INSERT, and rows no longer depend on the
+    request transaction, so failed logins are recorded even though their
+    request rolls back. When the queue is full ``submit`` returns False and
+    the caller writes the row itself. Rows still queued are flushed by
+    ``close``; a hard crash loses at most one interval of history.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        batch_size: int = 500,
+        flush_interval: float = 0.2,
+        queue_size: int = 10000,
+    ) -> None:
+        self.engine = engine
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: asyncio.Queue[dict[str, Any] | None] = asyncio.Queue(maxsize=queue_size)
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    def submit(self, row: dict[str, Any]) -> bool:
+        try:
+            self._queue.put_nowait(row)
+        except asyncio.QueueFull:
+            _spilled_total.inc()
+            return False
+        _queue_depth.inc()
+        return True
+
+    async def _run(self) -> None:
+        # A None in the queue is the shutdown sentinel from close().
+        while True:
+            row = await self._queue.get()
+            if row is None:
+                return
+            batch = [row]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    row = await asyncio.wait_for(self._queue.get(), remaining)
+                except TimeoutError:
+                    break
+                if row is None:
+                    await self._write(batch)
+                    return
+                batch.append(row)
+            await self._write(batch)
+
+    def _drain(self) -> list[dict[str, Any]]:
+        rows = []
+        while not self._queue.empty():
+            row = self._queue.get_nowait()
+            if row is not None:
+                rows.append(row)
+        return rows
+
+    async def _write(self, rows: list[dict[str, Any]]) -> None:
+        started = time.perf_counter()
+        try:
+            async with self.engine.begin() as conn:
+                await conn.execute(insert(LoginHistory), rows)
+        except Exception as e:
+            _dropped_total.inc(len(rows))
+            await logger.aerror("Login history batch insert failed", rows=len(rows), error=str(e))
+        else:
+            _written_total.inc(len(rows))
+        finally:
+            _queue_depth.dec(len(rows))
+            _flush_seconds.observe(time.perf_counter() - started)
+
+    async def close(self) -> None:
+        """Write every row queued so far, then stop the background task."""
+        if self._task is not None:
+            if not self._task.done():
+                await self._queue.put(None)
+            await self._task
+            self._task = None
+        rows = self._drain()
+        for start in range(0, len(rows), self.batch_size):
+            await self._write(rows[start : start + self.batch_size])
+
+
+login_history_writer: LoginHistoryWriter | None = None
+
+
+def init_login_history_writer(engine: AsyncEngine) -> LoginHistoryWriter:
+    global login_history_writer
+    login_history_writer = LoginHistoryWriter(
+        engine,
+        batch_size=settings.login_history_batch_size,
+        flush_interval=settings.login_history_flush_interval_ms / 1000,
+        queue_size=settings.login_history_queue_size,
+    )
+    login_history_writer.start()
+    return login_history_writer
+
+
+async def close_login_history_writer() -> None:
+    global login_history_writer
+    if login_history_writer is not None:
+        await login_history_writer.close()
+        login_history_writer = None
+
+
+def get_login_history_writer() -> LoginHistoryWriter | None:
+    return login_history_writer
@@ -1,10 +1,20 @@
 from datetime import datetime, timezone
 
-from sqlalchemy import select
+from sqlalchemy import Row, Select, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.user import User
 
+# Column sets for the hot paths: plain rows instead of ORM entities.
+type CredentialRow = Row[str, str, str, str, str]  # id, email, name, hashed_password, status
+type ClaimRow = Row[str, str, str]  # email, name, status
+# id, email, name, phone_number, profile_image_url, marketing_agreed, created_at, updated_at
+type ProfileRow = Row[str, str, str, str | None, str | None, bool, datetime, datetime]
+
+
+def _credentials() -> Select[str, str, str, str, str]:
+    return select(User.id, User.email, User.name, User.hashed_password, User.status)
+
 
 class UserRepository:
     def __init__(self, session: AsyncSession) -> None:
@@ -22,6 +32,35 @@ class UserRepository:
         )
         return result.scalar_one_or_none()
 
+    async def _one_or_none[*Ts](self, statement: Select[*Ts]) -> Row[*Ts] | None:
+        result = await self.session.execute(statement.where(User.deleted_at.is_(None)))
+        return result.one_or_none()
+
+    async def get_credentials_by_email(self, email: str) -> CredentialRow | None:
+        return await self._one_or_none(_credentials().where(User.email == email))
+
+    async def get_credentials_by_id(self, user_id: str) -> CredentialRow | None:
+        return await self._one_or_none(_credentials().where(User.id == user_id))
+
+    async def get_claims(self, user_id: str) -> ClaimRow | None:
+        return await self._one_or_none(
+            select(User.email, User.name, User.status).where(User.id == user_id)
+        )
+
+    async def get_profile(self, user_id: str) -> ProfileRow | None:
+        return await self._one_or_none(
+            select(
+                User.id,
+                User.email,
+                User.name,
+                User.phone_number,
+                User.profile_image_url,
+                User.marketing_agreed,
+                User.created_at,
+                User.updated_at,
+            ).where(User.id == user_id)
+        )
+
     async def email_exists(self, email: str) -> bool:
         result = await self.session.execute(
             select(User.id).where(User.email == email, User.deleted_at.is_(None))
@@ -34,16 +73,27 @@ class UserRepository:
         return user
 
     async def update_last_login(self, user_id: str) -> None:
-        user = await self.get_by_id(user_id)
-        if user:
-            user.last_login_at = datetime.now(timezone.utc)
-            await self.session.flush()
+        await self.session.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(last_login_at=datetime.now(timezone.utc))
+        )
 
     async def update(self, user: User) -> User:
         await self.session.flush()
         return user
 
-    async def soft_delete(self, user: User) -> None:
-        user.deleted_at = datetime.now(timezone.utc)
-        user.status = "WITHDRAWN"
-        await self.session.flush()
+    async def update_password(self, user_id: str, hashed_password: str) -> None:
+        await self.session.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(hashed_password=hashed_password, updated_at=datetime.now(timezone.utc))
+        )
+
+    async def soft_delete(self, user_id: str) -> None:
+        now = datetime.now(timezone.utc)
+        await self.session.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(deleted_at=now, status="WITHDRAWN", updated_at=now)
+        )
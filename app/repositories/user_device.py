@@ -1,11 +1,48 @@
 from datetime import datetime, timezone
+from typing import Any
 
-from sqlalchemy import and_, select
+from sqlalchemy import Insert, and_, func, select, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.user_device import UserDevice
 
 
+def upsert_device_statement(dialect_name: str, values: dict[str, Any]) -> Insert | None:
+    """Native single-statement upsert of a device row on ``ix_user_device``.
+
+    ``INSERT ... ON CONFLICT DO UPDATE`` on SQLite/PostgreSQL and
+    ``INSERT ... ON DUPLICATE KEY UPDATE`` on MySQL. Optional fields keep
+    their stored value when the client did not send them. Returns ``None``
+    for any other dialect.
+    """
+    if dialect_name == "mysql":
+        stmt = mysql.insert(UserDevice).values(**values)
+        return stmt.on_duplicate_key_update(**_device_login_update(stmt.inserted))
+    if dialect_name in ("sqlite", "postgresql"):
+        insert = sqlite.insert if dialect_name == "sqlite" else postgresql.insert
+        stmt = insert(UserDevice).values(**values)
+        return stmt.on_conflict_do_update(
+            index_elements=[UserDevice.user_id, UserDevice.device_id],
+            set_=_device_login_update(stmt.excluded),
+        )
+    return None
+
+
+def _device_login_update(new: Any) -> dict[str, Any]:
+    return {
+        "device_name": func.coalesce(new.device_name, UserDevice.device_name),
+        "os_type": new.os_type,
+        "os_version": func.coalesce(new.os_version, UserDevice.os_version),
+        "app_version": func.coalesce(new.app_version, UserDevice.app_version),
+        "last_login_at": new.last_login_at,
+        "last_login_ip": new.last_login_ip,
+        "last_access_at": new.last_access_at,
+        "is_active": True,
+        "updated_at": new.updated_at,
+    }
+
+
 class UserDeviceRepository:
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
@@ -43,54 +80,87 @@ class UserDeviceRepository:
         os_version: str | None,
         app_version: str | None,
         ip_address: str | None,
-    ) -> UserDevice:
-        device = await self.get_by_user_and_device(user_id, device_id)
+    ) -> None:
         now = datetime.now(timezone.utc)
+        values = {
+            "user_id": user_id,
+            "device_id": device_id,
+            "device_name": device_name,
+            "os_type": os_type,
+            "os_version": os_version,
+            "app_version": app_version,
+            "last_login_at": now,
+            "last_login_ip": ip_address,
+            "last_access_at": now,
+            "is_active": True,
+            "created_at": now,
+            "updated_at": now,
+        }
+        dialect_name = self.session.get_bind().dialect.name
+        statement = upsert_device_statement(dialect_name, values)
+        if statement is None:
+            await self._select_then_write_device(values)
+        else:
+            await self.session.execute(statement)
 
+    async def _select_then_write_device(self, values: dict[str, Any]) -> None:
+        # Portable path for dialects without a native upsert.
+        device = await self.get_by_user_and_device(values["user_id"], values["device_id"])
         if device is None:
-            device = UserDevice(
-                user_id=user_id,
-                device_id=device_id,
-                device_name=device_name,
-                os_type=os_type,
-                os_version=os_version,
-                app_version=app_version,
-                last_login_at=now,
-                last_login_ip=ip_address,
-                last_access_at=now,
-                is_active=True,
-                created_at=now,
-                updated_at=now,
-            )
-            self.session.add(device)
+            self.session.add(UserDevice(**values))
         else:
-            device.device_name = device_name or device.device_name
-            device.os_type = os_type
-            device.os_version = os_version or device.os_version
-            device.app_version = app_version or device.app_version
-            device.last_login_at = now
-            device.last_login_ip = ip_address
-            device.last_access_at = now
+            device.device_name = values["device_name"] or device.device_name
+            device.os_type = values["os_type"]
+            device.os_version = values["os_version"] or device.os_version
+            device.app_version = values["app_version"] or device.app_version
+            device.last_login_at = values["last_login_at"]
+            device.last_login_ip = values["last_login_ip"]
+            device.last_access_at = values["last_access_at"]
             device.is_active = True
-            device.updated_at = now
-
+            device.updated_at = values["updated_at"]
         await self.session.flush()
-        return device
 
     async def deactivate_device(self, user_id: str, device_id: str) -> bool:
-        device = await self.get_by_user_and_device(user_id, device_id)
-        if device is None:
-            return False
-        device.is_active = False
-        device.updated_at = datetime.now(timezone.utc)
-        await self.session.flush()
-        return True
+        result = await self.session.execute(
+            update(UserDevice)
+            .where(
+                UserDevice.user_id == user_id,
+                UserDevice.device_id == device_id,
+                UserDevice.is_active == True,  # noqa: E712
+            )
+            .values(is_active=False, updated_at=datetime.now(timezone.utc))
+        )
+        return result.rowcount > 0
 
     async def deactivate_all_devices(self, user_id: str) -> int:
-        devices = await self.get_active_devices(user_id)
+        result = await self.session.execute(
+            update(UserDevice)
+            .where(
+                UserDevice.user_id == user_id,
+                UserDevice.is_active == True,  # noqa: E712
+            )
+            .values(is_active=False, updated_at=datetime.now(timezone.utc))
+        )
+        return result.rowcount
+
+    async def deactivate_devices_for_users(
+        self, user_ids: list[str], batch_size: int = 500
+    ) -> int:
+        """Deactivate every active device of many users (admin mass revocation).
+
+        One UPDATE per ``batch_size`` users keeps the IN list and the rows
+        locked by each statement bounded.
+        """
         now = datetime.now(timezone.utc)
-        for device in devices:
-            device.is_active = False
-            device.updated_at = now
-        await self.session.flush()
-        return len(devices)
+        count = 0
+        for start in range(0, len(user_ids), batch_size):
+            result = await self.session.execute(
+                update(UserDevice)
+                .where(
+                    UserDevice.user_id.in_(user_ids[start : start + batch_size]),
+                    UserDevice.is_active == True,  # noqa: E712
+                )
+                .values(is_active=False, updated_at=now)
+            )
+            count += result.rowcount
+        return count
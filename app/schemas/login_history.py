@@ -0,0 +1,19 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class LoginHistoryItem(BaseModel):
+    device_id: str
+    ip_address: str | None = None
+    os_type: str | None = None
+    app_version: str | None = None
+    login_at: datetime
+    login_type: str
+    success: bool
+    failure_reason: str | None = None
+
+
+class LoginHistoryPage(BaseModel):
+    items: list[LoginHistoryItem]
+    next_cursor: str | None = None
@@ -1,3 +1,4 @@
+import asyncio
 from datetime import datetime, timezone
 
 import uuid
@@ -6,8 +7,15 @@ import structlog
 from sqlalchemy.exc import IntegrityError
 
 from app.core.config import get_settings
-from app.core.security import hash_password, verify_password, DUMMY_HASH
+from app.core.metrics import metrics
+from app.core.security import (
+    DUMMY_HASH,
+    hash_password_async,
+    password_needs_rehash,
+    verify_password_async,
+)
 from app.exceptions.auth import InvalidCredentialsError, InvalidRefreshTokenError
+from app.exceptions.system import ServerBusyError
 from app.exceptions.user import (
     AccountSuspendedError,
     AccountWithdrawnError,
@@ -15,16 +23,21 @@ from app.exceptions.user import (
 )
 from app.models.user import User
 from app.repositories.login_history import LoginHistoryRepository
-from app.repositories.user import UserRepository
+from app.repositories.user import CredentialRow, UserRepository
 from app.repositories.user_device import UserDeviceRepository
 from app.schemas.auth import LoginResponse, LoginUserInfo, SignupResponse, TokenResponse
 from app.services.auth_event_logger import AuthEventLogger
 from app.services.jwt import JWTService
-from app.services.token_store import TokenStore
+from app.services.read_routing import RecentWriteMarker, mark_recent_write
+from app.services.token_store import RotationResult, TokenStore, UserClaims
 
 logger = structlog.get_logger("app.services.auth")
 settings = get_settings()
 
+_refresh_grace_hits = metrics.counter(
+    "refresh_grace_hits_total", "Repeated refreshes answered with the cached rotation"
+)
+
 
 class AuthService:
     def __init__(
@@ -34,12 +47,14 @@ class AuthService:
         history_repo: LoginHistoryRepository,
         jwt_service: JWTService,
         token_store: TokenStore,
+        recent_writes: RecentWriteMarker,
     ) -> None:
         self.user_repo = user_repo
         self.device_repo = device_repo
         self.history_repo = history_repo
         self.jwt_service = jwt_service
         self.token_store = token_store
+        self.recent_writes = recent_writes
 
     async def signup(
         self,
@@ -56,7 +71,7 @@ class AuthService:
         user = User(
             id=str(uuid.uuid4()),
             email=email,
-            hashed_password=hash_password(password),
+            hashed_password=await hash_password_async(password),
             name=name,
             phone_number=phone_number,
             status="ACTIVE",
@@ -89,16 +104,16 @@ class AuthService:
         ip_address: str | None,
         user_agent: str | None,
     ) -> LoginResponse:
-        user = await self.user_repo.get_by_email(email)
+        user = await self.user_repo.get_credentials_by_email(email)
 
         # Constant-time password verification to prevent timing attacks
         if user is None:
-            verify_password(password, DUMMY_HASH)
+            await verify_password_async(password, DUMMY_HASH)
             valid = False
         else:
-            valid = verify_password(password, user.hashed_password)
+            valid = await verify_password_async(password, user.hashed_password)
 
-        if not valid:
+        if user is None or not valid:
             await self.history_repo.create(
                 user_id=user.id if user else None,
                 device_id=device_id,
@@ -122,6 +137,9 @@ class AuthService:
         if user.status == "WITHDRAWN":
             raise AccountWithdrawnError()
 
+        if password_needs_rehash(user.hashed_password):
+            await self._rehash_password(user, password)
+
         await self.device_repo.upsert_device(
             user_id=user.id,
             device_id=device_id,
@@ -134,18 +152,20 @@ class AuthService:
 
         await self.user_repo.update_last_login(user.id)
 
-        access_token, at_jti, at_exp = self.jwt_service.create_access_token(
-            user_id=user.id,
-            email=user.email,
-            name=user.name,
-            device_id=device_id,
-        )
-        refresh_token, rt_jti, rt_exp = self.jwt_service.create_refresh_token(
-            user_id=user.id,
-            device_id=device_id,
+        (access_token, _, _), (refresh_token, rt_jti, rt_exp) = await asyncio.gather(
+            self.jwt_service.create_access_token_async(
+                user_id=user.id,
+                email=user.email,
+                name=user.name,
+                device_id=device_id,
+            ),
+            self.jwt_service.create_refresh_token_async(
+                user_id=user.id,
+                device_id=device_id,
+            ),
         )
 
-        await self.token_store.store_refresh_token(
+        evicted = await self.token_store.store_refresh_token(
             user_id=user.id,
             device_id=device_id,
             token_id=rt_jti,
@@ -155,6 +175,17 @@ class AuthService:
             ip_address=ip_address,
             expires_at=rt_exp,
         )
+        await self.token_store.set_user_claims(
+            user.id, UserClaims(email=user.email, name=user.name, status=user.status)
+        )
+        for evicted_device_id in evicted:
+            await self.token_store.revoke_tokens_issued_before(user.id, evicted_device_id)
+            await self.device_repo.deactivate_device(user.id, evicted_device_id)
+            await AuthEventLogger.log_logout(
+                user_id=user.id,
+                device_id=evicted_device_id,
+                logout_type="SESSION_LIMIT",
+            )
 
         await self.history_repo.create(
             user_id=user.id,
@@ -165,6 +196,7 @@ class AuthService:
             app_version=app_version,
             success=True,
         )
+        await mark_recent_write(self.recent_writes, user.id)
 
         await AuthEventLogger.log_login_success(
             user_id=user.id,
@@ -185,6 +217,16 @@ class AuthService:
             ),
         )
 
+    async def _rehash_password(self, user: CredentialRow, password: str) -> None:
+        # Upgrade hashes written with an older scheme or cost on the next
+        # successful login. Skipped under load; the next login will retry.
+        try:
+            hashed_password = await hash_password_async(password)
+        except ServerBusyError:
+            return
+        await self.user_repo.update_password(user.id, hashed_password)
+        await logger.ainfo("Password rehashed", user_id=user.id)
+
     async def refresh(
         self,
         refresh_token_str: str,
@@ -194,7 +236,7 @@ class AuthService:
         app_version: str | None,
         ip_address: str | None,
     ) -> TokenResponse:
-        rt_payload = self.jwt_service.decode_refresh_token(refresh_token_str)
+        rt_payload = await self.jwt_service.decode_refresh_token_async(refresh_token_str)
 
         if rt_payload.device_id != device_id:
             await AuthEventLogger.log_suspicious_activity(
@@ -205,48 +247,62 @@ class AuthService:
             )
             raise InvalidRefreshTokenError()
 
-        stored = await self.token_store.get_refresh_token(rt_payload.sub, device_id)
-        if stored is None:
-            raise InvalidRefreshTokenError()
-
-        if stored["token_id"] != rt_payload.jti:
-            await AuthEventLogger.log_suspicious_activity(
-                user_id=rt_payload.sub,
-                device_id=device_id,
-                ip_address=ip_address or "unknown",
-                activity="REFRESH_TOKEN_REUSE_ATTEMPT",
-            )
-            await self.token_store.delete_refresh_token(rt_payload.sub, device_id)
-            raise InvalidRefreshTokenError()
-
-        user = await self.user_repo.get_by_id(rt_payload.sub)
-        if user is None:
-            raise InvalidRefreshTokenError()
-
-        access_token, _, _ = self.jwt_service.create_access_token(
-            user_id=user.id,
-            email=user.email,
-            name=user.name,
-            device_id=device_id,
+        user_id = rt_payload.sub
+        # One token store round trip answers both: the claims to sign with, and
+        # whether this token was rotated moments ago (app resume, timeouts).
+        claims, grace = await self.token_store.get_refresh_state(
+            user_id, device_id, rt_payload.jti
         )
-        new_refresh_token, new_rt_jti, new_rt_exp = self.jwt_service.create_refresh_token(
-            user_id=user.id,
-            device_id=device_id,
+        if claims is None:
+            claims = await self._load_user_claims(user_id)
+        if claims["status"] == "INACTIVE":
+            raise AccountSuspendedError()
+        if grace is not None:
+            # a retried refresh gets the response of the rotation that won, unsigned again
+            return await self._grace_token_response(user_id, device_id, grace)
+
+        (access_token, _, _), (new_refresh_token, new_rt_jti, new_rt_exp) = await asyncio.gather(
+            self.jwt_service.create_access_token_async(
+                user_id=user_id,
+                email=claims["email"],
+                name=claims["name"],
+                device_id=device_id,
+            ),
+            self.jwt_service.create_refresh_token_async(
+                user_id=user_id,
+                device_id=device_id,
+            ),
         )
 
-        await self.token_store.store_refresh_token(
-            user_id=user.id,
+        result = await self.token_store.rotate_refresh_token(
+            user_id=user_id,
             device_id=device_id,
-            token_id=new_rt_jti,
+            old_token_id=rt_payload.jti,
+            new_token_id=new_rt_jti,
             device_name=device_name,
             os_type=os_type,
             app_version=app_version,
             ip_address=ip_address,
             expires_at=new_rt_exp,
+            grace_response={"access_token": access_token, "refresh_token": new_refresh_token},
         )
+        if result is RotationResult.GRACE:
+            # lost the race to a concurrent refresh with the same token
+            cached = await self.token_store.get_rotation_grace(user_id, device_id, rt_payload.jti)
+            if cached is not None:
+                return await self._grace_token_response(user_id, device_id, cached)
+        if result is RotationResult.REUSED:
+            await AuthEventLogger.log_suspicious_activity(
+                user_id=rt_payload.sub,
+                device_id=device_id,
+                ip_address=ip_address or "unknown",
+                activity="REFRESH_TOKEN_REUSE_ATTEMPT",
+            )
+        if result is not RotationResult.OK:
+            raise InvalidRefreshTokenError()
 
         await AuthEventLogger.log_token_refresh(
-            user_id=user.id,
+            user_id=user_id,
             device_id=device_id,
         )
 
@@ -258,25 +314,34 @@ class AuthService:
             refresh_expires_in=settings.jwt_refresh_token_expire_seconds,
         )
 
-    async def logout(
-        self,
-        user_id: str,
-        device_id: str,
-        access_token_jti: str,
-        access_token_exp: datetime,
-    ) -> None:
-        now = datetime.now(timezone.utc)
-        ttl = int((access_token_exp - now).total_seconds())
+    async def _load_user_claims(self, user_id: str) -> UserClaims:
+        # Kept in the token store by login, update_me and delete_account, so
+        # refresh normally runs without SQL; a miss is filled from the DB.
+        user = await self.user_repo.get_claims(user_id)
+        if user is None:
+            raise InvalidRefreshTokenError()
+        claims = UserClaims(email=user.email, name=user.name, status=user.status)
+        await self.token_store.set_user_claims(user_id, claims)
+        return claims
 
-        await self.token_store.blacklist_token(
-            jti=access_token_jti,
-            user_id=user_id,
-            device_id=device_id,
-            reason="logout",
-            ttl_seconds=ttl,
+    async def _grace_token_response(
+        self, user_id: str, device_id: str, cached: dict[str, str]
+    ) -> TokenResponse:
+        _refresh_grace_hits.inc()
+        await logger.ainfo("Refresh served from grace window", user_id=user_id, device_id=device_id)
+        return TokenResponse(
+            access_token=cached["access_token"],
+            refresh_token=cached["refresh_token"],
+            token_type="Bearer",
+            expires_in=settings.jwt_access_token_expire_seconds,
+            refresh_expires_in=settings.jwt_refresh_token_expire_seconds,
         )
+
+    async def logout(self, user_id: str, device_id: str) -> None:
+        await self.token_store.revoke_tokens_issued_before(user_id, device_id)
         await self.token_store.delete_refresh_token(user_id, device_id)
         await self.device_repo.deactivate_device(user_id, device_id)
+        await mark_recent_write(self.recent_writes, user_id)
 
         await AuthEventLogger.log_logout(
             user_id=user_id,
@@ -284,25 +349,11 @@ class AuthService:
             logout_type="SELF",
         )
 
-    async def logout_all(
-        self,
-        user_id: str,
-        access_token_jti: str,
-        access_token_exp: datetime,
-    ) -> int:
-        now = datetime.now(timezone.utc)
-        ttl = int((access_token_exp - now).total_seconds())
-
-        await self.token_store.blacklist_token(
-            jti=access_token_jti,
-            user_id=user_id,
-            device_id="all",
-            reason="logout_all",
-            ttl_seconds=ttl,
-        )
-
+    async def logout_all(self, user_id: str) -> int:
+        await self.token_store.revoke_tokens_issued_before(user_id)
         count = await self.token_store.delete_all_refresh_tokens(user_id)
         await self.device_repo.deactivate_all_devices(user_id)
+        await mark_recent_write(self.recent_writes, user_id)
 
         await AuthEventLogger.log_logout(
             user_id=user_id,
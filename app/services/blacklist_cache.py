@@ -0,0 +1,197 @@
+import asyncio
+import contextlib
+import heapq
+import json
+import time
+
+import structlog
+
+from app.core.metrics import metrics
+from app.core.redis import RedisClient
+from app.services.redis_keys import EPOCH_KEY_PATTERNS, epoch_scope
+
+logger = structlog.get_logger("app.services.blacklist_cache")
+
+BLACKLIST_KEY_PREFIX = "auth:blacklist:"
+BLACKLIST_CHANNEL = "auth:blacklist:events"
+
+_size = metrics.gauge("blacklist_cache_size", "Revoked JTIs and epochs held locally")
+_live = metrics.gauge("blacklist_cache_live", "1 while the pub/sub subscription is up")
+_events = metrics.counter("blacklist_cache_events_total", "Revocations received via pub/sub")
+
+
+class BlacklistCache:
+    """Per-worker copy of the access-token revocation state.
+
+    Holds revoked JTIs (``auth:blacklist:*``) and revocation epochs
+    ("tokens issued before T are invalid", see ``RedisKeys.epoch``). Warmed with a
+    SCAN and kept current by the ``auth:blacklist:events`` channel that
+    ``TokenStore`` publishes to. Every entry is evicted at its natural expiry.
+    While the subscription is down ``is_live`` is False and callers may fall
+    back to a direct Redis check.
+    """
+
+    def __init__(
+        self,
+        redis: RedisClient,
+        reconnect_delay: float = 1.0,
+        poll_interval: float = 1.0,
+    ) -> None:
+        self.redis = redis
+        self.reconnect_delay = reconnect_delay
+        self.poll_interval = poll_interval
+        # cache key ("jti:<jti>" / "epoch:<scope>") -> (value, expires_at)
+        self._entries: dict[str, tuple[float, float]] = {}
+        self._heap: list[tuple[float, str]] = []
+        self._live = False
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def is_live(self) -> bool:
+        return self._live
+
+    def add(self, jti: str, expires_at: float) -> None:
+        self._put(f"jti:{jti}", 0.0, expires_at)
+
+    def contains(self, jti: str) -> bool:
+        return self._get(f"jti:{jti}") is not None
+
+    def set_epoch(self, scope: str, epoch: float, expires_at: float) -> None:
+        current = self._get(f"epoch:{scope}")
+        if current is not None and current > epoch:
+            return
+        self._put(f"epoch:{scope}", epoch, expires_at)
+
+    def get_epoch(self, scope: str) -> float:
+        return self._get(f"epoch:{scope}") or 0.0
+
+    def _put(self, key: str, value: float, expires_at: float) -> None:
+        current = self._entries.get(key)
+        if current is not None and current[0] == value and current[1] >= expires_at:
+            return
+        self._entries[key] = (value, expires_at)
+        heapq.heappush(self._heap, (expires_at, key))
+        self._evict_expired(time.time())
+
+    def _get(self, key: str) -> float | None:
+        now = time.time()
+        self._evict_expired(now)
+        entry = self._entries.get(key)
+        if entry is None or entry[1] <= now:
+            return None
+        return entry[0]
+
+    def _evict_expired(self, now: float) -> None:
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            expires_at, key = heapq.heappop(heap)
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] == expires_at:
+                del self._entries[key]
+        _size.set(len(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        self._set_live(False)
+
+    def _set_live(self, live: bool) -> None:
+        self._live = live
+        _live.set(1 if live else 0)
+
+    async def _run(self) -> None:
+        while True:
+            pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                # Subscribe before scanning so nothing revoked mid-scan is missed.
+                await pubsub.subscribe(BLACKLIST_CHANNEL)
+                await self._warm()
+                self._set_live(True)
+                await logger.ainfo("Blacklist cache live", entries=len(self))
+                # Poll with an explicit read timeout: a blocking listen() would
+                # be cut off by the client's socket_timeout on idle channels.
+                while True:
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True, timeout=self.poll_interval
+                    )
+                    if message is not None and message["type"] == "message":
+                        self._apply(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                await logger.awarning("Blacklist subscription lost", error=str(e))
+            finally:
+                self._set_live(False)
+                await pubsub.aclose()
+            await asyncio.sleep(self.reconnect_delay)
+
+    async def _warm(self) -> None:
+        for pattern in (f"{BLACKLIST_KEY_PREFIX}*", *EPOCH_KEY_PATTERNS):
+            batch: list[str] = []
+            async for key in self.redis.scan_iter(match=pattern, count=1000):
+                batch.append(key)
+                if len(batch) >= 1000:
+                    await self._load(batch)
+                    batch = []
+            if batch:
+                await self._load(batch)
+
+    async def _load(self, keys: list[str]) -> None:
+        pipe = self.redis.pipeline(transaction=False)
+        for key in keys:
+            pipe.pttl(key)
+            if not key.startswith(BLACKLIST_KEY_PREFIX):
+                pipe.get(key)
+        results = iter(await pipe.execute())
+        now = time.time()
+        for key in keys:
+            pttl = next(results)
+            if key.startswith(BLACKLIST_KEY_PREFIX):
+                if pttl > 0:
+                    self.add(key.removeprefix(BLACKLIST_KEY_PREFIX), now + pttl / 1000)
+                continue
+            epoch = next(results)
+            scope = epoch_scope(key)
+            if pttl > 0 and epoch is not None and scope is not None:
+                self.set_epoch(scope, float(epoch), now + pttl / 1000)
+
+    def _apply(self, data: str) -> None:
+        try:
+            event = json.loads(data)
+            if event.get("type") == "epoch":
+                self.set_epoch(event["scope"], float(event["epoch"]), float(event["exp"]))
+            else:
+                self.add(event["jti"], float(event["exp"]))
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return
+        _events.inc()
+
+
+blacklist_cache: BlacklistCache | None = None
+
+
+async def init_blacklist_cache(redis: RedisClient) -> BlacklistCache:
+    global blacklist_cache
+    blacklist_cache = BlacklistCache(redis)
+    await blacklist_cache.start()
+    return blacklist_cache
+
+
+async def close_blacklist_cache() -> None:
+    global blacklist_cache
+    if blacklist_cache:
+        await blacklist_cache.stop()
+        blacklist_cache = None
+
+
+def get_blacklist_cache() -> BlacklistCache | None:
+    return blacklist_cache
@@ -0,0 +1,136 @@
+import math
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+from typing import Any, TypeVar
+
+import structlog
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import TimeoutError as RedisTimeoutError
+
+from app.core.circuit_breaker import CircuitBreaker, CircuitOpenError
+from app.core.config import get_settings
+from app.core.metrics import metrics
+from app.exceptions.system import TokenStoreUnavailableError
+from app.services.redis_token_store import RedisTokenStore
+from app.services.token_store import RotationResult, UserClaims
+
+logger = structlog.get_logger("app.services.breaker_token_store")
+settings = get_settings()
+
+T = TypeVar("T")
+
+_UNAVAILABLE = (CircuitOpenError, RedisConnectionError, RedisTimeoutError, TimeoutError)
+
+_fail_open_total = metrics.counter(
+    "revocation_fail_open_total", "Tokens accepted because revocation could not be checked"
+)
+
+
+async def call_through_breaker[T](
+    breaker: CircuitBreaker, fn: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any
+) -> T:
+    """Run a Redis call through ``breaker``, raising ``TokenStoreUnavailableError`` on failure."""
+    try:
+        return await breaker.call(fn, *args, **kwargs)
+    except CircuitOpenError as e:
+        raise TokenStoreUnavailableError(retry_after=max(1, math.ceil(e.retry_after))) from e
+    except _UNAVAILABLE as e:
+        await logger.awarning("Token store call failed", error=str(e))
+        raise TokenStoreUnavailableError() from e
+
+
+class CircuitBreakerTokenStore:
+    """Runs every Redis-backed TokenStore call through a circuit breaker.
+
+    Once Redis keeps failing, calls fail fast with ``TokenStoreUnavailableError``
+    (503 + Retry-After) instead of each request waiting out its own timeouts.
+    Revocation checks answered by the per-worker cache bypass the breaker; the
+    others follow ``redis_revocation_fail_open``: fail-closed rejects the
+    request, fail-open accepts the token and counts it.
+    """
+
+    def __init__(self, store: RedisTokenStore, breaker: CircuitBreaker) -> None:
+        self.store = store
+        self.breaker = breaker
+
+    async def _call(self, fn: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any) -> T:
+        return await call_through_breaker(self.breaker, fn, *args, **kwargs)
+
+    async def _check_revocation(self, fn: Callable[..., Awaitable[bool]], *args: Any) -> bool:
+        if self.store.serves_revocation_locally():
+            return await fn(*args)
+        try:
+            return await self._call(fn, *args)
+        except TokenStoreUnavailableError:
+            if not settings.redis_revocation_fail_open:
+                raise
+            _fail_open_total.inc()
+            return False
+
+    # --- Refresh Token Storage ---
+
+    async def store_refresh_token(self, *args: Any, **kwargs: Any) -> list[str]:
+        return await self._call(self.store.store_refresh_token, *args, **kwargs)
+
+    async def rotate_refresh_token(self, *args: Any, **kwargs: Any) -> RotationResult:
+        return await self._call(self.store.rotate_refresh_token, *args, **kwargs)
+
+    async def get_rotation_grace(
+        self, user_id: str, device_id: str, old_token_id: str
+    ) -> dict[str, str] | None:
+        return await self._call(self.store.get_rotation_grace, user_id, device_id, old_token_id)
+
+    async def get_refresh_state(
+        self, user_id: str, device_id: str, old_token_id: str
+    ) -> tuple[UserClaims | None, dict[str, str] | None]:
+        return await self._call(self.store.get_refresh_state, user_id, device_id, old_token_id)
+
+    async def get_refresh_token(self, user_id: str, device_id: str) -> dict | None:
+        return await self._call(self.store.get_refresh_token, user_id, device_id)
+
+    async def delete_refresh_token(self, user_id: str, device_id: str) -> None:
+        await self._call(self.store.delete_refresh_token, user_id, device_id)
+
+    async def delete_all_refresh_tokens(self, user_id: str) -> int:
+        return await self._call(self.store.delete_all_refresh_tokens, user_id)
+
+    async def get_active_device_ids(self, user_id: str) -> set[str]:
+        return await self._call(self.store.get_active_device_ids, user_id)
+
+    # --- Token Claims ---
+
+    async def get_user_claims(self, user_id: str) -> UserClaims | None:
+        return await self._call(self.store.get_user_claims, user_id)
+
+    async def set_user_claims(self, user_id: str, claims: UserClaims) -> None:
+        await self._call(self.store.set_user_claims, user_id, claims)
+
+    async def delete_user_claims(self, user_id: str) -> None:
+        await self._call(self.store.delete_user_claims, user_id)
+
+    # --- Revocation ---
+
+    async def revoke_tokens_issued_before(
+        self,
+        user_id: str,
+        device_id: str | None = None,
+        at: datetime | None = None,
+    ) -> float:
+        return await self._call(self.store.revoke_tokens_issued_before, user_id, device_id, at)
+
+    async def is_access_token_revoked(
+        self,
+        jti: str,
+        user_id: str,
+        device_id: str,
+        issued_at: datetime,
+    ) -> bool:
+        return await self._check_revocation(
+            self.store.is_access_token_revoked, jti, user_id, device_id, issued_at
+        )
+
+    async def blacklist_token(self, *args: Any, **kwargs: Any) -> None:
+        await self._call(self.store.blacklist_token, *args, **kwargs)
+
+    async def is_token_blacklisted(self, jti: str) -> bool:
+        return await self._check_revocation(self.store.is_token_blacklisted, jti)
@@ -2,6 +2,7 @@ from app.exceptions.user import CannotLogoutCurrentDeviceError, DeviceNotFoundEr
 from app.repositories.user_device import UserDeviceRepository
 from app.schemas.device import DeviceResponse
 from app.services.auth_event_logger import AuthEventLogger
+from app.services.read_routing import RecentWriteMarker, mark_recent_write
 from app.services.token_store import TokenStore
 
 
@@ -10,9 +11,11 @@ class DeviceService:
         self,
         device_repo: UserDeviceRepository,
         token_store: TokenStore,
+        recent_writes: RecentWriteMarker,
     ) -> None:
         self.device_repo = device_repo
         self.token_store = token_store
+        self.recent_writes = recent_writes
 
     async def get_devices(
         self, user_id: str, current_device_id: str
@@ -46,8 +49,10 @@ class DeviceService:
         if device is None or not device.is_active:
             raise DeviceNotFoundError()
 
+        await self.token_store.revoke_tokens_issued_before(user_id, target_device_id)
         await self.token_store.delete_refresh_token(user_id, target_device_id)
         await self.device_repo.deactivate_device(user_id, target_device_id)
+        await mark_recent_write(self.recent_writes, user_id)
 
         await AuthEventLogger.log_logout(
             user_id=user_id,
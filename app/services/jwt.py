@@ -1,16 +1,34 @@
+import asyncio
+import functools
+import uuid
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-
-import uuid
+from pathlib import Path
+from typing import Any, TypeVar
 
 import jwt
+import structlog
 
 from app.core.config import get_settings
+from app.services.keyring import (
+    KeyRing,
+    VerificationKey,
+    key_files_fingerprint,
+    load_keyring,
+)
+from app.services.token_cache import VerifiedTokenCache
 
+logger = structlog.get_logger("app.services.jwt")
 settings = get_settings()
 
+T = TypeVar("T")
 
-@dataclass
+SUPPORTED_ALGORITHMS = ("RS256", "ES256", "EdDSA")
+
+
+@dataclass(frozen=True)
 class AccessTokenPayload:
     sub: str
     email: str
@@ -31,21 +49,108 @@ class RefreshTokenPayload:
 
 
 class JWTService:
-    def __init__(self) -> None:
-        self._private_key: str | None = None
-        self._public_key: str | None = None
+    def __init__(
+        self,
+        algorithm: str | None = None,
+        private_key_path: Path | None = None,
+        public_key_path: Path | None = None,
+        verification_keys_dir: Path | None = None,
+        executor_workers: int | None = None,
+    ) -> None:
+        self.algorithm = algorithm or settings.jwt_algorithm
+        if self.algorithm not in SUPPORTED_ALGORITHMS:
+            raise ValueError(f"Unsupported JWT algorithm: {self.algorithm}")
+        self.private_key_path = private_key_path or settings.jwt_private_key_path
+        self.public_key_path = public_key_path or settings.jwt_public_key_path
+        self.verification_keys_dir = (
+            verification_keys_dir or settings.jwt_verification_keys_dir
+        )
+        self._keyring: KeyRing | None = None
+        self._key_files_fingerprint: tuple[tuple[str, int, int], ...] | None = None
+        # Signature verification runs once per access token per process;
+        # expiry is re-checked on every lookup.
+        self._verified_cache: VerifiedTokenCache[AccessTokenPayload] | None = (
+            VerifiedTokenCache(settings.jwt_verify_cache_size)
+            if settings.jwt_verify_cache_size > 0
+            else None
+        )
+        # cryptography releases the GIL while signing/verifying, so the async
+        # variants run on this pool and use other cores.
+        self.executor_workers = (
+            settings.jwt_executor_workers if executor_workers is None else executor_workers
+        )
+        self._executor: ThreadPoolExecutor | None = None
 
+    # Keys are parsed once into cryptography key objects; PyJWT then uses them
+    # as-is instead of re-parsing the PEM on every sign/verify.
     @property
-    def private_key(self) -> str:
-        if self._private_key is None:
-            self._private_key = settings.jwt_private_key_path.read_text()
-        return self._private_key
+    def keyring(self) -> KeyRing:
+        if self._keyring is None:
+            self._load_keyring()
+        assert self._keyring is not None
+        return self._keyring
 
-    @property
-    def public_key(self) -> str:
-        if self._public_key is None:
-            self._public_key = settings.jwt_public_key_path.read_text()
-        return self._public_key
+    def _fingerprint(self) -> tuple[tuple[str, int, int], ...]:
+        return key_files_fingerprint(
+            self.private_key_path, self.public_key_path, self.verification_keys_dir
+        )
+
+    def _load_keyring(self) -> None:
+        fingerprint = self._fingerprint()
+        self._keyring = load_keyring(
+            self.algorithm,
+            self.private_key_path,
+            self.public_key_path,
+            self.verification_keys_dir,
+        )
+        self._key_files_fingerprint = fingerprint
+        # A removed key must revoke tokens it signed, including cached ones.
+        if self._verified_cache is not None:
+            self._verified_cache.clear()
+
+    def reload_keys_if_changed(self) -> bool:
+        """Reload the keyring if any key file changed on disk.
+
+        On a load error (e.g. a half-written file during rotation) the current
+        keyring stays in place and the error propagates to the caller.
+        """
+        if self._keyring is not None and self._fingerprint() == self._key_files_fingerprint:
+            return False
+        self._load_keyring()
+        return True
+
+    async def watch_keys(self, interval_seconds: float) -> None:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                if self.reload_keys_if_changed():
+                    await logger.ainfo(
+                        "JWT keyring reloaded",
+                        signing_kid=self.keyring.signing_key.kid,
+                        verification_kids=list(self.keyring.verification_keys),
+                    )
+            except Exception as e:
+                await logger.awarning("JWT keyring reload failed", error=str(e))
+
+    def _verification_key(self, token: str) -> VerificationKey | None:
+        try:
+            kid = jwt.get_unverified_header(token).get("kid")
+        except jwt.InvalidTokenError:
+            return None
+        keyring = self.keyring
+        if kid is None:
+            # Tokens issued before kid headers were introduced
+            kid = keyring.signing_key.kid
+        return keyring.get(kid)
+
+    def _encode(self, payload: dict) -> str:
+        signing_key = self.keyring.signing_key
+        return jwt.encode(
+            payload,
+            signing_key.private_key,
+            algorithm=signing_key.algorithm,
+            headers={"kid": signing_key.kid},
+        )
 
     def create_access_token(
         self,
@@ -62,7 +167,8 @@ class JWTService:
             "iss": settings.jwt_issuer,
             "sub": user_id,
             "aud": settings.jwt_audience,
-            "iat": now,
+            # Millisecond precision so revocation epochs compare exactly.
+            "iat": round(now.timestamp(), 3),
             "exp": exp,
             "jti": jti,
             "type": "access",
@@ -71,7 +177,7 @@ class JWTService:
             "name": name,
         }
 
-        token = jwt.encode(payload, self.private_key, algorithm=settings.jwt_algorithm)
+        token = self._encode(payload)
         return token, jti, exp
 
     def create_refresh_token(
@@ -93,30 +199,42 @@ class JWTService:
             "device_id": device_id,
         }
 
-        token = jwt.encode(payload, self.private_key, algorithm=settings.jwt_algorithm)
+        token = self._encode(payload)
         return token, jti, exp
 
     def decode_access_token(self, token: str) -> AccessTokenPayload:
+        if self._verified_cache is not None:
+            cached = self._verified_cache.get(token)
+            if cached is not None:
+                return cached
+        return self._decode_access_token_uncached(token)
+
+    def _decode_access_token_uncached(self, token: str) -> AccessTokenPayload:
+        key = self._verification_key(token)
+        if key is None:
+            from app.exceptions.auth import InvalidTokenError
+            raise InvalidTokenError()
+
         try:
             payload = jwt.decode(
                 token,
-                self.public_key,
-                algorithms=[settings.jwt_algorithm],
+                key.public_key,
+                algorithms=[key.algorithm],
                 issuer=settings.jwt_issuer,
                 audience=settings.jwt_audience,
             )
-        except jwt.ExpiredSignatureError:
+        except jwt.ExpiredSignatureError as e:
             from app.exceptions.auth import TokenExpiredError
-            raise TokenExpiredError()
-        except jwt.InvalidTokenError:
+            raise TokenExpiredError() from e
+        except jwt.InvalidTokenError as e:
             from app.exceptions.auth import InvalidTokenError
-            raise InvalidTokenError()
+            raise InvalidTokenError() from e
 
         if payload.get("type") != "access":
             from app.exceptions.auth import InvalidTokenError
             raise InvalidTokenError()
 
-        return AccessTokenPayload(
+        result = AccessTokenPayload(
             sub=payload["sub"],
             email=payload["email"],
             name=payload["name"],
@@ -125,22 +243,30 @@ class JWTService:
             exp=datetime.fromtimestamp(payload["exp"], tz=timezone.utc),
             iat=datetime.fromtimestamp(payload["iat"], tz=timezone.utc),
         )
+        if self._verified_cache is not None:
+            self._verified_cache.put(token, result)
+        return result
 
     def decode_refresh_token(self, token: str) -> RefreshTokenPayload:
+        key = self._verification_key(token)
+        if key is None:
+            from app.exceptions.auth import InvalidRefreshTokenError
+            raise InvalidRefreshTokenError()
+
         try:
             payload = jwt.decode(
                 token,
-                self.public_key,
-                algorithms=[settings.jwt_algorithm],
+                key.public_key,
+                algorithms=[key.algorithm],
                 issuer=settings.jwt_issuer,
                 options={"verify_aud": False},
             )
-        except jwt.ExpiredSignatureError:
+        except jwt.ExpiredSignatureError as e:
             from app.exceptions.auth import SessionExpiredError
-            raise SessionExpiredError()
-        except jwt.InvalidTokenError:
+            raise SessionExpiredError() from e
+        except jwt.InvalidTokenError as e:
             from app.exceptions.auth import InvalidRefreshTokenError
-            raise InvalidRefreshTokenError()
+            raise InvalidRefreshTokenError() from e
 
         if payload.get("type") != "refresh":
             from app.exceptions.auth import InvalidRefreshTokenError
@@ -156,17 +282,62 @@ class JWTService:
 
     def validate_keys(self) -> None:
         """Validate JWT key files exist and are readable at startup."""
-        if not settings.jwt_private_key_path.exists():
-            raise FileNotFoundError(
-                f"JWT private key not found: {settings.jwt_private_key_path}"
-            )
-        if not settings.jwt_public_key_path.exists():
-            raise FileNotFoundError(
-                f"JWT public key not found: {settings.jwt_public_key_path}"
+        if not self.private_key_path.exists():
+            raise FileNotFoundError(f"JWT private key not found: {self.private_key_path}")
+        if not self.public_key_path.exists():
+            raise FileNotFoundError(f"JWT public key not found: {self.public_key_path}")
+        # Force load keys to validate they're readable and match the algorithm
+        self._load_keyring()
+
+    # --- Async variants (run on the JWT thread pool) ---
+
+    async def _run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        if self.executor_workers <= 0:
+            return fn(*args, **kwargs)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.executor_workers, thread_name_prefix="jwt"
             )
-        # Force load keys to validate they're readable
-        _ = self.private_key
-        _ = self.public_key
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+
+    async def create_access_token_async(
+        self,
+        user_id: str,
+        email: str,
+        name: str,
+        device_id: str,
+    ) -> tuple[str, str, datetime]:
+        return await self._run(
+            self.create_access_token,
+            user_id=user_id,
+            email=email,
+            name=name,
+            device_id=device_id,
+        )
+
+    async def create_refresh_token_async(
+        self,
+        user_id: str,
+        device_id: str,
+    ) -> tuple[str, str, datetime]:
+        return await self._run(self.create_refresh_token, user_id=user_id, device_id=device_id)
+
+    async def decode_access_token_async(self, token: str) -> AccessTokenPayload:
+        # Cache hits are a dict lookup; only real verification is offloaded.
+        if self._verified_cache is not None:
+            cached = self._verified_cache.get(token)
+            if cached is not None:
+                return cached
+        return await self._run(self._decode_access_token_uncached, token)
+
+    async def decode_refresh_token_async(self, token: str) -> RefreshTokenPayload:
+        return await self._run(self.decode_refresh_token, token)
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
 
 
 _jwt_service: JWTService | None = None
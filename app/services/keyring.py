@@ -0,0 +1,144 @@
+import base64
+import hashlib
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+from cryptography.hazmat.primitives.asymmetric.types import (
+    PrivateKeyTypes,
+    PublicKeyTypes,
+)
+
+# RFC 7638: members that make up a JWK thumbprint, per key type.
+_THUMBPRINT_MEMBERS = {
+    "RSA": ("e", "kty", "n"),
+    "EC": ("crv", "kty", "x", "y"),
+    "OKP": ("crv", "kty", "x"),
+}
+
+
+@dataclass(frozen=True)
+class VerificationKey:
+    kid: str
+    algorithm: str
+    public_key: PublicKeyTypes
+    jwk: dict[str, Any]
+
+
+@dataclass(frozen=True)
+class SigningKey:
+    kid: str
+    algorithm: str
+    private_key: PrivateKeyTypes
+
+
+@dataclass(frozen=True)
+class KeyRing:
+    """One active signing key plus every key tokens may still be verified with.
+
+    Instances are immutable; reloading builds a new ring and swaps it in, so
+    readers never see a half-updated set of keys.
+    """
+
+    signing_key: SigningKey
+    verification_keys: dict[str, VerificationKey]
+    jwks_json: bytes = field(init=False)
+    etag: str = field(init=False)
+
+    def __post_init__(self) -> None:
+        jwks = {"keys": [key.jwk for key in self.verification_keys.values()]}
+        body = json.dumps(jwks, separators=(",", ":"), sort_keys=True).encode()
+        object.__setattr__(self, "jwks_json", body)
+        object.__setattr__(self, "etag", f'"{hashlib.sha256(body).hexdigest()[:32]}"')
+
+    def get(self, kid: str) -> VerificationKey | None:
+        return self.verification_keys.get(kid)
+
+
+def algorithm_for_key(key: PublicKeyTypes) -> str:
+    if isinstance(key, rsa.RSAPublicKey):
+        return "RS256"
+    if isinstance(key, ec.EllipticCurvePublicKey) and isinstance(key.curve, ec.SECP256R1):
+        return "ES256"
+    if isinstance(key, ed25519.Ed25519PublicKey):
+        return "EdDSA"
+    raise ValueError(f"Unsupported JWT key type: {type(key).__name__}")
+
+
+def _to_jwk(key: PublicKeyTypes, algorithm: str) -> dict[str, Any]:
+    impl = jwt.get_algorithm_by_name(algorithm)
+    return impl.to_jwk(key, as_dict=True)
+
+
+def _thumbprint(jwk: dict[str, Any]) -> str:
+    members = {name: jwk[name] for name in _THUMBPRINT_MEMBERS[jwk["kty"]]}
+    canonical = json.dumps(members, separators=(",", ":"), sort_keys=True).encode()
+    digest = hashlib.sha256(canonical).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+
+def build_verification_key(public_key: PublicKeyTypes) -> VerificationKey:
+    algorithm = algorithm_for_key(public_key)
+    jwk = _to_jwk(public_key, algorithm)
+    jwk.pop("key_ops", None)  # "use" is set instead; RFC 7517 advises against both
+    kid = _thumbprint(jwk)
+    jwk.update(kid=kid, alg=algorithm, use="sig")
+    return VerificationKey(kid=kid, algorithm=algorithm, public_key=public_key, jwk=jwk)
+
+
+def load_keyring(
+    algorithm: str,
+    private_key_path: Path,
+    public_key_path: Path,
+    verification_keys_dir: Path | None = None,
+) -> KeyRing:
+    private_key = serialization.load_pem_private_key(
+        private_key_path.read_bytes(), password=None
+    )
+    active = build_verification_key(private_key.public_key())
+    if active.algorithm != algorithm:
+        raise ValueError(
+            f"JWT private key is a {active.algorithm} key but jwt_algorithm is {algorithm}"
+        )
+
+    published = build_verification_key(
+        serialization.load_pem_public_key(public_key_path.read_bytes())
+    )
+    if published.kid != active.kid:
+        raise ValueError("JWT public key does not match the private key")
+
+    verification_keys = {active.kid: active}
+    if verification_keys_dir is not None and verification_keys_dir.is_dir():
+        for path in sorted(verification_keys_dir.glob("*.pem")):
+            key = build_verification_key(serialization.load_pem_public_key(path.read_bytes()))
+            verification_keys.setdefault(key.kid, key)
+
+    return KeyRing(
+        signing_key=SigningKey(kid=active.kid, algorithm=algorithm, private_key=private_key),
+        verification_keys=verification_keys,
+    )
+
+
+def key_files_fingerprint(
+    private_key_path: Path,
+    public_key_path: Path,
+    verification_keys_dir: Path | None = None,
+) -> tuple[tuple[str, int, int], ...]:
+    """Cheap change detector for the key files (path, mtime, size)."""
+    paths = [private_key_path, public_key_path]
+    if verification_keys_dir is not None and verification_keys_dir.is_dir():
+        paths.extend(sorted(verification_keys_dir.glob("*.pem")))
+
+    fingerprint = []
+    for path in paths:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            fingerprint.append((str(path), -1, -1))
+        else:
+            fingerprint.append((str(path), stat.st_mtime_ns, stat.st_size))
+    return tuple(fingerprint)
@@ -0,0 +1,63 @@
+import base64
+import binascii
+from datetime import datetime
+
+from app.exceptions.user import InvalidHistoryCursorError
+from app.repositories.login_history import LoginHistoryRepository
+from app.schemas.login_history import LoginHistoryItem, LoginHistoryPage
+
+
+def encode_cursor(login_at: datetime, row_id: int) -> str:
+    raw = f"{login_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        login_at, row_id = raw.split("|")
+        return datetime.fromisoformat(login_at), int(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidHistoryCursorError() from e
+
+
+class LoginHistoryService:
+    def __init__(self, history_repo: LoginHistoryRepository) -> None:
+        self.history_repo = history_repo
+
+    async def get_history(
+        self,
+        user_id: str,
+        limit: int,
+        cursor: str | None = None,
+        success: bool | None = None,
+        device_id: str | None = None,
+    ) -> LoginHistoryPage:
+        # One extra row tells whether another page exists without a COUNT.
+        rows = await self.history_repo.list_for_user(
+            user_id,
+            limit + 1,
+            before=decode_cursor(cursor) if cursor else None,
+            success=success,
+            device_id=device_id,
+        )
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].login_at, rows[-1].id)
+        return LoginHistoryPage(
+            items=[
+                LoginHistoryItem(
+                    device_id=r.device_id,
+                    ip_address=r.ip_address,
+                    os_type=r.os_type,
+                    app_version=r.app_version,
+                    login_at=r.login_at,
+                    login_type=r.login_type,
+                    success=r.success,
+                    failure_reason=r.failure_reason,
+                )
+                for r in rows
+            ],
+            next_cursor=next_cursor,
+        )
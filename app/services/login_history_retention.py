@@ -0,0 +1,192 @@
+import asyncio
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+
+import structlog
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.core.config import get_settings
+from app.models.login_history import LoginHistory
+
+logger = structlog.get_logger("app.services.login_history_retention")
+settings = get_settings()
+
+TABLE = LoginHistory.__tablename__
+FUTURE_PARTITION = "p_future"
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"p{month:%Y%m}"
+
+
+def partition_month(name: str) -> date | None:
+    """Month of a ``pYYYYMM`` partition; ``None`` for any other name."""
+    if len(name) != 7 or not name.startswith("p") or not name[1:].isdigit():
+        return None
+    try:
+        return date(int(name[1:5]), int(name[5:7]), 1)
+    except ValueError:
+        return None
+
+
+def partition_definitions(first_month: date, last_month: date) -> str:
+    """MySQL RANGE COLUMNS partitions, one per month, plus a catch-all.
+
+    The first partition also holds anything older than ``first_month``;
+    ``p_future`` catches rows past ``last_month`` until it is split.
+    """
+    parts = []
+    month = first_month.replace(day=1)
+    while month <= last_month:
+        upper = add_months(month, 1)
+        parts.append(f"PARTITION {partition_name(month)} VALUES LESS THAN ('{upper:%Y-%m-%d}')")
+        month = upper
+    parts.append(f"PARTITION {FUTURE_PARTITION} VALUES LESS THAN (MAXVALUE)")
+    return ", ".join(parts)
+
+
+@dataclass
+class PurgeResult:
+    dropped_partitions: list[str] = field(default_factory=list)
+    deleted_rows: int = 0
+
+
+class LoginHistoryRetention:
+    """Keeps ``login_histories`` within ``login_history_retention_days``.
+
+    On MySQL, once the table is partitioned by month (see the Alembic
+    migration), whole months past the cutoff are dropped with DROP
+    PARTITION, which is a metadata operation instead of a row-by-row delete,
+    and partitions for upcoming months are split off ``p_future`` ahead of
+    time. Anywhere else (SQLite, unpartitioned tables) old rows are deleted
+    in small primary-key batches, each in its own short transaction.
+    """
+
+    def __init__(self, engine: AsyncEngine) -> None:
+        self.engine = engine
+
+    async def _partitions(self, conn: AsyncConnection) -> list[str]:
+        if conn.dialect.name != "mysql":
+            return []
+        result = await conn.execute(
+            text(
+                "SELECT PARTITION_NAME FROM information_schema.PARTITIONS "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table "
+                "AND PARTITION_NAME IS NOT NULL ORDER BY PARTITION_ORDINAL_POSITION"
+            ),
+            {"table": TABLE},
+        )
+        return list(result.scalars())
+
+    async def ensure_partitions(
+        self,
+        months_ahead: int | None = None,
+        today: date | None = None,
+    ) -> list[str]:
+        """Split monthly partitions off ``p_future`` up to ``months_ahead`` months out.
+
+        Returns the partitions created; a no-op unless the table is partitioned.
+        If every monthly partition has been dropped and only ``p_future`` is
+        left, partitioning restarts from the month of its oldest row.
+        """
+        if months_ahead is None:
+            months_ahead = settings.login_history_partition_months_ahead
+        today = today or datetime.now(timezone.utc).date()
+        async with self.engine.begin() as conn:
+            existing = await self._partitions(conn)
+            if FUTURE_PARTITION not in existing:
+                return []
+            months = [m for m in map(partition_month, existing) if m is not None]
+            if months:
+                first_new = add_months(max(months), 1)
+            else:
+                oldest = (await conn.execute(
+                    select(func.min(LoginHistory.login_at))
+                )).scalar()
+                first_new = (oldest.date() if oldest else today).replace(day=1)
+            last = add_months(today.replace(day=1), months_ahead)
+            if first_new > last:
+                return []
+            await conn.execute(text(
+                f"ALTER TABLE {TABLE} REORGANIZE PARTITION {FUTURE_PARTITION} INTO "
+                f"({partition_definitions(first_new, last)})"
+            ))
+        created = []
+        month = first_new
+        while month <= last:
+            created.append(partition_name(month))
+            month = add_months(month, 1)
+        await logger.ainfo("Login history partitions created", partitions=created)
+        return created
+
+    async def purge(
+        self,
+        retention_days: int | None = None,
+        batch_size: int | None = None,
+        pause: float = 0.0,
+        now: datetime | None = None,
+    ) -> PurgeResult:
+        if retention_days is None:
+            retention_days = settings.login_history_retention_days
+        cutoff = (now or datetime.now(timezone.utc)) - timedelta(days=retention_days)
+        result = PurgeResult()
+
+        async with self.engine.begin() as conn:
+            partitions = await self._partitions(conn)
+            # A partition only goes once its whole month is past the cutoff.
+            expired = [
+                name
+                for name in partitions
+                if (month := partition_month(name)) is not None
+                and add_months(month, 1) <= cutoff.date()
+            ]
+            if expired:
+                await conn.execute(
+                    text(f"ALTER TABLE {TABLE} DROP PARTITION {', '.join(expired)}")
+                )
+                result.dropped_partitions = expired
+        if partitions:
+            await logger.ainfo("Login history partitions dropped", partitions=expired)
+            return result
+
+        result.deleted_rows = await self._delete_in_batches(
+            cutoff, batch_size or settings.login_history_purge_batch_size, pause
+        )
+        await logger.ainfo("Login history purged", rows=result.deleted_rows, cutoff=cutoff)
+        return result
+
+    async def _delete_in_batches(self, cutoff: datetime, batch_size: int, pause: float) -> int:
+        # Walks the primary key, which follows insertion (and so login) time,
+        # and stops at the first row inside the retention window. Every batch
+        # is a PK range read plus a DELETE by id, so no statement scans the
+        # table or holds locks for long.
+        deleted = 0
+        last_id = 0
+        while True:
+            async with self.engine.begin() as conn:
+                rows = (await conn.execute(
+                    select(LoginHistory.id, LoginHistory.login_at)
+                    .where(LoginHistory.id > last_id)
+                    .order_by(LoginHistory.id)
+                    .limit(batch_size)
+                )).all()
+                expired = [row.id for row in rows if _as_utc(row.login_at) < cutoff]
+                if expired:
+                    await conn.execute(delete(LoginHistory).where(LoginHistory.id.in_(expired)))
+            deleted += len(expired)
+            if len(expired) < len(rows) or len(rows) < batch_size:
+                return deleted
+            last_id = rows[-1].id
+            if pause:
+                await asyncio.sleep(pause)
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite returns naive datetimes for timezone-aware columns
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
@@ -0,0 +1,314 @@
+import heapq
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from app.core.config import get_settings
+from app.services.token_store import RotationResult, UserClaims
+
+settings = get_settings()
+
+# Heap size below which superseded entries are not worth compacting away
+_MIN_HEAP_LIMIT = 1024
+
+
+@dataclass(slots=True)
+class _Session:
+    token_id: str
+    device_name: str | None
+    os_type: str | None
+    app_version: str | None
+    ip_address: str | None
+    issued_at: int
+    expires_at: float
+
+
+class MemoryTokenStore:
+    """In-process token store for single-node deployments, tests and benchmarks.
+
+    Same semantics as the Redis backends (expiry, session cap, rotation with
+    reuse detection and a grace window, epochs and blacklist) without a
+    network hop. Every entry is pushed onto one min-heap by expiry and purged
+    lazily at the start of each operation. Operations never await, so each is atomic on the event
+    loop. State is per process: run a single worker.
+    """
+
+    def __init__(self) -> None:
+        self._sessions: dict[str, dict[str, _Session]] = {}
+        self._epochs: dict[str, tuple[float, float]] = {}  # scope -> (epoch, expires_at)
+        self._blacklist: dict[str, float] = {}  # jti -> expires_at
+        self._claims: dict[str, tuple[UserClaims, float]] = {}  # user_id -> (claims, expires_at)
+        # old token_id -> (new token_id, response, expires_at)
+        self._grace: dict[str, tuple[str, dict, float]] = {}
+        # (expires_at, kind, key, device_id); stale entries are skipped on pop
+        self._heap: list[tuple[float, str, str, str]] = []
+        self._heap_limit = _MIN_HEAP_LIMIT
+
+    def _schedule(self, expires_at: float, kind: str, key: str, device_id: str = "") -> None:
+        heapq.heappush(self._heap, (expires_at, kind, key, device_id))
+        if len(self._heap) > self._heap_limit:
+            self._rebuild_heap()
+
+    def _rebuild_heap(self) -> None:
+        # Rotations, logouts and overwrites leave superseded entries behind until
+        # their own expiry (up to the refresh token lifetime). Once the heap has
+        # grown to twice its size after the last rebuild, it is rebuilt from the
+        # live entries alone, so it stays within 2x the live keys at O(1)
+        # amortized cost per write.
+        heap = [
+            (session.expires_at, "session", user_id, device_id)
+            for user_id, sessions in self._sessions.items()
+            for device_id, session in sessions.items()
+        ]
+        heap += [(exp, "epoch", scope, "") for scope, (_, exp) in self._epochs.items()]
+        heap += [(exp, "claims", user_id, "") for user_id, (_, exp) in self._claims.items()]
+        heap += [(exp, "grace", token_id, "") for token_id, (_, _, exp) in self._grace.items()]
+        heap += [(exp, "blacklist", jti, "") for jti, exp in self._blacklist.items()]
+        heapq.heapify(heap)
+        self._heap = heap
+        self._heap_limit = max(_MIN_HEAP_LIMIT, 2 * len(heap))
+
+    def _purge(self, now: float) -> None:
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            expires_at, kind, key, device_id = heapq.heappop(heap)
+            if kind == "session":
+                sessions = self._sessions.get(key)
+                session = sessions.get(device_id) if sessions else None
+                if session is not None and session.expires_at == expires_at:
+                    del sessions[device_id]
+                    if not sessions:
+                        del self._sessions[key]
+            elif kind == "epoch":
+                if self._epochs.get(key, (0.0, 0.0))[1] == expires_at:
+                    del self._epochs[key]
+            elif kind == "claims":
+                if self._claims.get(key, (None, 0.0))[1] == expires_at:
+                    del self._claims[key]
+            elif kind == "grace":
+                if key in self._grace and self._grace[key][2] == expires_at:
+                    del self._grace[key]
+            elif self._blacklist.get(key) == expires_at:
+                del self._blacklist[key]
+
+    def _put_session(
+        self,
+        user_id: str,
+        device_id: str,
+        token_id: str,
+        device_name: str | None,
+        os_type: str | None,
+        app_version: str | None,
+        ip_address: str | None,
+        now: float,
+        expires_at: datetime,
+    ) -> None:
+        session = _Session(
+            token_id=token_id,
+            device_name=device_name,
+            os_type=os_type,
+            app_version=app_version,
+            ip_address=ip_address,
+            issued_at=int(now),
+            expires_at=expires_at.timestamp(),
+        )
+        self._sessions.setdefault(user_id, {})[device_id] = session
+        self._schedule(session.expires_at, "session", user_id, device_id)
+
+    # --- Refresh Token Storage ---
+
+    async def store_refresh_token(
+        self,
+        user_id: str,
+        device_id: str,
+        token_id: str,
+        device_name: str | None,
+        os_type: str | None,
+        app_version: str | None,
+        ip_address: str | None,
+        expires_at: datetime,
+    ) -> list[str]:
+        now = time.time()
+        self._purge(now)
+        if expires_at.timestamp() <= now:
+            return []
+
+        evicted: list[str] = []
+        sessions = self._sessions.get(user_id, {})
+        max_sessions = settings.max_sessions_per_user
+        others = [d for d in sessions if d != device_id]
+        if max_sessions > 0 and len(others) >= max_sessions:
+            others.sort(key=lambda d: sessions[d].expires_at)
+            evicted = others[: len(others) - max_sessions + 1]
+            for evicted_device_id in evicted:
+                del sessions[evicted_device_id]
+
+        self._put_session(
+            user_id, device_id, token_id, device_name, os_type, app_version, ip_address,
+            now, expires_at,
+        )
+        return evicted
+
+    async def rotate_refresh_token(
+        self,
+        user_id: str,
+        device_id: str,
+        old_token_id: str,
+        new_token_id: str,
+        device_name: str | None,
+        os_type: str | None,
+        app_version: str | None,
+        ip_address: str | None,
+        expires_at: datetime,
+        grace_response: dict[str, str] | None = None,
+    ) -> RotationResult:
+        now = time.time()
+        self._purge(now)
+        current = self._sessions.get(user_id, {}).get(device_id)
+        if current is None:
+            return RotationResult.NOT_FOUND
+        if current.token_id != old_token_id:
+            grace = self._grace.get(old_token_id)
+            if grace is not None and grace[0] == current.token_id:
+                return RotationResult.GRACE
+            await self.delete_refresh_token(user_id, device_id)
+            return RotationResult.REUSED
+
+        self._put_session(
+            user_id, device_id, new_token_id, device_name, os_type, app_version, ip_address,
+            now, expires_at,
+        )
+        if grace_response is not None and settings.refresh_grace_seconds > 0:
+            grace_expires_at = now + settings.refresh_grace_seconds
+            self._grace[old_token_id] = (new_token_id, grace_response, grace_expires_at)
+            self._schedule(grace_expires_at, "grace", old_token_id)
+        return RotationResult.OK
+
+    async def get_rotation_grace(
+        self, user_id: str, device_id: str, old_token_id: str
+    ) -> dict[str, str] | None:
+        self._purge(time.time())
+        return self._valid_grace(user_id, device_id, old_token_id)
+
+    async def get_refresh_state(
+        self, user_id: str, device_id: str, old_token_id: str
+    ) -> tuple[UserClaims | None, dict[str, str] | None]:
+        self._purge(time.time())
+        claims = self._claims.get(user_id)
+        return (
+            claims[0] if claims is not None else None,
+            self._valid_grace(user_id, device_id, old_token_id),
+        )
+
+    def _valid_grace(self, user_id: str, device_id: str, old_token_id: str) -> dict[str, str] | None:
+        grace = self._grace.get(old_token_id)
+        current = self._sessions.get(user_id, {}).get(device_id)
+        if grace is None or current is None or grace[0] != current.token_id:
+            return None
+        return grace[1]
+
+    async def get_refresh_token(self, user_id: str, device_id: str) -> dict | None:
+        self._purge(time.time())
+        session = self._sessions.get(user_id, {}).get(device_id)
+        if session is None:
+            return None
+        return {
+            "token_id": session.token_id,
+            "user_id": user_id,
+            "device_id": device_id,
+            "device_name": session.device_name,
+            "os_type": session.os_type,
+            "app_version": session.app_version,
+            "ip_address": session.ip_address,
+            "issued_at": session.issued_at,
+            "expires_at": int(session.expires_at),
+        }
+
+    async def delete_refresh_token(self, user_id: str, device_id: str) -> None:
+        sessions = self._sessions.get(user_id)
+        if sessions is not None:
+            sessions.pop(device_id, None)
+            if not sessions:
+                del self._sessions[user_id]
+
+    async def delete_all_refresh_tokens(self, user_id: str) -> int:
+        self._purge(time.time())
+        return len(self._sessions.pop(user_id, {}))
+
+    async def get_active_device_ids(self, user_id: str) -> set[str]:
+        self._purge(time.time())
+        return set(self._sessions.get(user_id, {}))
+
+    # --- Token Claims ---
+
+    async def get_user_claims(self, user_id: str) -> UserClaims | None:
+        self._purge(time.time())
+        entry = self._claims.get(user_id)
+        return entry[0] if entry is not None else None
+
+    async def set_user_claims(self, user_id: str, claims: UserClaims) -> None:
+        expires_at = time.time() + settings.jwt_refresh_token_expire_seconds
+        self._claims[user_id] = (dict(claims), expires_at)
+        self._schedule(expires_at, "claims", user_id)
+
+    async def delete_user_claims(self, user_id: str) -> None:
+        self._claims.pop(user_id, None)
+
+    # --- Revocation ---
+
+    async def revoke_tokens_issued_before(
+        self,
+        user_id: str,
+        device_id: str | None = None,
+        at: datetime | None = None,
+    ) -> float:
+        scope = user_id if device_id is None else f"{user_id}:{device_id}"
+        epoch = round((at or datetime.now(timezone.utc)).timestamp(), 3)
+        expires_at = time.time() + settings.jwt_access_token_expire_seconds
+        if epoch >= self._epochs.get(scope, (0.0, 0.0))[0]:
+            self._epochs[scope] = (epoch, expires_at)
+            self._schedule(expires_at, "epoch", scope)
+        return epoch
+
+    async def is_access_token_revoked(
+        self,
+        jti: str,
+        user_id: str,
+        device_id: str,
+        issued_at: datetime,
+    ) -> bool:
+        self._purge(time.time())
+        iat = issued_at.timestamp()
+        return (
+            iat < self._epochs.get(user_id, (0.0, 0.0))[0]
+            or iat < self._epochs.get(f"{user_id}:{device_id}", (0.0, 0.0))[0]
+            or jti in self._blacklist
+        )
+
+    async def blacklist_token(
+        self,
+        jti: str,
+        user_id: str,
+        device_id: str,
+        reason: str,
+        ttl_seconds: int,
+    ) -> None:
+        if ttl_seconds <= 0:
+            return
+        expires_at = time.time() + ttl_seconds
+        self._blacklist[jti] = expires_at
+        self._schedule(expires_at, "blacklist", jti)
+
+    async def is_token_blacklisted(self, jti: str) -> bool:
+        self._purge(time.time())
+        return jti in self._blacklist
+
+
+memory_token_store: MemoryTokenStore | None = None
+
+
+def get_memory_token_store() -> MemoryTokenStore:
+    global memory_token_store
+    if memory_token_store is None:
+        memory_token_store = MemoryTokenStore()
+    return memory_token_store
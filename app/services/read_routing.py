@@ -0,0 +1,107 @@
+import time
+from typing import Protocol
+
+from app.core import database as database_module
+from app.core.circuit_breaker import CircuitBreaker
+from app.core.config import get_settings
+from app.core.redis import RedisClient
+from app.services.breaker_token_store import call_through_breaker
+from app.services.redis_keys import RedisKeys, get_redis_keys
+
+settings = get_settings()
+
+# Marker count at which expired entries are swept out of the memory marker
+_MIN_SWEEP_AT = 1024
+
+
+class RecentWriteMarker(Protocol):
+    """Remembers which users wrote recently, so their reads stay on the primary."""
+
+    async def mark(self, user_id: str, ttl_seconds: float) -> None:
+        """Send the user's reads to the primary database for the next ``ttl_seconds``."""
+        ...
+
+    async def is_marked(self, user_id: str) -> bool: ...
+
+
+class MemoryRecentWriteMarker:
+    """Per-process marker for the memory token store backend (single worker)."""
+
+    def __init__(self) -> None:
+        self._expires_at: dict[str, float] = {}  # user_id -> expires_at
+        self._sweep_at = _MIN_SWEEP_AT
+
+    async def mark(self, user_id: str, ttl_seconds: float) -> None:
+        now = time.time()
+        self._expires_at[user_id] = now + ttl_seconds
+        if len(self._expires_at) > self._sweep_at:
+            self._expires_at = {u: exp for u, exp in self._expires_at.items() if exp > now}
+            self._sweep_at = max(_MIN_SWEEP_AT, 2 * len(self._expires_at))
+
+    async def is_marked(self, user_id: str) -> bool:
+        expires_at = self._expires_at.get(user_id)
+        if expires_at is None:
+            return False
+        if expires_at <= time.time():
+            del self._expires_at[user_id]
+            return False
+        return True
+
+
+class RedisRecentWriteMarker:
+    """One ``recent_write`` key per user with a millisecond TTL, shared by all workers.
+
+    Calls go through ``breaker`` when one is given and then fail with
+    ``TokenStoreUnavailableError`` like the token store.
+    """
+
+    def __init__(
+        self,
+        redis: RedisClient,
+        keys: RedisKeys | None = None,
+        breaker: CircuitBreaker | None = None,
+    ) -> None:
+        self.redis = redis
+        self.keys = keys or get_redis_keys()
+        self.breaker = breaker
+
+    async def _set(self, user_id: str, ttl_seconds: float) -> None:
+        await self.redis.set(
+            self.keys.recent_write(user_id), "1", px=max(1, int(ttl_seconds * 1000))
+        )
+
+    async def _exists(self, user_id: str) -> bool:
+        return bool(await self.redis.exists(self.keys.recent_write(user_id)))
+
+    async def mark(self, user_id: str, ttl_seconds: float) -> None:
+        if self.breaker is None:
+            await self._set(user_id, ttl_seconds)
+        else:
+            await call_through_breaker(self.breaker, self._set, user_id, ttl_seconds)
+
+    async def is_marked(self, user_id: str) -> bool:
+        if self.breaker is None:
+            return await self._exists(user_id)
+        return await call_through_breaker(self.breaker, self._exists, user_id)
+
+
+memory_recent_write_marker: MemoryRecentWriteMarker | None = None
+
+
+def get_memory_recent_write_marker() -> MemoryRecentWriteMarker:
+    global memory_recent_write_marker
+    if memory_recent_write_marker is None:
+        memory_recent_write_marker = MemoryRecentWriteMarker()
+    return memory_recent_write_marker
+
+
+async def mark_recent_write(marker: RecentWriteMarker, user_id: str) -> None:
+    """Keep the user's reads on the primary until the replica has caught up.
+
+    Called by services after every write the user can read back (login and
+    logout, profile and password changes, account deletion, device logout).
+    A no-op, with no round trip, unless a replica is configured.
+    """
+    if database_module.replica_session_factory is None:
+        return
+    await marker.mark(user_id, settings.database_replica_max_lag_seconds)
@@ -0,0 +1,76 @@
+import re
+from dataclasses import dataclass
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+# SCAN patterns for epoch keys under either scheme.
+EPOCH_KEY_PATTERNS = ("auth:epoch:*", "auth:{*}:epoch*")
+_LEGACY_EPOCH_PREFIX = "auth:epoch:"
+_TAGGED_EPOCH = re.compile(r"^auth:\{(?P<user_id>[^}]+)\}:epoch(?::(?P<device_id>.+))?$")
+
+
+@dataclass(frozen=True)
+class RedisKeys:
+    """Names of the Redis keys holding a user's sessions and revocation epochs.
+
+    The legacy scheme (``auth:rt:{user_id}:{device_id}``, ``auth:devices:{user_id}``
+    ...) spreads a user's keys over many cluster slots. The tagged scheme puts
+    the user id in a hash tag (``auth:{<user_id>}:rt:{device_id}``), so every
+    key of one user maps to the same slot and can share pipelines, MGET and
+    Lua scripts under Redis Cluster.
+    """
+
+    tagged: bool = False
+
+    def refresh_token_prefix(self, user_id: str) -> str:
+        return f"auth:{{{user_id}}}:rt:" if self.tagged else f"auth:rt:{user_id}:"
+
+    def refresh_token(self, user_id: str, device_id: str) -> str:
+        return self.refresh_token_prefix(user_id) + device_id
+
+    def devices(self, user_id: str) -> str:
+        return f"auth:{{{user_id}}}:devices" if self.tagged else f"auth:devices:{user_id}"
+
+    def sessions(self, user_id: str) -> str:
+        return f"auth:{{{user_id}}}:sessions" if self.tagged else f"auth:sessions:{user_id}"
+
+    def rotation_grace(self, user_id: str, token_id: str) -> str:
+        return (
+            f"auth:{{{user_id}}}:rt_grace:{token_id}"
+            if self.tagged
+            else f"auth:rt_grace:{user_id}:{token_id}"
+        )
+
+    def claims(self, user_id: str) -> str:
+        return f"auth:{{{user_id}}}:claims" if self.tagged else f"auth:claims:{user_id}"
+
+    def recent_write(self, user_id: str) -> str:
+        return (
+            f"auth:{{{user_id}}}:recent_write" if self.tagged else f"auth:recent_write:{user_id}"
+        )
+
+    def epoch(self, user_id: str, device_id: str | None = None) -> str:
+        key = f"auth:{{{user_id}}}:epoch" if self.tagged else f"auth:epoch:{user_id}"
+        return key if device_id is None else f"{key}:{device_id}"
+
+
+LEGACY_KEYS = RedisKeys(tagged=False)
+TAGGED_KEYS = RedisKeys(tagged=True)
+
+
+def epoch_scope(key: str) -> str | None:
+    """Map an epoch key of either scheme to its scope (``user_id[:device_id]``)."""
+    if key.startswith(_LEGACY_EPOCH_PREFIX):
+        return key.removeprefix(_LEGACY_EPOCH_PREFIX)
+    match = _TAGGED_EPOCH.match(key)
+    if match is None:
+        return None
+    if match["device_id"] is None:
+        return match["user_id"]
+    return f"{match['user_id']}:{match['device_id']}"
+
+
+def get_redis_keys() -> RedisKeys:
+    return TAGGED_KEYS if settings.redis_key_scheme == "tagged" else LEGACY_KEYS
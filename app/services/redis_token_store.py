@@ -0,0 +1,830 @@
+import json
+import time
+from datetime import datetime, timezone
+
+import redis.asyncio as aioredis
+import structlog
+from redis.asyncio.cluster import ClusterPipeline, RedisCluster
+from redis.commands.core import AsyncScript
+
+from app.core.config import get_settings
+from app.core.metrics import metrics
+from app.core.redis import RedisClient
+from app.services.blacklist_cache import (
+    BLACKLIST_CHANNEL,
+    BLACKLIST_KEY_PREFIX,
+    get_blacklist_cache,
+)
+from app.services.redis_keys import LEGACY_KEYS, TAGGED_KEYS, RedisKeys, get_redis_keys
+from app.services.token_store import RotationResult, UserClaims
+
+logger = structlog.get_logger("app.services.redis_token_store")
+settings = get_settings()
+
+_blacklist_redis_checks = metrics.counter(
+    "blacklist_redis_checks_total", "Revocation lookups that went to Redis"
+)
+
+# Key names below are for the legacy scheme; see RedisKeys for the tagged one.
+# auth:devices:{user_id} is a sorted set of device ids scored by session
+# expiry. Older deployments kept a plain set; every script converts it in
+# place first (members whose auth:rt key is gone are dropped).
+#
+# Single-slot invariant: which devices a user has is only known inside the
+# script, so the other devices' session keys (evicted by the cap, removed by
+# logout-all, or checked during the set conversion) are built from ARGV[1],
+# the "auth:rt:{user_id}:" prefix, instead of being declared in KEYS. That is
+# only valid when every such key hashes to the slot of the declared KEYS,
+# which the tagged scheme guarantees and RedisTokenStore enforces for Redis
+# Cluster clients (see test_redis_keys). Every key known up front - the
+# device's own session, the index and the grace record - is passed in KEYS.
+_INDEX_PRELUDE = """
+local prefix = ARGV[1]
+local now = tonumber(ARGV[2])
+if redis.call('TYPE', KEYS[2]).ok == 'set' then
+    local members = redis.call('SMEMBERS', KEYS[2])
+    redis.call('DEL', KEYS[2])
+    for _, device_id in ipairs(members) do
+        local pttl = redis.call('PTTL', prefix .. device_id)
+        if pttl > 0 then
+            redis.call('ZADD', KEYS[2], now + pttl / 1000, device_id)
+        end
+    end
+end
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', now)
+"""
+
+# KEYS[1] = auth:rt:{user_id}:{device_id}, KEYS[2] = auth:devices:{user_id}
+# ARGV = prefix, now, device_id, record, ttl, expires_at, max_sessions
+# Returns the device ids evicted to stay within max_sessions.
+_STORE_REFRESH_TOKEN_LUA = _INDEX_PRELUDE + """
+redis.call('SET', KEYS[1], ARGV[4], 'EX', ARGV[5])
+redis.call('ZADD', KEYS[2], ARGV[6], ARGV[3])
+local evicted = {}
+local max_sessions = tonumber(ARGV[7])
+if max_sessions > 0 then
+    local excess = redis.call('ZCARD', KEYS[2]) - max_sessions
+    if excess > 0 then
+        -- lowest expiry = least recently issued/refreshed
+        for _, device_id in ipairs(redis.call('ZRANGE', KEYS[2], 0, excess - 1)) do
+            redis.call('DEL', prefix .. device_id)
+            redis.call('ZREM', KEYS[2], device_id)
+            table.insert(evicted, device_id)
+        end
+    end
+end
+if redis.call('TTL', KEYS[2]) < tonumber(ARGV[5]) then
+    redis.call('EXPIRE', KEYS[2], ARGV[5])
+end
+return evicted
+"""
+
+# KEYS[1] = auth:rt:{user_id}:{device_id}, KEYS[2] = auth:devices:{user_id},
+# KEYS[3] = auth:rt_grace:{user_id}:{expected token_id}
+# ARGV = prefix, now, device_id, expected token_id, new record, ttl, expires_at,
+#        grace record, grace ttl in ms (0 = none)
+_ROTATE_REFRESH_TOKEN_LUA = _INDEX_PRELUDE + """
+local current = redis.call('GET', KEYS[1])
+if not current then
+    redis.call('ZREM', KEYS[2], ARGV[3])
+    return 1
+end
+local current_id = cjson.decode(current)['token_id']
+if current_id ~= ARGV[4] then
+    -- a duplicate of the rotation that produced the current token
+    local grace = redis.call('GET', KEYS[3])
+    if grace and cjson.decode(grace)['token_id'] == current_id then
+        return 3
+    end
+    redis.call('DEL', KEYS[1])
+    redis.call('ZREM', KEYS[2], ARGV[3])
+    return 2
+end
+redis.call('SET', KEYS[1], ARGV[5], 'EX', ARGV[6])
+redis.call('ZADD', KEYS[2], ARGV[7], ARGV[3])
+if redis.call('TTL', KEYS[2]) < tonumber(ARGV[6]) then
+    redis.call('EXPIRE', KEYS[2], ARGV[6])
+end
+if tonumber(ARGV[9]) > 0 then
+    redis.call('SET', KEYS[3], ARGV[8], 'PX', ARGV[9])
+end
+return 0
+"""
+
+# KEYS[1] = auth:rt:{user_id}:{device_id}, KEYS[2] = auth:devices:{user_id}
+# ARGV = prefix, now, device_id
+_DELETE_REFRESH_TOKEN_LUA = _INDEX_PRELUDE + """
+redis.call('DEL', KEYS[1])
+redis.call('ZREM', KEYS[2], ARGV[3])
+return 0
+"""
+
+# KEYS[1] = unused, KEYS[2] = auth:devices:{user_id}
+# ARGV = prefix, now
+# Returns the number of live sessions removed.
+_DELETE_ALL_REFRESH_TOKENS_LUA = _INDEX_PRELUDE + """
+local device_ids = redis.call('ZRANGE', KEYS[2], 0, -1)
+for _, device_id in ipairs(device_ids) do
+    redis.call('DEL', prefix .. device_id)
+end
+redis.call('DEL', KEYS[2])
+return #device_ids
+"""
+
+# KEYS[1] = unused, KEYS[2] = auth:devices:{user_id}
+# ARGV = prefix, now
+_ACTIVE_DEVICE_IDS_LUA = _INDEX_PRELUDE + """
+return redis.call('ZRANGE', KEYS[2], 0, -1)
+"""
+
+# Moves one user's sessions from legacy to tagged key names. Touches keys in
+# different slots, so it only runs against a standalone Redis (legacy fallback
+# is refused for cluster clients).
+# KEYS = legacy devices, tagged devices, legacy sessions, tagged sessions
+# ARGV = legacy refresh token prefix, tagged refresh token prefix, now
+# Returns the number of sessions moved.
+_MIGRATE_USER_LUA = """
+local moved = 0
+local index_type = redis.call('TYPE', KEYS[1]).ok
+if index_type ~= 'none' then
+    local members
+    if index_type == 'set' then
+        members = redis.call('SMEMBERS', KEYS[1])
+    else
+        members = redis.call('ZRANGE', KEYS[1], 0, -1)
+    end
+    local max_pttl = 0
+    for _, device_id in ipairs(members) do
+        local old = ARGV[1] .. device_id
+        local pttl = redis.call('PTTL', old)
+        if pttl > 0 then
+            local new = ARGV[2] .. device_id
+            if redis.call('EXISTS', new) == 0 then
+                redis.call('SET', new, redis.call('GET', old), 'PX', pttl)
+                redis.call('ZADD', KEYS[2], tonumber(ARGV[3]) + pttl / 1000, device_id)
+                max_pttl = math.max(max_pttl, pttl)
+                moved = moved + 1
+            end
+            redis.call('DEL', old)
+        end
+    end
+    redis.call('DEL', KEYS[1])
+    if max_pttl > 0 and redis.call('PTTL', KEYS[2]) < max_pttl then
+        redis.call('PEXPIRE', KEYS[2], max_pttl)
+    end
+end
+if redis.call('EXISTS', KEYS[3]) == 1 then
+    local pttl = redis.call('PTTL', KEYS[3])
+    local fields = redis.call('HGETALL', KEYS[3])
+    for i = 1, #fields, 2 do
+        moved = moved + redis.call('HSETNX', KEYS[4], fields[i], fields[i + 1])
+    end
+    redis.call('DEL', KEYS[3])
+    if pttl > 0 and redis.call('PTTL', KEYS[4]) < pttl then
+        redis.call('PEXPIRE', KEYS[4], pttl)
+    end
+end
+return moved
+"""
+
+
+class RedisTokenStore:
+    """Sessions as one ``auth:rt:{user_id}:{device_id}`` key per device.
+
+    With ``legacy_fallback`` (tagged keys only), a user's legacy keys are moved
+    to the tagged names before each session operation, so live sessions keep
+    working while a standalone Redis is migrated ahead of a move to Cluster.
+    """
+
+    def __init__(
+        self,
+        redis: RedisClient,
+        keys: RedisKeys = LEGACY_KEYS,
+        legacy_fallback: bool = False,
+    ) -> None:
+        if isinstance(redis, RedisCluster) and (not keys.tagged or legacy_fallback):
+            # the scripts rely on all of a user's keys sharing one slot
+            raise ValueError(
+                "Redis Cluster needs the tagged key scheme without legacy key fallback"
+            )
+        self.redis = redis
+        self.keys = keys
+        self.legacy_fallback = legacy_fallback and keys.tagged
+        # Registered once: each call runs EVALSHA, falling back to EVAL on NOSCRIPT.
+        self._migrate_script = redis.register_script(_MIGRATE_USER_LUA)
+        self._store_script = redis.register_script(_STORE_REFRESH_TOKEN_LUA)
+        self._rotate_script = redis.register_script(_ROTATE_REFRESH_TOKEN_LUA)
+        self._delete_script = redis.register_script(_DELETE_REFRESH_TOKEN_LUA)
+        self._delete_all_script = redis.register_script(_DELETE_ALL_REFRESH_TOKENS_LUA)
+        self._active_device_ids_script = redis.register_script(_ACTIVE_DEVICE_IDS_LUA)
+
+    async def migrate_legacy_keys(self, user_id: str) -> int:
+        """Move the user's sessions from legacy to tagged key names; returns the count moved."""
+        return int(await self._migrate_script(
+            keys=[
+                LEGACY_KEYS.devices(user_id),
+                TAGGED_KEYS.devices(user_id),
+                LEGACY_KEYS.sessions(user_id),
+                TAGGED_KEYS.sessions(user_id),
+            ],
+            args=[
+                LEGACY_KEYS.refresh_token_prefix(user_id),
+                TAGGED_KEYS.refresh_token_prefix(user_id),
+                time.time(),
+            ],
+        ))
+
+    async def _migrate_if_needed(self, user_id: str) -> None:
+        if self.legacy_fallback:
+            await self.migrate_legacy_keys(user_id)
+
+    @staticmethod
+    def _refresh_token_record(
+        user_id: str,
+        device_id: str,
+        token_id: str,
+        device_name: str | None,
+        os_type: str | None,
+        app_version: str | None,
+        ip_address: str | None,
+        issued_at: datetime,
+        expires_at: datetime,
+    ) -> str:
+        return json.dumps({
+            "token_id": token_id,
+            "user_id": user_id,
+            "device_id": device_id,
+            "device_name": device_name,
+            "os_type": os_type,
+            "app_version": app_version,
+            "ip_address": ip_address,
+            "issued_at": int(issued_at.timestamp()),
+            "expires_at": int(expires_at.timestamp()),
+        })
+
+    # --- Refresh Token Storage ---
+
+    @staticmethod
+    def _grace_args(new_token_id: str, grace_response: dict[str, str] | None) -> tuple[str, int]:
+        """Grace record and its TTL in ms for the rotation scripts; TTL 0 stores nothing."""
+        grace_ms = settings.refresh_grace_seconds * 1000 if grace_response is not None else 0
+        if grace_ms <= 0:
+            return "", 0
+        return json.dumps({"token_id": new_token_id, "response": grace_response}), grace_ms
+
+    async def _run_index_script(
+        self,
+        script: AsyncScript,
+        user_id: str,
+        device_id: str | None,
+        *args: object,
+        extra_keys: tuple[str, ...] = (),
+    ) -> object:
+        await self._migrate_if_needed(user_id)
+        prefix = self.keys.refresh_token_prefix(user_id)
+        return await script(
+            keys=[prefix + (device_id or ""), self.keys.devices(user_id), *extra_keys],
+            args=[prefix, time.time(), *args],
+        )
+
+    async def store_refresh_token(
+        self,
+        user_id: str,
+        device_id: str,
+        token_id: str,
+        device_name: str | None,
+        os_type: str | None,
+        app_version: str | None,
+        ip_address: str | None,
+        expires_at: datetime,
+    ) -> list[str]:
+        """Store the device's session and return device ids evicted by the session cap."""
+        now = datetime.now(timezone.utc)
+        ttl = int((expires_at - now).total_seconds())
+        if ttl <= 0:
+            return []
+
+        data = self._refresh_token_record(
+            user_id, device_id, token_id, device_name, os_type, app_version, ip_address,
+            now, expires_at,
+        )
+        evicted = await self._run_index_script(
+            self._store_script, user_id, device_id,
+            device_id, data, ttl, expires_at.timestamp(), settings.max_sessions_per_user,
+        )
+
+        await logger.ainfo(
+            "Refresh token stored",
+            user_id=user_id,
+            device_id=device_id,
+        )
+        return list(evicted) if evicted else []
+
+    async def rotate_refresh_token(
+        self,
+        user_id: str,
+        device_id: str,
+        old_token_id: str,
+        new_token_id: str,
+        device_name: str | None,
+        os_type: str | None,
+        app_version: str | None,
+        ip_address: str | None,
+        expires_at: datetime,
+        grace_response: dict[str, str] | None = None,
+    ) -> RotationResult:
+        """Swap the device's refresh token if ``old_token_id`` is still current.
+
+        Compare, swap, device-index update, grace record and reuse handling run
+        as one Lua script (EVALSHA), so concurrent refreshes with the same token
+        cannot both succeed and the whole rotation is a single round trip.
+        """
+        now = datetime.now(timezone.utc)
+        ttl = int((expires_at - now).total_seconds())
+        data = self._refresh_token_record(
+            user_id, device_id, new_token_id, device_name, os_type, app_version, ip_address,
+            now, expires_at,
+        )
+        status = await self._run_index_script(
+            self._rotate_script, user_id, device_id,
+            device_id, old_token_id, data, max(ttl, 1), expires_at.timestamp(),
+            *self._grace_args(new_token_id, grace_response),
+            extra_keys=(self.keys.rotation_grace(user_id, old_token_id),),
+        )
+        return RotationResult(int(status))
+
+    def _queue_current_session(
+        self, pipe: aioredis.client.Pipeline | ClusterPipeline, user_id: str, device_id: str
+    ) -> None:
+        pipe.get(self.keys.refresh_token(user_id, device_id))
+
+    @staticmethod
+    def _current_token_id(data: str | None) -> str | None:
+        return json.loads(data)["token_id"] if data is not None else None
+
+    async def get_rotation_grace(
+        self, user_id: str, device_id: str, old_token_id: str
+    ) -> dict[str, str] | None:
+        """The response cached by rotating ``old_token_id``, while its new token is current.
+
+        Once the session has moved on (rotated again, logged out), a repeat of
+        the old token is reuse again rather than a retry.
+        """
+        await self._migrate_if_needed(user_id)
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.get(self.keys.rotation_grace(user_id, old_token_id))
+        self._queue_current_session(pipe, user_id, device_id)
+        grace, current = await pipe.execute()
+        return self._valid_grace(grace, current)
+
+    async def get_refresh_state(
+        self, user_id: str, device_id: str, old_token_id: str
+    ) -> tuple[UserClaims | None, dict[str, str] | None]:
+        await self._migrate_if_needed(user_id)
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.get(self.keys.claims(user_id))
+        pipe.get(self.keys.rotation_grace(user_id, old_token_id))
+        self._queue_current_session(pipe, user_id, device_id)
+        claims, grace, current = await pipe.execute()
+        return (
+            json.loads(claims) if claims is not None else None,
+            self._valid_grace(grace, current),
+        )
+
+    def _valid_grace(self, grace: str | None, current: str | None) -> dict[str, str] | None:
+        if grace is None:
+            return None
+        record = json.loads(grace)
+        if record["token_id"] != self._current_token_id(current):
+            return None
+        response: dict[str, str] = record["response"]
+        return response
+
+    async def get_refresh_token(
+        self, user_id: str, device_id: str
+    ) -> dict | None:
+        await self._migrate_if_needed(user_id)
+        data = await self.redis.get(self.keys.refresh_token(user_id, device_id))
+        if data is None:
+            return None
+        return json.loads(data)
+
+    async def delete_refresh_token(self, user_id: str, device_id: str) -> None:
+        await self._run_index_script(self._delete_script, user_id, device_id, device_id)
+
+    async def delete_all_refresh_tokens(self, user_id: str) -> int:
+        return int(await self._run_index_script(self._delete_all_script, user_id, None))
+
+    async def get_active_device_ids(self, user_id: str) -> set[str]:
+        return set(await self._run_index_script(
+            self._active_device_ids_script, user_id, None
+        ))
+
+    # --- Token Claims ---
+
+    async def get_user_claims(self, user_id: str) -> UserClaims | None:
+        data = await self.redis.get(self.keys.claims(user_id))
+        return json.loads(data) if data is not None else None
+
+    async def set_user_claims(self, user_id: str, claims: UserClaims) -> None:
+        await self.redis.set(
+            self.keys.claims(user_id),
+            json.dumps(claims, separators=(",", ":")),
+            ex=settings.jwt_refresh_token_expire_seconds,
+        )
+
+    async def delete_user_claims(self, user_id: str) -> None:
+        await self.redis.delete(self.keys.claims(user_id))
+
+    # --- Revocation Epochs ---
+
+    async def revoke_tokens_issued_before(
+        self,
+        user_id: str,
+        device_id: str | None = None,
+        at: datetime | None = None,
+    ) -> float:
+        """Invalidate every access token of the user (or one device) issued before ``at``.
+
+        One key write regardless of how many tokens are outstanding. The key
+        only has to outlive the access tokens it invalidates.
+        """
+        scope = user_id if device_id is None else f"{user_id}:{device_id}"
+        epoch = round((at or datetime.now(timezone.utc)).timestamp(), 3)
+        ttl = settings.jwt_access_token_expire_seconds
+        event = {"type": "epoch", "scope": scope, "epoch": epoch, "exp": time.time() + ttl}
+
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.set(self.keys.epoch(user_id, device_id), epoch, ex=ttl)
+        pipe.publish(BLACKLIST_CHANNEL, json.dumps(event))
+        await pipe.execute()
+
+        cache = get_blacklist_cache()
+        if cache is not None:
+            cache.set_epoch(scope, epoch, event["exp"])
+        return epoch
+
+    def serves_revocation_locally(self) -> bool:
+        """True when revocation checks are answered by the per-worker cache.
+
+        That is while its subscription is live, or always if configured to
+        trust the cache rather than fall back to Redis.
+        """
+        cache = get_blacklist_cache()
+        return cache is not None and (cache.is_live or not settings.blacklist_cache_fallback)
+
+    async def is_access_token_revoked(
+        self,
+        jti: str,
+        user_id: str,
+        device_id: str,
+        issued_at: datetime,
+    ) -> bool:
+        iat = issued_at.timestamp()
+        cache = get_blacklist_cache()
+        if self.serves_revocation_locally():
+            return (
+                iat < cache.get_epoch(user_id)
+                or iat < cache.get_epoch(f"{user_id}:{device_id}")
+                or cache.contains(jti)
+            )
+
+        _blacklist_redis_checks.inc()
+        epoch_keys = [self.keys.epoch(user_id), self.keys.epoch(user_id, device_id)]
+        if self.legacy_fallback:
+            # epochs written before the switch live out their TTL under legacy names
+            epoch_keys += [LEGACY_KEYS.epoch(user_id), LEGACY_KEYS.epoch(user_id, device_id)]
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.mget(*epoch_keys)
+        pipe.exists(f"{BLACKLIST_KEY_PREFIX}{jti}")
+        epochs, blacklisted = await pipe.execute()
+        return any(e is not None and iat < float(e) for e in epochs) or blacklisted > 0
+
+    # --- Blacklist ---
+
+    async def blacklist_token(
+        self,
+        jti: str,
+        user_id: str,
+        device_id: str,
+        reason: str,
+        ttl_seconds: int,
+    ) -> None:
+        if ttl_seconds <= 0:
+            return
+
+        key = f"{BLACKLIST_KEY_PREFIX}{jti}"
+        now = datetime.now(timezone.utc).timestamp()
+        data = {
+            "user_id": user_id,
+            "device_id": device_id,
+            "reason": reason,
+            "revoked_at": int(now),
+        }
+        event = {"jti": jti, "exp": now + ttl_seconds}
+
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.setex(key, ttl_seconds, json.dumps(data))
+        pipe.publish(BLACKLIST_CHANNEL, json.dumps(event))
+        await pipe.execute()
+
+        cache = get_blacklist_cache()
+        if cache is not None:
+            cache.add(jti, event["exp"])
+
+    async def is_token_blacklisted(self, jti: str) -> bool:
+        # Served from the per-worker cache while its subscription is live;
+        # otherwise fall back to Redis unless configured to trust the cache.
+        if self.serves_revocation_locally():
+            return get_blacklist_cache().contains(jti)
+        _blacklist_redis_checks.inc()
+        return await self.redis.exists(f"{BLACKLIST_KEY_PREFIX}{jti}") > 0
+
+
+# KEYS[1] = auth:sessions:{user_id}, KEYS[2] = auth:rt:{user_id}:{device_id},
+# KEYS[3] = auth:devices:{user_id}, KEYS[4] = auth:rt_grace:{user_id}:{expected token_id}
+# ARGV = expected token_id, new record, ttl, device_id, now, dual_read ("1"/"0"),
+#        grace record, grace ttl in ms (0 = none)
+_ROTATE_SESSION_LUA = """
+local function drop_legacy()
+    redis.call('DEL', KEYS[2])
+    if redis.call('TYPE', KEYS[3]).ok == 'zset' then
+        redis.call('ZREM', KEYS[3], ARGV[4])
+    else
+        redis.call('SREM', KEYS[3], ARGV[4])
+    end
+end
+local current = redis.call('HGET', KEYS[1], ARGV[4])
+local token_id
+local legacy = false
+if current then
+    local record = cjson.decode(current)
+    if tonumber(record[3]) <= tonumber(ARGV[5]) then
+        redis.call('HDEL', KEYS[1], ARGV[4])
+        return 1
+    end
+    token_id = record[1]
+elseif ARGV[6] == '1' then
+    local data = redis.call('GET', KEYS[2])
+    if not data then
+        return 1
+    end
+    token_id = cjson.decode(data)['token_id']
+    legacy = true
+else
+    return 1
+end
+if token_id ~= ARGV[1] then
+    -- a duplicate of the rotation that produced the current token keeps it,
+    -- wherever it is stored; reuse revokes it
+    local grace = redis.call('GET', KEYS[4])
+    if grace and cjson.decode(grace)['token_id'] == token_id then
+        return 3
+    end
+    redis.call('HDEL', KEYS[1], ARGV[4])
+    if legacy then
+        drop_legacy()
+    end
+    return 2
+end
+-- the legacy copy is dropped only once the session has moved into the hash
+if legacy then
+    drop_legacy()
+end
+redis.call('HSET', KEYS[1], ARGV[4], ARGV[2])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+if tonumber(ARGV[8]) > 0 then
+    redis.call('SET', KEYS[4], ARGV[7], 'PX', ARGV[8])
+end
+return 0
+"""
+
+# KEYS[1] = auth:sessions:{user_id}
+# ARGV = device_id, new record, ttl, now, max_sessions
+# Drops expired fields and returns the device ids evicted by the session cap.
+_STORE_SESSION_LUA = """
+local now = tonumber(ARGV[4])
+local others = {}
+local fields = redis.call('HGETALL', KEYS[1])
+for i = 1, #fields, 2 do
+    if fields[i] ~= ARGV[1] then
+        local expires_at = tonumber(cjson.decode(fields[i + 1])[3])
+        if expires_at <= now then
+            redis.call('HDEL', KEYS[1], fields[i])
+        else
+            table.insert(others, {expires_at, fields[i]})
+        end
+    end
+end
+local evicted = {}
+local max_sessions = tonumber(ARGV[5])
+if max_sessions > 0 and #others >= max_sessions then
+    table.sort(others, function(a, b) return a[1] < b[1] end)
+    for i = 1, #others - max_sessions + 1 do
+        redis.call('HDEL', KEYS[1], others[i][2])
+        table.insert(evicted, others[i][2])
+    end
+end
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return evicted
+"""
+
+
+def encode_session(
+    token_id: str,
+    issued_at: int,
+    expires_at: int,
+    device_name: str | None,
+    os_type: str | None,
+    app_version: str | None,
+    ip_address: str | None,
+) -> str:
+    """Positional record; user and device ids are implied by the key and field."""
+    return json.dumps(
+        [token_id, issued_at, expires_at, device_name, os_type, app_version, ip_address],
+        separators=(",", ":"),
+    )
+
+
+def decode_session(user_id: str, device_id: str, data: str) -> dict:
+    token_id, issued_at, expires_at, device_name, os_type, app_version, ip_address = (
+        json.loads(data)
+    )
+    return {
+        "token_id": token_id,
+        "user_id": user_id,
+        "device_id": device_id,
+        "device_name": device_name,
+        "os_type": os_type,
+        "app_version": app_version,
+        "ip_address": ip_address,
+        "issued_at": issued_at,
+        "expires_at": expires_at,
+    }
+
+
+class RedisHashTokenStore(RedisTokenStore):
+    """Refresh token sessions kept in one hash per user (``auth:sessions:{user_id}``).
+
+    Each device is a field holding a compact positional record. Redis cannot
+    expire single fields portably, so the record carries its own expiry:
+    expired fields read as missing and are dropped lazily, and the hash itself
+    expires with its newest session. Writes also sweep expired fields and
+    enforce ``max_sessions_per_user``. Logout-all is a single DEL.
+
+    With ``dual_read`` the legacy per-device keys are still consulted, and a
+    session found there is moved into the hash on its next rotation.
+    """
+
+    def __init__(
+        self,
+        redis: RedisClient,
+        dual_read: bool = False,
+        keys: RedisKeys = LEGACY_KEYS,
+        legacy_fallback: bool = False,
+    ) -> None:
+        super().__init__(redis, keys, legacy_fallback)
+        self.dual_read = dual_read
+        self._store_session_script = redis.register_script(_STORE_SESSION_LUA)
+        self._rotate_session_script = redis.register_script(_ROTATE_SESSION_LUA)
+
+    async def store_refresh_token(
+        self,
+        user_id: str,
+        device_id: str,
+        token_id: str,
+        device_name: str | None,
+        os_type: str | None,
+        app_version: str | None,
+        ip_address: str | None,
+        expires_at: datetime,
+    ) -> list[str]:
+        now = datetime.now(timezone.utc)
+        ttl = int((expires_at - now).total_seconds())
+        if ttl <= 0:
+            return []
+
+        data = encode_session(
+            token_id, int(now.timestamp()), int(expires_at.timestamp()),
+            device_name, os_type, app_version, ip_address,
+        )
+        await self._migrate_if_needed(user_id)
+        # EXPIRE with the new ttl: the newest session is always the last to expire.
+        evicted = await self._store_session_script(
+            keys=[self.keys.sessions(user_id)],
+            args=[device_id, data, ttl, int(now.timestamp()), settings.max_sessions_per_user],
+        )
+        if self.dual_read:
+            await super().delete_refresh_token(user_id, device_id)
+
+        await logger.ainfo(
+            "Refresh token stored",
+            user_id=user_id,
+            device_id=device_id,
+        )
+        return list(evicted) if evicted else []
+
+    async def rotate_refresh_token(
+        self,
+        user_id: str,
+        device_id: str,
+        old_token_id: str,
+        new_token_id: str,
+        device_name: str | None,
+        os_type: str | None,
+        app_version: str | None,
+        ip_address: str | None,
+        expires_at: datetime,
+        grace_response: dict[str, str] | None = None,
+    ) -> RotationResult:
+        now = datetime.now(timezone.utc)
+        ttl = int((expires_at - now).total_seconds())
+        data = encode_session(
+            new_token_id, int(now.timestamp()), int(expires_at.timestamp()),
+            device_name, os_type, app_version, ip_address,
+        )
+        await self._migrate_if_needed(user_id)
+        status = await self._rotate_session_script(
+            keys=[
+                self.keys.sessions(user_id),
+                self.keys.refresh_token(user_id, device_id),
+                self.keys.devices(user_id),
+                self.keys.rotation_grace(user_id, old_token_id),
+            ],
+            args=[
+                old_token_id, data, max(ttl, 1), device_id,
+                int(now.timestamp()), "1" if self.dual_read else "0",
+                *self._grace_args(new_token_id, grace_response),
+            ],
+        )
+        return RotationResult(int(status))
+
+    def _queue_current_session(
+        self, pipe: aioredis.client.Pipeline | ClusterPipeline, user_id: str, device_id: str
+    ) -> None:
+        pipe.hget(self.keys.sessions(user_id), device_id)
+
+    @staticmethod
+    def _current_token_id(data: str | None) -> str | None:
+        return json.loads(data)[0] if data is not None else None
+
+    async def get_refresh_token(self, user_id: str, device_id: str) -> dict | None:
+        await self._migrate_if_needed(user_id)
+        data = await self.redis.hget(self.keys.sessions(user_id), device_id)
+        if data is None:
+            return await super().get_refresh_token(user_id, device_id) if self.dual_read else None
+        record = decode_session(user_id, device_id, data)
+        if record["expires_at"] <= time.time():
+            await self.redis.hdel(self.keys.sessions(user_id), device_id)
+            return None
+        return record
+
+    async def delete_refresh_token(self, user_id: str, device_id: str) -> None:
+        await self._migrate_if_needed(user_id)
+        await self.redis.hdel(self.keys.sessions(user_id), device_id)
+        if self.dual_read:
+            await super().delete_refresh_token(user_id, device_id)
+
+    async def delete_all_refresh_tokens(self, user_id: str) -> int:
+        await self._migrate_if_needed(user_id)
+        key = self.keys.sessions(user_id)
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.hlen(key)
+        pipe.delete(key)
+        count, _ = await pipe.execute()
+        if self.dual_read:
+            count += await super().delete_all_refresh_tokens(user_id)
+        return count
+
+    async def get_active_device_ids(self, user_id: str) -> set[str]:
+        await self._migrate_if_needed(user_id)
+        sessions = await self.redis.hgetall(self.keys.sessions(user_id))
+        now = time.time()
+        device_ids = {
+            device_id
+            for device_id, data in sessions.items()
+            if json.loads(data)[2] > now
+        }
+        if self.dual_read:
+            device_ids |= await super().get_active_device_ids(user_id)
+        return device_ids
+
+
+_store: RedisTokenStore | None = None
+
+
+def create_redis_token_store(redis: RedisClient) -> RedisTokenStore:
+    """The configured store for ``redis``, built once so its scripts are registered once."""
+    global _store
+    if _store is not None and _store.redis is redis:
+        return _store
+    keys = get_redis_keys()
+    fallback = settings.redis_legacy_key_fallback
+    if settings.token_store_layout == "hash":
+        _store = RedisHashTokenStore(
+            redis, dual_read=settings.token_store_dual_read, keys=keys, legacy_fallback=fallback
+        )
+    else:
+        _store = RedisTokenStore(redis, keys=keys, legacy_fallback=fallback)
+    return _store
@@ -0,0 +1,68 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Protocol
+
+from app.core.metrics import metrics
+
+_hits = metrics.counter("jwt_verify_cache_hits_total", "Access tokens served from the cache")
+_misses = metrics.counter("jwt_verify_cache_misses_total", "Access tokens fully verified")
+_size = metrics.gauge("jwt_verify_cache_size", "Entries in the verified token cache")
+
+
+class _Expiring(Protocol):
+    # read-only, so frozen payloads satisfy it
+    @property
+    def exp(self) -> datetime: ...
+
+
+class VerifiedTokenCache[P: _Expiring]:
+    """Bounded LRU of already-verified token payloads, keyed by token digest.
+
+    An entry is never returned past its token's ``exp``; callers fall back to a
+    full decode, which then raises the usual expiry error. Safe to use from the
+    JWT thread pool as well as the event loop.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._entries: OrderedDict[bytes, P] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> P | None:
+        key = self._key(token)
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is None:
+                _misses.inc()
+                return None
+            if payload.exp <= datetime.now(timezone.utc):
+                del self._entries[key]
+                _size.set(len(self._entries))
+                _misses.inc()
+                return None
+            self._entries.move_to_end(key)
+            _hits.inc()
+            return payload
+
+    def put(self, token: str, payload: P) -> None:
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = payload
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+            _size.set(len(self._entries))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            _size.set(0)
+
+    def __len__(self) -> int:
+        return len(self._entries)
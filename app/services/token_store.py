@@ -1,15 +1,30 @@
-import json
-from datetime import datetime, timezone
+from datetime import datetime
+from enum import IntEnum
+from typing import Protocol, TypedDict
 
-import redis.asyncio as aioredis
-import structlog
 
-logger = structlog.get_logger("app.services.token_store")
+class RotationResult(IntEnum):
+    OK = 0
+    NOT_FOUND = 1
+    REUSED = 2  # presented token was already rotated; the session has been revoked
+    GRACE = 3  # presented token was rotated moments ago; see get_rotation_grace
 
 
-class TokenStore:
-    def __init__(self, redis: aioredis.Redis) -> None:
-        self.redis = redis
+class UserClaims(TypedDict):
+    """User fields needed to issue tokens, cached so refresh needs no SQL."""
+
+    email: str
+    name: str
+    status: str
+
+
+class TokenStore(Protocol):
+    """Refresh token sessions and access token revocation state.
+
+    Implemented by ``RedisTokenStore`` / ``RedisHashTokenStore`` (shared across
+    workers) and ``MemoryTokenStore`` (single process). Selected with
+    ``TOKEN_STORE_BACKEND``; see ``app.dependencies.token_store``.
+    """
 
     # --- Refresh Token Storage ---
 
@@ -23,65 +38,83 @@ class TokenStore:
         app_version: str | None,
         ip_address: str | None,
         expires_at: datetime,
-    ) -> None:
-        key = f"auth:rt:{user_id}:{device_id}"
-        now = datetime.now(timezone.utc)
-        ttl = int((expires_at - now).total_seconds())
-        if ttl <= 0:
-            return
-
-        data = {
-            "token_id": token_id,
-            "user_id": user_id,
-            "device_id": device_id,
-            "device_name": device_name,
-            "os_type": os_type,
-            "app_version": app_version,
-            "ip_address": ip_address,
-            "issued_at": int(now.timestamp()),
-            "expires_at": int(expires_at.timestamp()),
-        }
-
-        await self.redis.setex(key, ttl, json.dumps(data))
-        await self.redis.sadd(f"auth:devices:{user_id}", device_id)
-
-        await logger.ainfo(
-            "Refresh token stored",
-            user_id=user_id,
-            device_id=device_id,
-        )
-
-    async def get_refresh_token(
-        self, user_id: str, device_id: str
-    ) -> dict | None:
-        key = f"auth:rt:{user_id}:{device_id}"
-        data = await self.redis.get(key)
-        if data is None:
-            return None
-        return json.loads(data)
-
-    async def delete_refresh_token(self, user_id: str, device_id: str) -> None:
-        key = f"auth:rt:{user_id}:{device_id}"
-        await self.redis.delete(key)
-        await self.redis.srem(f"auth:devices:{user_id}", device_id)
-
-    async def delete_all_refresh_tokens(self, user_id: str) -> int:
-        device_ids = await self.redis.smembers(f"auth:devices:{user_id}")
-        count = len(device_ids)
-        if count > 0:
-            pipe = self.redis.pipeline()
-            for device_id in device_ids:
-                pipe.delete(f"auth:rt:{user_id}:{device_id}")
-            pipe.delete(f"auth:devices:{user_id}")
-            await pipe.execute()
-        else:
-            await self.redis.delete(f"auth:devices:{user_id}")
-        return count
-
-    async def get_active_device_ids(self, user_id: str) -> set[str]:
-        return await self.redis.smembers(f"auth:devices:{user_id}")
-
-    # --- Blacklist ---
+    ) -> list[str]:
+        """Store the device's session and return device ids evicted by the session cap."""
+        ...
+
+    async def rotate_refresh_token(
+        self,
+        user_id: str,
+        device_id: str,
+        old_token_id: str,
+        new_token_id: str,
+        device_name: str | None,
+        os_type: str | None,
+        app_version: str | None,
+        ip_address: str | None,
+        expires_at: datetime,
+        grace_response: dict[str, str] | None = None,
+    ) -> RotationResult:
+        """Atomically swap the device's refresh token if ``old_token_id`` is current.
+
+        ``grace_response`` is kept under ``old_token_id`` for
+        ``refresh_grace_seconds``; presenting the old token again in that window
+        yields ``GRACE`` instead of ``REUSED`` while the new token is current.
+        """
+        ...
+
+    async def get_rotation_grace(
+        self, user_id: str, device_id: str, old_token_id: str
+    ) -> dict[str, str] | None:
+        """The response cached by the rotation of ``old_token_id``, if still valid."""
+        ...
+
+    async def get_refresh_state(
+        self, user_id: str, device_id: str, old_token_id: str
+    ) -> tuple[UserClaims | None, dict[str, str] | None]:
+        """The user's cached claims and ``get_rotation_grace``, read together.
+
+        Lets refresh answer a retried token before signing a new pair, in the
+        same round trip as the claims lookup it needs anyway.
+        """
+        ...
+
+    async def get_refresh_token(self, user_id: str, device_id: str) -> dict | None: ...
+
+    async def delete_refresh_token(self, user_id: str, device_id: str) -> None: ...
+
+    async def delete_all_refresh_tokens(self, user_id: str) -> int: ...
+
+    async def get_active_device_ids(self, user_id: str) -> set[str]: ...
+
+    # --- Token Claims ---
+
+    async def get_user_claims(self, user_id: str) -> UserClaims | None: ...
+
+    async def set_user_claims(self, user_id: str, claims: UserClaims) -> None:
+        """Cache the user's claims for the refresh token lifetime."""
+        ...
+
+    async def delete_user_claims(self, user_id: str) -> None: ...
+
+    # --- Revocation ---
+
+    async def revoke_tokens_issued_before(
+        self,
+        user_id: str,
+        device_id: str | None = None,
+        at: datetime | None = None,
+    ) -> float:
+        """Invalidate every access token of the user (or one device) issued before ``at``."""
+        ...
+
+    async def is_access_token_revoked(
+        self,
+        jti: str,
+        user_id: str,
+        device_id: str,
+        issued_at: datetime,
+    ) -> bool: ...
 
     async def blacklist_token(
         self,
@@ -90,18 +123,6 @@ class TokenStore:
         device_id: str,
         reason: str,
         ttl_seconds: int,
-    ) -> None:
-        if ttl_seconds <= 0:
-            return
-
-        key = f"auth:blacklist:{jti}"
-        data = {
-            "user_id": user_id,
-            "device_id": device_id,
-            "reason": reason,
-            "revoked_at": int(datetime.now(timezone.utc).timestamp()),
-        }
-        await self.redis.setex(key, ttl_seconds, json.dumps(data))
-
-    async def is_token_blacklisted(self, jti: str) -> bool:
-        return await self.redis.exists(f"auth:blacklist:{jti}") > 0
+    ) -> None: ...
+
+    async def is_token_blacklisted(self, jti: str) -> bool: ...
@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 
-from app.core.security import hash_password, verify_password
+from app.core.security import hash_password_async, verify_password_async
 from app.exceptions.user import (
     CurrentPasswordMismatchError,
     SamePasswordError,
@@ -9,7 +9,8 @@ from app.exceptions.user import (
 from app.repositories.user import UserRepository
 from app.repositories.user_device import UserDeviceRepository
 from app.schemas.user import UserResponse, UserUpdateResponse
-from app.services.token_store import TokenStore
+from app.services.read_routing import RecentWriteMarker, mark_recent_write
+from app.services.token_store import TokenStore, UserClaims
 
 
 class UserService:
@@ -18,13 +19,15 @@ class UserService:
         user_repo: UserRepository,
         device_repo: UserDeviceRepository,
         token_store: TokenStore,
+        recent_writes: RecentWriteMarker,
     ) -> None:
         self.user_repo = user_repo
         self.device_repo = device_repo
         self.token_store = token_store
+        self.recent_writes = recent_writes
 
     async def get_me(self, user_id: str) -> UserResponse:
-        user = await self.user_repo.get_by_id(user_id)
+        user = await self.user_repo.get_profile(user_id)
         if user is None:
             raise UserNotFoundError()
 
@@ -56,6 +59,10 @@ class UserService:
         user.updated_at = datetime.now(timezone.utc)
 
         await self.user_repo.update(user)
+        await self.token_store.set_user_claims(
+            user.id, UserClaims(email=user.email, name=user.name, status=user.status)
+        )
+        await mark_recent_write(self.recent_writes, user.id)
 
         return UserUpdateResponse(
             user_id=user.id,
@@ -70,35 +77,38 @@ class UserService:
         current_password: str,
         new_password: str,
     ) -> None:
-        user = await self.user_repo.get_by_id(user_id)
+        user = await self.user_repo.get_credentials_by_id(user_id)
         if user is None:
             raise UserNotFoundError()
 
-        if not verify_password(current_password, user.hashed_password):
+        if not await verify_password_async(current_password, user.hashed_password):
             raise CurrentPasswordMismatchError()
 
-        if verify_password(new_password, user.hashed_password):
+        if await verify_password_async(new_password, user.hashed_password):
             raise SamePasswordError()
 
-        user.hashed_password = hash_password(new_password)
-        user.updated_at = datetime.now(timezone.utc)
-        await self.user_repo.update(user)
+        await self.user_repo.update_password(user_id, await hash_password_async(new_password))
 
+        await self.token_store.revoke_tokens_issued_before(user_id)
         await self.token_store.delete_all_refresh_tokens(user_id)
         await self.device_repo.deactivate_all_devices(user_id)
+        await mark_recent_write(self.recent_writes, user_id)
 
     async def delete_account(
         self,
         user_id: str,
         password: str,
     ) -> None:
-        user = await self.user_repo.get_by_id(user_id)
+        user = await self.user_repo.get_credentials_by_id(user_id)
         if user is None:
             raise UserNotFoundError()
 
-        if not verify_password(password, user.hashed_password):
+        if not await verify_password_async(password, user.hashed_password):
             raise CurrentPasswordMismatchError()
 
-        await self.user_repo.soft_delete(user)
+        await self.user_repo.soft_delete(user_id)
+        await self.token_store.revoke_tokens_issued_before(user_id)
         await self.token_store.delete_all_refresh_tokens(user_id)
+        await self.token_store.delete_user_claims(user_id)
         await self.device_repo.deactivate_all_devices(user_id)
+        await mark_recent_write(self.recent_writes, user_id)
@@ -0,0 +1,128 @@
+"""Compare device deactivation strategies at 1, 10 and 100 devices per user.
+
+"orm" is the previous implementation: load every active UserDevice, flip
+``is_active`` and flush one UPDATE per row. "bulk" is the set-based
+``UserDeviceRepository.deactivate_all_devices`` (one UPDATE per user), and
+"batch" is ``deactivate_devices_for_users`` over all sampled users at once.
+
+Tables in the target database are DROPPED and recreated, so point it at a
+scratch database:
+
+    python scripts/bench_device_deactivation.py --database-url sqlite+aiosqlite:///./bench.db
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from sqlalchemy import insert, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.models import Base, User, UserDevice  # noqa: E402
+from app.repositories.user_device import UserDeviceRepository  # noqa: E402
+
+STRATEGIES = ("orm", "bulk", "batch")
+
+
+async def load(session: AsyncSession, users: list[str], devices: int) -> None:
+    now = datetime.now(timezone.utc)
+    await session.execute(update(UserDevice).values(is_active=True))
+    if await session.get(User, users[0]) is not None:
+        return
+    await session.execute(
+        insert(User),
+        [
+            {"id": u, "email": f"{u}@example.com", "hashed_password": "x", "name": "Bench"}
+            for u in users
+        ],
+    )
+    await session.execute(
+        insert(UserDevice),
+        [
+            {
+                "user_id": u,
+                "device_id": f"device-{d}",
+                "os_type": "iOS",
+                "is_active": True,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for u in users
+            for d in range(devices)
+        ],
+    )
+
+
+async def deactivate_orm(repo: UserDeviceRepository, user_id: str) -> int:
+    devices = await repo.get_active_devices(user_id)
+    now = datetime.now(timezone.utc)
+    for device in devices:
+        device.is_active = False
+        device.updated_at = now
+    await repo.session.flush()
+    return len(devices)
+
+
+async def bench(
+    factory: async_sessionmaker, strategy: str, devices: int, users: list[str]
+) -> list[float]:
+    async with factory() as session:
+        await load(session, users, devices)
+        await session.commit()
+
+    samples = []
+    async with factory() as session:
+        repo = UserDeviceRepository(session)
+        if strategy == "batch":
+            start = time.perf_counter()
+            count = await repo.deactivate_devices_for_users(users)
+            samples.append((time.perf_counter() - start) * 1000 / len(users))
+        else:
+            count = 0
+            for user_id in users:
+                start = time.perf_counter()
+                if strategy == "orm":
+                    count += await deactivate_orm(repo, user_id)
+                else:
+                    count += await repo.deactivate_all_devices(user_id)
+                samples.append((time.perf_counter() - start) * 1000)
+        await session.commit()
+    assert count == devices * len(users), count
+    return samples
+
+
+async def main(args: argparse.Namespace) -> None:
+    engine = create_async_engine(args.database_url)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    try:
+        print(f"{args.users} users per run; ms per user")
+        print(f"{'devices':>7} {'strategy':<8} {'mean':>9} {'p50':>9} {'max':>9}")
+        for devices in args.devices:
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.drop_all)
+                await conn.run_sync(Base.metadata.create_all)
+            users = [f"bench-{devices}-{n}" for n in range(args.users)]
+            for strategy in args.strategies:
+                samples = await bench(factory, strategy, devices, users)
+                print(
+                    f"{devices:>7} {strategy:<8} {statistics.mean(samples):>9.3f} "
+                    f"{statistics.median(samples):>9.3f} {max(samples):>9.3f}"
+                )
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default="sqlite+aiosqlite:///./bench_devices.db")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--devices", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--strategies", nargs="+", choices=STRATEGIES, default=list(STRATEGIES))
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,162 @@
+"""Compare JWT sign/verify cost for each supported algorithm.
+
+Uses ephemeral keys and the same claims JWTService puts in an access token.
+"Parsed" uses pre-loaded key objects (what JWTService does); "PEM" passes the
+PEM text on every call, which re-parses the key each time.
+
+    python scripts/bench_jwt.py --iterations 2000
+
+With --refresh, measures refresh-style token issuance (an access and a refresh
+token signed concurrently, as AuthService.refresh does) through JWTService for
+each JWT_EXECUTOR_WORKERS value; 0 signs inline on the event loop.
+
+    python scripts/bench_jwt.py --refresh --executor-workers 0 1 2 4
+"""
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+import uuid
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from generate_keys import generate_keys, new_private_key
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+ALGORITHMS = ("RS256", "ES256", "EdDSA")
+
+
+def claims() -> dict[str, Any]:
+    now = datetime.now(timezone.utc)
+    return {
+        "iss": "sample-auth-api",
+        "sub": str(uuid.uuid4()),
+        "aud": "sample-app",
+        "iat": now,
+        "exp": now + timedelta(minutes=30),
+        "jti": str(uuid.uuid4()),
+        "type": "access",
+        "device_id": "bench-device",
+        "email": "bench@example.com",
+        "name": "Bench User",
+    }
+
+
+def ops_per_sec(fn: Callable[[], Any], iterations: int) -> float:
+    for _ in range(min(50, iterations)):
+        fn()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return iterations / (time.perf_counter() - start)
+
+
+def bench(algorithm: str, iterations: int) -> dict[str, float]:
+    private_key = new_private_key(algorithm)
+    public_key = private_key.public_key()
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    public_pem = public_key.public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+    payload = claims()
+    token = jwt.encode(payload, private_key, algorithm=algorithm)
+
+    def verify(key: Any) -> Callable[[], Any]:
+        return lambda: jwt.decode(
+            token, key, algorithms=[algorithm], audience="sample-app", issuer="sample-auth-api"
+        )
+
+    return {
+        "sign_parsed": ops_per_sec(
+            lambda: jwt.encode(payload, private_key, algorithm=algorithm), iterations
+        ),
+        "sign_pem": ops_per_sec(
+            lambda: jwt.encode(payload, private_pem, algorithm=algorithm), iterations
+        ),
+        "verify_parsed": ops_per_sec(verify(public_key), iterations),
+        "verify_pem": ops_per_sec(verify(public_pem), iterations),
+        "token_bytes": len(token),
+    }
+
+
+async def refresh_throughput(service: Any, requests: int, concurrency: int) -> float:
+    slots = asyncio.Semaphore(concurrency)
+
+    async def one_refresh() -> None:
+        async with slots:
+            await asyncio.gather(
+                service.create_access_token_async(
+                    user_id="bench-user",
+                    email="bench@example.com",
+                    name="Bench User",
+                    device_id="bench-device",
+                ),
+                service.create_refresh_token_async(user_id="bench-user", device_id="bench-device"),
+            )
+
+    await one_refresh()
+    start = time.perf_counter()
+    await asyncio.gather(*(one_refresh() for _ in range(requests)))
+    return requests / (time.perf_counter() - start)
+
+
+def bench_refresh(args: argparse.Namespace) -> None:
+    from app.services.jwt import JWTService
+
+    print(f"{'algorithm':<9} {'workers':>7} {'refresh/s':>10}")
+    for algorithm in args.algorithms:
+        with tempfile.TemporaryDirectory() as key_dir:
+            generate_keys(key_dir, algorithm)
+            for workers in args.executor_workers:
+                service = JWTService(
+                    algorithm=algorithm,
+                    private_key_path=Path(key_dir) / "private.pem",
+                    public_key_path=Path(key_dir) / "public.pem",
+                    executor_workers=workers,
+                )
+                rate = asyncio.run(
+                    refresh_throughput(service, args.requests, args.concurrency)
+                )
+                service.close()
+                print(f"{algorithm:<9} {workers:>7} {rate:>10.0f}")
+
+
+def main(args: argparse.Namespace) -> None:
+    if args.refresh:
+        bench_refresh(args)
+        return
+
+    print(
+        f"{'algorithm':<9} {'sign/s':>10} {'sign(PEM)/s':>12} "
+        f"{'verify/s':>10} {'verify(PEM)/s':>14} {'sign µs':>9} {'verify µs':>10} {'bytes':>6}"
+    )
+    for algorithm in args.algorithms:
+        r = bench(algorithm, args.iterations)
+        print(
+            f"{algorithm:<9} {r['sign_parsed']:>10.0f} {r['sign_pem']:>12.0f} "
+            f"{r['verify_parsed']:>10.0f} {r['verify_pem']:>14.0f} "
+            f"{1e6 / r['sign_parsed']:>9.1f} {1e6 / r['verify_parsed']:>10.1f} "
+            f"{r['token_bytes']:>6.0f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--algorithms", nargs="+", choices=ALGORITHMS, default=list(ALGORITHMS))
+    parser.add_argument("--refresh", action="store_true", help="Measure refresh throughput")
+    parser.add_argument("--executor-workers", nargs="+", type=int, default=[0, 1, 2, 4])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    main(parser.parse_args())
@@ -0,0 +1,139 @@
+"""Measure authenticated-read latency while a burst of logins is in flight.
+
+Runs against a live server. Start it with login rate limiting relaxed, e.g.
+
+    RATE_LIMIT_LOGIN=100000/minute RATE_LIMIT_SIGNUP=100000/minute \\
+        uvicorn app.main:app --workers 1
+
+then
+
+    python scripts/bench_login_burst.py --base-url http://localhost:8000
+
+Readers call GET /api/v1/users/me in a loop; once they are warmed up a burst of
+POST /api/v1/auth/login requests is fired. Latency percentiles are reported for
+the reads issued during the burst, alongside an idle baseline.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+import httpx
+
+DEVICE_HEADERS = {
+    "X-Device-Id": "bench-device",
+    "X-Device-Name": "Bench",
+    "X-App-Version": "1.0.0",
+    "X-OS-Type": "iOS",
+    "X-OS-Version": "17.2",
+}
+PASSWORD = "BenchPass123!"
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(label: str, samples: list[float]) -> None:
+    if not samples:
+        print(f"{label:<14} no samples")
+        return
+    print(
+        f"{label:<14} n={len(samples):<6} "
+        f"p50={percentile(samples, 50):7.1f}ms "
+        f"p95={percentile(samples, 95):7.1f}ms "
+        f"p99={percentile(samples, 99):7.1f}ms "
+        f"max={max(samples):7.1f}ms "
+        f"mean={statistics.fmean(samples):7.1f}ms"
+    )
+
+
+async def create_user(client: httpx.AsyncClient) -> tuple[str, str]:
+    email = f"bench-{uuid.uuid4().hex[:12]}@example.com"
+    resp = await client.post(
+        "/api/v1/auth/signup",
+        json={"email": email, "password": PASSWORD, "name": "Bench"},
+        headers=DEVICE_HEADERS,
+    )
+    resp.raise_for_status()
+    resp = await client.post(
+        "/api/v1/auth/login",
+        json={"email": email, "password": PASSWORD},
+        headers=DEVICE_HEADERS,
+    )
+    resp.raise_for_status()
+    return email, resp.json()["data"]["access_token"]
+
+
+async def reader(
+    client: httpx.AsyncClient,
+    token: str,
+    stop: asyncio.Event,
+    samples: list[tuple[float, float]],
+) -> None:
+    headers = {**DEVICE_HEADERS, "Authorization": f"Bearer {token}"}
+    while not stop.is_set():
+        start = time.perf_counter()
+        resp = await client.get("/api/v1/users/me", headers=headers)
+        elapsed = (time.perf_counter() - start) * 1000
+        if resp.status_code == 200:
+            samples.append((start, elapsed))
+
+
+async def login_burst(client: httpx.AsyncClient, email: str, count: int) -> list[float]:
+    async def one() -> float:
+        start = time.perf_counter()
+        await client.post(
+            "/api/v1/auth/login",
+            json={"email": email, "password": PASSWORD},
+            headers=DEVICE_HEADERS,
+        )
+        return (time.perf_counter() - start) * 1000
+
+    return list(await asyncio.gather(*(one() for _ in range(count))))
+
+
+async def main(args: argparse.Namespace) -> None:
+    limits = httpx.Limits(max_connections=args.readers + args.logins + 10)
+    async with httpx.AsyncClient(
+        base_url=args.base_url, limits=limits, timeout=args.timeout
+    ) as client:
+        email, token = await create_user(client)
+
+        stop = asyncio.Event()
+        samples: list[tuple[float, float]] = []
+        readers = [
+            asyncio.create_task(reader(client, token, stop, samples))
+            for _ in range(args.readers)
+        ]
+
+        await asyncio.sleep(args.warmup)
+        burst_start = time.perf_counter()
+        login_latencies = await login_burst(client, email, args.logins)
+        burst_end = time.perf_counter()
+        await asyncio.sleep(args.cooldown)
+
+        stop.set()
+        await asyncio.gather(*readers)
+
+    idle = [ms for start, ms in samples if start < burst_start]
+    during = [ms for start, ms in samples if burst_start <= start < burst_end]
+
+    print(f"logins={args.logins} readers={args.readers} burst={burst_end - burst_start:.2f}s")
+    summarize("reads idle", idle)
+    summarize("reads burst", during)
+    summarize("logins", login_latencies)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--readers", type=int, default=20)
+    parser.add_argument("--logins", type=int, default=50)
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--cooldown", type=float, default=0.5)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,148 @@
+"""Compare keyset and OFFSET pagination of a user's login history by page depth.
+
+Seeds ``login_histories`` with --rows rows (10M by default) spread evenly over
+--users users, one login per user per minute, then pages through the history
+of --samples users with --limit rows per page. "keyset" is
+``LoginHistoryRepository.list_for_user`` following ``next_cursor`` from the
+first page; "offset" is the same query with ``OFFSET (page - 1) * limit``.
+Times are ms per page at each depth in --pages.
+
+The seeded table is kept and reused by later runs with the same --rows and
+--users; pass --reseed to rebuild it. Point it at a scratch database:
+
+    python scripts/bench_login_history_pagination.py --database-url sqlite+aiosqlite:///./bench.db
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.models import Base, LoginHistory  # noqa: E402
+from app.repositories.login_history import LoginHistoryRepository  # noqa: E402
+from app.services.login_history import decode_cursor, encode_cursor  # noqa: E402
+
+STRATEGIES = ("keyset", "offset")
+CHUNK = 50_000
+
+
+async def seed(engine, rows: int, users: int, reseed: bool) -> None:
+    async with engine.begin() as conn:
+        if reseed:
+            await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        existing = (await conn.execute(select(func.count()).select_from(LoginHistory))).scalar()
+    if existing == rows:
+        return
+    if existing:
+        raise SystemExit(f"login_histories has {existing} rows, not {rows}; pass --reseed")
+
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    start = time.perf_counter()
+    for offset in range(0, rows, CHUNK):
+        async with engine.begin() as conn:
+            await conn.execute(
+                insert(LoginHistory),
+                [
+                    {
+                        "user_id": f"bench-{n % users}",
+                        "device_id": f"device-{n % 7}",
+                        "ip_address": "203.0.113.10",
+                        "os_type": "iOS",
+                        "app_version": "1.0.0",
+                        "login_at": base + timedelta(minutes=n // users),
+                        "login_type": "EMAIL",
+                        "success": n % 10 != 0,
+                    }
+                    for n in range(offset, min(offset + CHUNK, rows))
+                ],
+            )
+        print(f"\rseeded {min(offset + CHUNK, rows):,} rows", end="", flush=True)
+    print(f" in {time.perf_counter() - start:.0f}s")
+
+
+async def offset_page(session: AsyncSession, user_id: str, limit: int, page: int) -> list:
+    stmt = (
+        select(*LoginHistoryRepository.HISTORY_COLUMNS)
+        .where(LoginHistory.user_id == user_id)
+        .order_by(LoginHistory.login_at.desc(), LoginHistory.id.desc())
+        .limit(limit + 1)
+        .offset((page - 1) * limit)
+    )
+    return (await session.execute(stmt)).all()
+
+
+async def bench_user(
+    session: AsyncSession, strategy: str, user_id: str, limit: int, pages: list[int]
+) -> dict[int, float]:
+    timings = {}
+    if strategy == "offset":
+        for page in pages:
+            start = time.perf_counter()
+            await offset_page(session, user_id, limit, page)
+            timings[page] = (time.perf_counter() - start) * 1000
+        return timings
+
+    repo = LoginHistoryRepository(session)
+    cursor = None
+    for page in range(1, max(pages) + 1):
+        start = time.perf_counter()
+        # Same work as the endpoint: decode the cursor, fetch limit + 1, encode the next one.
+        rows = await repo.list_for_user(
+            user_id, limit + 1, before=decode_cursor(cursor) if cursor else None
+        )
+        rows = rows[:limit]
+        cursor = encode_cursor(rows[-1].login_at, rows[-1].id) if rows else None
+        if page in pages:
+            timings[page] = (time.perf_counter() - start) * 1000
+        if cursor is None:
+            break
+    return timings
+
+
+async def main(args: argparse.Namespace) -> None:
+    engine = create_async_engine(args.database_url)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    try:
+        await seed(engine, args.rows, args.users, args.reseed)
+        per_user = args.rows // args.users
+        pages = [p for p in args.pages if (p - 1) * args.limit < per_user]
+        print(f"{args.rows:,} rows, {per_user:,} per user, {args.limit} per page; ms per page")
+        print(f"{'page':>6} {'strategy':<8} {'mean':>9} {'p50':>9} {'max':>9}")
+        samples: dict[tuple[int, str], list[float]] = {}
+        async with factory() as session:
+            for n in range(args.samples):
+                user_id = f"bench-{n * args.users // args.samples}"
+                for strategy in args.strategies:
+                    timings = await bench_user(session, strategy, user_id, args.limit, pages)
+                    for page, ms in timings.items():
+                        samples.setdefault((page, strategy), []).append(ms)
+        for page in pages:
+            for strategy in args.strategies:
+                values = samples[(page, strategy)]
+                print(
+                    f"{page:>6} {strategy:<8} {statistics.mean(values):>9.3f} "
+                    f"{statistics.median(values):>9.3f} {max(values):>9.3f}"
+                )
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default="sqlite+aiosqlite:///./bench_history.db")
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--users", type=int, default=1_000)
+    parser.add_argument("--samples", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 10, 100, 500])
+    parser.add_argument("--strategies", nargs="+", choices=STRATEGIES, default=list(STRATEGIES))
+    parser.add_argument("--reseed", action="store_true")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,122 @@
+"""Compare refresh-token session layouts: Redis memory and logout-all latency.
+
+Runs against a live Redis. The target database is FLUSHED before each layout
+is loaded, so point it at a scratch database:
+
+    python scripts/bench_token_store_layout.py --redis-url redis://localhost:6379/15
+
+"keys" is the per-device layout (``auth:rt:{user}:{device}`` JSON strings plus
+an ``auth:devices:{user}`` sorted set); "hash" is one ``auth:sessions:{user}`` hash per
+user with positional records. Memory is the used_memory delta after loading
+--users x --devices sessions, scaled to one million sessions. Logout-all runs
+``delete_all_refresh_tokens`` for a sample of users through the token store.
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import redis.asyncio as aioredis
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.redis_token_store import (  # noqa: E402
+    RedisHashTokenStore,
+    RedisTokenStore,
+    encode_session,
+)
+
+LAYOUTS = ("keys", "hash")
+TTL = 30 * 24 * 3600
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def load(redis: aioredis.Redis, layout: str, users: list[str], devices: int) -> None:
+    now = datetime.now(timezone.utc)
+    expires_at = now + timedelta(seconds=TTL)
+    pipe = redis.pipeline(transaction=False)
+    for n, user_id in enumerate(users, 1):
+        for d in range(devices):
+            device_id = f"device-{d}"
+            token_id = str(uuid.uuid4())
+            if layout == "hash":
+                pipe.hset(
+                    f"auth:sessions:{user_id}",
+                    device_id,
+                    encode_session(
+                        token_id, int(now.timestamp()), int(expires_at.timestamp()),
+                        "Galaxy S24", "Android", "1.0.0", "203.0.113.10",
+                    ),
+                )
+            else:
+                pipe.setex(
+                    f"auth:rt:{user_id}:{device_id}",
+                    TTL,
+                    RedisTokenStore._refresh_token_record(
+                        user_id, device_id, token_id, "Galaxy S24", "Android", "1.0.0",
+                        "203.0.113.10", now, expires_at,
+                    ),
+                )
+                pipe.zadd(f"auth:devices:{user_id}", {device_id: expires_at.timestamp()})
+        pipe.expire(
+            f"auth:sessions:{user_id}" if layout == "hash" else f"auth:devices:{user_id}", TTL
+        )
+        if n % 1000 == 0:
+            await pipe.execute()
+    await pipe.execute()
+
+
+async def used_memory(redis: aioredis.Redis) -> int:
+    return int((await redis.info("memory"))["used_memory"])
+
+
+async def bench_layout(redis: aioredis.Redis, layout: str, args: argparse.Namespace) -> None:
+    await redis.flushdb()
+    baseline = await used_memory(redis)
+    users = [str(uuid.uuid4()) for _ in range(args.users)]
+    await load(redis, layout, users, args.devices)
+    sessions = args.users * args.devices
+    per_million = (await used_memory(redis) - baseline) / sessions * 1_000_000
+
+    store = RedisHashTokenStore(redis) if layout == "hash" else RedisTokenStore(redis)
+    samples = []
+    for user_id in users[: args.logout_samples]:
+        start = time.perf_counter()
+        await store.delete_all_refresh_tokens(user_id)
+        samples.append((time.perf_counter() - start) * 1000)
+
+    print(
+        f"{layout:<6} {per_million / 2**20:>12.1f} {statistics.median(samples):>9.2f} "
+        f"{percentile(samples, 95):>9.2f} {percentile(samples, 99):>9.2f}"
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    redis = aioredis.from_url(args.redis_url, decode_responses=True)
+    try:
+        print(f"{args.users} users x {args.devices} devices")
+        print(f"{'layout':<6} {'MiB/1M sess':>12} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+        for layout in args.layouts:
+            await bench_layout(redis, layout, args)
+        await redis.flushdb()
+    finally:
+        await redis.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--redis-url", default="redis://localhost:6379/15")
+    parser.add_argument("--users", type=int, default=50_000)
+    parser.add_argument("--devices", type=int, default=3)
+    parser.add_argument("--logout-samples", type=int, default=2000)
+    parser.add_argument("--layouts", nargs="+", choices=LAYOUTS, default=list(LAYOUTS))
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,187 @@
+"""Calibrate password-hash cost settings on the current machine.
+
+Benchmarks hash/verify for a range of bcrypt rounds and argon2id parameters,
+then measures verify throughput through a process pool for each worker count.
+Prints a table, recommends the most expensive setting whose verify latency
+stays under --target-ms, and optionally writes everything as JSON:
+
+    python scripts/calibrate_password_hash.py --target-ms 250 \\
+        --output benchmarks/password_hash_baseline.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core.hashers import Argon2idHasher, BcryptHasher, PasswordHasher  # noqa: E402
+
+PASSWORD = "CalibratePass123!"
+
+ENV_NAMES = {
+    "bcrypt": {"rounds": "BCRYPT_ROUNDS"},
+    "argon2id": {
+        "time_cost": "ARGON2_TIME_COST",
+        "memory_cost": "ARGON2_MEMORY_COST",
+        "parallelism": "ARGON2_PARALLELISM",
+    },
+}
+
+
+def build_hasher(scheme: str, params: dict[str, int]) -> PasswordHasher:
+    if scheme == "bcrypt":
+        return BcryptHasher(**params)
+    return Argon2idHasher(**params)
+
+
+def _verify_job(scheme: str, params: dict[str, int], hashed: str) -> bool:
+    return build_hasher(scheme, params).verify(PASSWORD, hashed)
+
+
+def time_ms(fn: Any, *args: Any) -> float:
+    start = time.perf_counter()
+    fn(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+def measure_latency(hasher: PasswordHasher, samples: int) -> tuple[float, float, str]:
+    hashed = hasher.hash(PASSWORD)
+    hash_ms = statistics.median(time_ms(hasher.hash, PASSWORD) for _ in range(samples))
+    verify_ms = statistics.median(
+        time_ms(hasher.verify, PASSWORD, hashed) for _ in range(samples)
+    )
+    return hash_ms, verify_ms, hashed
+
+
+def measure_throughput(
+    scheme: str, params: dict[str, int], hashed: str, workers: int, jobs_per_worker: int
+) -> float:
+    jobs = workers * jobs_per_worker
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Warm the pool so process start-up is not counted.
+        list(pool.map(_verify_job, [scheme] * workers, [params] * workers, [hashed] * workers))
+        start = time.perf_counter()
+        list(pool.map(_verify_job, [scheme] * jobs, [params] * jobs, [hashed] * jobs))
+        elapsed = time.perf_counter() - start
+    return jobs / elapsed
+
+
+def candidate_configs(args: argparse.Namespace) -> list[tuple[str, dict[str, int]]]:
+    configs: list[tuple[str, dict[str, int]]] = []
+    if args.scheme in ("bcrypt", "all"):
+        configs += [("bcrypt", {"rounds": r}) for r in args.bcrypt_rounds]
+    if args.scheme in ("argon2id", "all"):
+        configs += [
+            (
+                "argon2id",
+                {"time_cost": t, "memory_cost": m, "parallelism": args.argon2_parallelism},
+            )
+            for m in args.argon2_memory_costs
+            for t in args.argon2_time_costs
+        ]
+    return configs
+
+
+def recommend(results: list[dict[str, Any]], target_ms: float) -> dict[str, Any]:
+    recommendation: dict[str, Any] = {}
+    for scheme in sorted({r["scheme"] for r in results}):
+        within = [
+            r for r in results if r["scheme"] == scheme and r["verify_ms"] <= target_ms
+        ]
+        if within:
+            best = max(within, key=lambda r: r["verify_ms"])
+            recommendation[scheme] = {"params": best["params"], "verify_ms": best["verify_ms"]}
+        else:
+            recommendation[scheme] = None
+    return recommendation
+
+
+def main(args: argparse.Namespace) -> None:
+    cpu_count = os.cpu_count() or 1
+    results: list[dict[str, Any]] = []
+
+    header = f"{'scheme':<9} {'params':<58} {'hash_ms':>8} {'verify_ms':>9} {'logins/s/core':>13}"
+    header += "".join(f" {f'w={w}':>9}" for w in args.workers)
+    print(header)
+
+    for scheme, params in candidate_configs(args):
+        hasher = build_hasher(scheme, params)
+        hash_ms, verify_ms, hashed = measure_latency(hasher, args.samples)
+        per_core = 1000 / verify_ms
+        capacity = {
+            str(w): round(measure_throughput(scheme, params, hashed, w, args.samples), 2)
+            for w in args.workers
+        }
+        results.append(
+            {
+                "scheme": scheme,
+                "params": params,
+                "hash_ms": round(hash_ms, 2),
+                "verify_ms": round(verify_ms, 2),
+                "logins_per_sec_per_core": round(per_core, 2),
+                "logins_per_sec_by_workers": capacity,
+            }
+        )
+        line = f"{scheme:<9} {json.dumps(params):<58} {hash_ms:>8.1f} {verify_ms:>9.1f} {per_core:>13.1f}"
+        line += "".join(f" {capacity[str(w)]:>9.1f}" for w in args.workers)
+        print(line)
+
+    recommendation = recommend(results, args.target_ms)
+    print(f"\nRecommended settings for verify <= {args.target_ms}ms:")
+    for scheme, rec in recommendation.items():
+        if rec is None:
+            print(f"  {scheme}: none within target")
+            continue
+        env = " ".join(
+            f"{ENV_NAMES[scheme][name]}={value}" for name, value in rec["params"].items()
+        )
+        print(f"  {scheme}: PASSWORD_HASH_SCHEME={scheme} {env}")
+
+    if args.output:
+        report = {
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "machine": {
+                "platform": platform.platform(),
+                "processor": platform.processor(),
+                "cpu_count": cpu_count,
+                "python": platform.python_version(),
+            },
+            "target_verify_ms": args.target_ms,
+            "samples": args.samples,
+            "results": results,
+            "recommendation": recommendation,
+        }
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"\nResults written to {output}")
+
+
+def int_list(value: str) -> list[int]:
+    return [int(v) for v in value.split(",") if v]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scheme", choices=["bcrypt", "argon2id", "all"], default="all")
+    parser.add_argument("--bcrypt-rounds", type=int_list, default=[10, 11, 12, 13])
+    parser.add_argument("--argon2-time-costs", type=int_list, default=[1, 2, 3])
+    parser.add_argument(
+        "--argon2-memory-costs", type=int_list, default=[19456, 47104], help="KiB"
+    )
+    parser.add_argument("--argon2-parallelism", type=int, default=1)
+    parser.add_argument(
+        "--workers", type=int_list, default=sorted({1, 2, os.cpu_count() or 1})
+    )
+    parser.add_argument("--samples", type=int, default=5)
+    parser.add_argument("--target-ms", type=float, default=250.0)
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    main(parser.parse_args())
@@ -1,19 +1,28 @@
-"""Generate RSA key pair for JWT signing."""
+"""Generate a key pair for JWT signing (RS256, ES256 or EdDSA)."""
+import argparse
 import os
 from pathlib import Path
 
 from cryptography.hazmat.primitives import serialization
-from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+from cryptography.hazmat.primitives.asymmetric.types import PrivateKeyTypes
 
 
-def generate_rsa_keys(output_dir: str = "keys") -> None:
+def new_private_key(algorithm: str) -> PrivateKeyTypes:
+    if algorithm == "RS256":
+        return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    if algorithm == "ES256":
+        return ec.generate_private_key(ec.SECP256R1())
+    if algorithm == "EdDSA":
+        return ed25519.Ed25519PrivateKey.generate()
+    raise ValueError(f"Unsupported algorithm: {algorithm}")
+
+
+def generate_keys(output_dir: str = "keys", algorithm: str = "RS256") -> None:
     key_dir = Path(output_dir)
     key_dir.mkdir(parents=True, exist_ok=True)
 
-    private_key = rsa.generate_private_key(
-        public_exponent=65537,
-        key_size=2048,
-    )
+    private_key = new_private_key(algorithm)
 
     private_pem = private_key.private_bytes(
         encoding=serialization.Encoding.PEM,
@@ -36,10 +45,18 @@ def generate_rsa_keys(output_dir: str = "keys") -> None:
     os.chmod(private_path, 0o600)
     os.chmod(public_path, 0o644)
 
-    print(f"RSA keys generated in {key_dir}/")
+    print(f"{algorithm} keys generated in {key_dir}/")
     print(f"  Private key: {private_path}")
     print(f"  Public key:  {public_path}")
+    if algorithm != "RS256":
+        print(f"  Set JWT_ALGORITHM={algorithm} to use them.")
 
 
 if __name__ == "__main__":
-    generate_rsa_keys()
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--algorithm", choices=["RS256", "ES256", "EdDSA"], default="RS256"
+    )
+    parser.add_argument("--output-dir", default="keys")
+    args = parser.parse_args()
+    generate_keys(args.output_dir, args.algorithm)
@@ -0,0 +1,60 @@
+"""Move refresh token sessions from legacy to hash-tagged Redis key names.
+
+Part of moving to Redis Cluster; run it against the standalone Redis, since
+the move touches keys in different slots:
+
+1. Deploy with REDIS_KEY_SCHEME=tagged and REDIS_LEGACY_KEY_FALLBACK=true.
+   Each user's legacy keys are then moved on their next session operation.
+2. Move everyone else:
+
+       python scripts/migrate_redis_keys.py --redis-url redis://localhost:6379/0
+
+3. Set REDIS_LEGACY_KEY_FALLBACK=false once this reports nothing left to move
+   and the access token lifetime has passed, since legacy epoch keys expire
+   on their own. Then switch to the cluster with REDIS_CLUSTER=true.
+
+Idempotent and safe to run while the app is serving traffic.
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+import redis.asyncio as aioredis
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.redis_keys import TAGGED_KEYS  # noqa: E402
+from app.services.redis_token_store import RedisTokenStore  # noqa: E402
+
+LEGACY_INDEX_PREFIXES = ("auth:devices:", "auth:sessions:")
+
+
+async def main(args: argparse.Namespace) -> None:
+    redis = aioredis.from_url(args.redis_url, decode_responses=True)
+    store = RedisTokenStore(redis, keys=TAGGED_KEYS)
+    seen: set[str] = set()
+    moved = 0
+    try:
+        for prefix in LEGACY_INDEX_PREFIXES:
+            async for key in redis.scan_iter(match=f"{prefix}*", count=1000):
+                user_id = key.removeprefix(prefix)
+                if user_id in seen:
+                    continue
+                seen.add(user_id)
+                if not args.dry_run:
+                    moved += await store.migrate_legacy_keys(user_id)
+                if len(seen) % 10_000 == 0:
+                    print(f"{len(seen)} users, {moved} sessions moved")
+    finally:
+        await redis.aclose()
+
+    action = "would be migrated" if args.dry_run else f"migrated, {moved} sessions moved"
+    print(f"{len(seen)} users {action}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--redis-url", default="redis://localhost:6379/0")
+    parser.add_argument("--dry-run", action="store_true", help="Only count users with legacy keys")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,46 @@
+"""Apply login history retention; run daily from cron or a scheduler.
+
+On a MySQL table partitioned by `alembic upgrade head`, creates the monthly
+partitions LOGIN_HISTORY_PARTITION_MONTHS_AHEAD months out and drops whole
+months older than LOGIN_HISTORY_RETENTION_DAYS. Elsewhere, deletes expired
+rows in primary-key batches of LOGIN_HISTORY_PURGE_BATCH_SIZE:
+
+    python scripts/purge_login_history.py
+    python scripts/purge_login_history.py --retention-days 90 --pause 0.05
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core.database import engine  # noqa: E402
+from app.services.login_history_retention import LoginHistoryRetention  # noqa: E402
+
+
+async def main(args: argparse.Namespace) -> None:
+    retention = LoginHistoryRetention(engine)
+    try:
+        created = await retention.ensure_partitions(args.months_ahead)
+        result = await retention.purge(
+            retention_days=args.retention_days,
+            batch_size=args.batch_size,
+            pause=args.pause,
+        )
+    finally:
+        await engine.dispose()
+    print(f"partitions created: {', '.join(created) or '-'}")
+    print(f"partitions dropped: {', '.join(result.dropped_partitions) or '-'}")
+    print(f"rows deleted:       {result.deleted_rows}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--retention-days", type=int, default=None)
+    parser.add_argument("--months-ahead", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument(
+        "--pause", type=float, default=0.0, help="seconds to sleep between delete batches"
+    )
+    asyncio.run(main(parser.parse_args()))
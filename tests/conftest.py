@@ -1,11 +1,13 @@
 import asyncio
 import os
-from collections.abc import AsyncGenerator
-from unittest.mock import AsyncMock
+from collections.abc import AsyncGenerator, Generator
+from unittest.mock import AsyncMock, MagicMock
 
+import fakeredis
 import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 os.environ["DATABASE_URL"] = "sqlite+aiosqlite:///./test_db.db"
@@ -16,9 +18,12 @@ os.environ["JWT_PRIVATE_KEY_PATH"] = "keys/private.pem"
 os.environ["JWT_PUBLIC_KEY_PATH"] = "keys/public.pem"
 
 # Import models AFTER setting env vars so config picks them up
-from app.models import Base, LoginHistory, User, UserDevice  # noqa: E402, F401
-from app.dependencies.database import get_db  # noqa: E402
+from app.dependencies.database import get_db, get_recent_write_marker  # noqa: E402
 from app.dependencies.redis import get_redis  # noqa: E402
+from app.dependencies.token_store import get_token_store  # noqa: E402
+from app.models import Base, LoginHistory, User, UserDevice  # noqa: E402, F401
+from app.services.memory_token_store import MemoryTokenStore  # noqa: E402
+from app.services.read_routing import MemoryRecentWriteMarker  # noqa: E402
 
 test_engine = create_async_engine("sqlite+aiosqlite:///./test_db.db", echo=False)
 test_session_factory = async_sessionmaker(
@@ -49,6 +54,19 @@ async def db_session() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+@pytest.fixture
+def sql_statements() -> Generator[list[str], None, None]:
+    """SQL statements sent to the test database while the fixture is active."""
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement)
+
+    event.listen(test_engine.sync_engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(test_engine.sync_engine, "before_cursor_execute", record)
+
+
 @pytest_asyncio.fixture
 async def mock_redis() -> AsyncMock:
     redis_mock = AsyncMock()
@@ -59,11 +77,37 @@ async def mock_redis() -> AsyncMock:
     redis_mock.sadd = AsyncMock()
     redis_mock.srem = AsyncMock()
     redis_mock.smembers = AsyncMock(return_value=set())
+    # Pipelines queue commands synchronously; only execute() is awaited.
+    pipeline = MagicMock()
+    pipeline.execute = AsyncMock(return_value=[[None, None], 0])
+    redis_mock.pipeline = MagicMock(return_value=pipeline)
+    # register_script() returns a callable Script; the call runs EVALSHA.
+    redis_mock.register_script = MagicMock(return_value=AsyncMock(return_value=0))
     return redis_mock
 
 
 @pytest_asyncio.fixture
-async def client(mock_redis: AsyncMock) -> AsyncGenerator[AsyncClient, None]:
+async def fake_redis() -> AsyncGenerator[fakeredis.FakeAsyncRedis, None]:
+    """In-process Redis that runs Lua, so the token store scripts execute for real."""
+    redis = fakeredis.FakeAsyncRedis(server=fakeredis.FakeServer(), decode_responses=True)
+    yield redis
+    await redis.aclose()
+
+
+@pytest.fixture
+def token_store() -> MemoryTokenStore:
+    return MemoryTokenStore()
+
+
+@pytest.fixture
+def recent_writes() -> MemoryRecentWriteMarker:
+    return MemoryRecentWriteMarker()
+
+
+@pytest_asyncio.fixture
+async def client(
+    mock_redis: AsyncMock, token_store: MemoryTokenStore, recent_writes: MemoryRecentWriteMarker
+) -> AsyncGenerator[AsyncClient, None]:
     from app.core.rate_limit import limiter
     from app.main import create_app
 
@@ -84,6 +128,8 @@ async def client(mock_redis: AsyncMock) -> AsyncGenerator[AsyncClient, None]:
 
     app.dependency_overrides[get_db] = override_get_db
     app.dependency_overrides[get_redis] = override_get_redis
+    app.dependency_overrides[get_token_store] = lambda: token_store
+    app.dependency_overrides[get_recent_write_marker] = lambda: recent_writes
 
     async with AsyncClient(
         transport=ASGITransport(app=app),
@@ -1,3 +1,4 @@
+import jwt
 import pytest
 from httpx import AsyncClient
 
@@ -109,9 +110,246 @@ async def test_login_invalid_credentials(client: AsyncClient):
     assert response.status_code == 401
 
 
+@pytest.mark.asyncio
+async def test_failed_login_history_is_written_behind(client: AsyncClient, db_session, monkeypatch):
+    from sqlalchemy import select
+
+    from app.models.login_history import LoginHistory
+    from app.repositories import login_history_writer as writer_module
+    from app.repositories.login_history_writer import LoginHistoryWriter
+
+    writer = LoginHistoryWriter(db_session.bind, flush_interval=60)
+    writer.start()
+    monkeypatch.setattr(writer_module, "login_history_writer", writer)
+
+    response = await client.post(
+        "/api/v1/auth/login",
+        json={"email": "nobody@example.com", "password": "WrongPass123!"},
+        headers=DEVICE_HEADERS,
+    )
+    assert response.status_code == 401
+    await writer.close()
+
+    history = (await db_session.execute(select(LoginHistory))).scalars().all()
+    assert [(h.success, h.failure_reason) for h in history] == [(False, "INVALID_CREDENTIALS")]
+
+
 @pytest.mark.asyncio
 async def test_health_check(client: AsyncClient):
     response = await client.get("/health")
     assert response.status_code == 200
     data = response.json()
     assert data["status"] == "ok"
+
+
+@pytest.mark.asyncio
+async def test_login_rehashes_outdated_password_hash(client: AsyncClient, db_session):
+    from sqlalchemy import select
+
+    from app.core.hashers import BcryptHasher
+    from app.core.security import password_needs_rehash
+    from app.models.user import User
+
+    await client.post(
+        "/api/v1/auth/signup",
+        json={
+            "email": "rehash@example.com",
+            "password": "TestPass123!",
+            "name": "Rehash User",
+        },
+        headers=DEVICE_HEADERS,
+    )
+    user = (
+        await db_session.execute(select(User).where(User.email == "rehash@example.com"))
+    ).scalar_one()
+    user.hashed_password = BcryptHasher(rounds=4).hash("TestPass123!")
+    await db_session.commit()
+
+    response = await client.post(
+        "/api/v1/auth/login",
+        json={"email": "rehash@example.com", "password": "TestPass123!"},
+        headers=DEVICE_HEADERS,
+    )
+    assert response.status_code == 200
+
+    await db_session.refresh(user)
+    assert password_needs_rehash(user.hashed_password) is False
+
+
+@pytest.mark.asyncio
+async def test_jwks_endpoint_supports_etag(client: AsyncClient):
+    response = await client.get("/.well-known/jwks.json")
+    assert response.status_code == 200
+    keys = response.json()["keys"]
+    assert keys and all("kid" in key and "alg" in key for key in keys)
+
+    etag = response.headers["ETag"]
+    cached = await client.get("/.well-known/jwks.json", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+
+
+async def _login_tokens(client: AsyncClient, email: str) -> dict:
+    await client.post(
+        "/api/v1/auth/signup",
+        json={"email": email, "password": "TestPass123!", "name": "Refresh User"},
+        headers=DEVICE_HEADERS,
+    )
+    response = await client.post(
+        "/api/v1/auth/login",
+        json={"email": email, "password": "TestPass123!"},
+        headers=DEVICE_HEADERS,
+    )
+    return response.json()["data"]
+
+
+@pytest.mark.asyncio
+async def test_refresh_rotates_token(client: AsyncClient, token_store):
+    tokens = await _login_tokens(client, "refresh@example.com")
+    user_id = tokens["user"]["user_id"]
+
+    response = await client.post(
+        "/api/v1/auth/refresh",
+        json={"refresh_token": tokens["refresh_token"]},
+        headers=DEVICE_HEADERS,
+    )
+    assert response.status_code == 200
+    new_refresh_token = response.json()["data"]["refresh_token"]
+    assert new_refresh_token != tokens["refresh_token"]
+
+    stored = await token_store.get_refresh_token(user_id, "test-device-001")
+    assert stored is not None
+
+    response = await client.post(
+        "/api/v1/auth/refresh",
+        json={"refresh_token": new_refresh_token},
+        headers=DEVICE_HEADERS,
+    )
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_refresh_runs_no_sql(client: AsyncClient, sql_statements: list[str]):
+    tokens = await _login_tokens(client, "nosql@example.com")
+    sql_statements.clear()
+
+    response = await client.post(
+        "/api/v1/auth/refresh",
+        json={"refresh_token": tokens["refresh_token"]},
+        headers=DEVICE_HEADERS,
+    )
+    assert response.status_code == 200
+    assert sql_statements == []
+
+
+@pytest.mark.asyncio
+async def test_refresh_issues_updated_profile_claims(client: AsyncClient, token_store):
+    tokens = await _login_tokens(client, "claims@example.com")
+    headers = {**DEVICE_HEADERS, "Authorization": f"Bearer {tokens['access_token']}"}
+    await client.patch("/api/v1/users/me", json={"name": "Renamed"}, headers=headers)
+
+    response = await client.post(
+        "/api/v1/auth/refresh",
+        json={"refresh_token": tokens["refresh_token"]},
+        headers=DEVICE_HEADERS,
+    )
+    access_token = response.json()["data"]["access_token"]
+    assert jwt.decode(access_token, options={"verify_signature": False})["name"] == "Renamed"
+
+    # a cold cache falls back to the database
+    await token_store.delete_user_claims(tokens["user"]["user_id"])
+    response = await client.post(
+        "/api/v1/auth/refresh",
+        json={"refresh_token": response.json()["data"]["refresh_token"]},
+        headers=DEVICE_HEADERS,
+    )
+    assert response.status_code == 200
+    assert await token_store.get_user_claims(tokens["user"]["user_id"]) is not None
+
+
+@pytest.mark.asyncio
+async def test_repeated_refresh_within_grace_returns_same_tokens(
+    client: AsyncClient, token_store, monkeypatch
+):
+    from app.services.jwt import get_jwt_service
+
+    tokens = await _login_tokens(client, "grace@example.com")
+    calls = []
+
+    def spy(target, name):
+        original = getattr(target, name)
+
+        async def wrapper(*args, **kwargs):
+            calls.append(name)
+            return await original(*args, **kwargs)
+
+        monkeypatch.setattr(target, name, wrapper)
+
+    jwt_service = get_jwt_service()
+    spy(jwt_service, "create_access_token_async")
+    spy(jwt_service, "create_refresh_token_async")
+    spy(token_store, "get_refresh_state")
+    spy(token_store, "get_rotation_grace")
+    spy(token_store, "rotate_refresh_token")
+
+    first = await client.post(
+        "/api/v1/auth/refresh",
+        json={"refresh_token": tokens["refresh_token"]},
+        headers=DEVICE_HEADERS,
+    )
+    # a normal rotation reads its state once, signs once and rotates
+    assert sorted(calls) == [
+        "create_access_token_async",
+        "create_refresh_token_async",
+        "get_refresh_state",
+        "rotate_refresh_token",
+    ]
+    calls.clear()
+    second = await client.post(
+        "/api/v1/auth/refresh",
+        json={"refresh_token": tokens["refresh_token"]},
+        headers=DEVICE_HEADERS,
+    )
+    assert first.status_code == 200
+    assert second.status_code == 200
+    assert second.json()["data"]["refresh_token"] == first.json()["data"]["refresh_token"]
+    assert second.json()["data"]["access_token"] == first.json()["data"]["access_token"]
+    # the retry is answered from that same read, without signing a new pair
+    assert calls == ["get_refresh_state"]
+
+
+@pytest.mark.asyncio
+async def test_refresh_with_reused_token_revokes_session(client: AsyncClient, token_store):
+    tokens = await _login_tokens(client, "reuse@example.com")
+    user_id = tokens["user"]["user_id"]
+    response = await client.post(
+        "/api/v1/auth/refresh",
+        json={"refresh_token": tokens["refresh_token"]},
+        headers=DEVICE_HEADERS,
+    )
+    # rotated again: presenting the first token now is reuse, not a retry
+    await client.post(
+        "/api/v1/auth/refresh",
+        json={"refresh_token": response.json()["data"]["refresh_token"]},
+        headers=DEVICE_HEADERS,
+    )
+
+    response = await client.post(
+        "/api/v1/auth/refresh",
+        json={"refresh_token": tokens["refresh_token"]},
+        headers=DEVICE_HEADERS,
+    )
+    assert response.status_code == 401
+    assert await token_store.get_refresh_token(user_id, "test-device-001") is None
+
+
+@pytest.mark.asyncio
+async def test_logout_all_revokes_access_tokens(client: AsyncClient):
+    tokens = await _login_tokens(client, "logoutall@example.com")
+    headers = {**DEVICE_HEADERS, "Authorization": f"Bearer {tokens['access_token']}"}
+
+    response = await client.post("/api/v1/auth/logout/all", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["data"]["logged_out_devices"] == 1
+
+    response = await client.get("/api/v1/users/me", headers=headers)
+    assert response.status_code == 401
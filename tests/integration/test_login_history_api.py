@@ -0,0 +1,125 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import LoginHistory
+
+DEVICE_HEADERS = {
+    "X-Device-Id": "test-device-history",
+    "X-Device-Name": "Test Device",
+    "X-App-Version": "1.0.0",
+    "X-OS-Type": "iOS",
+    "X-OS-Version": "17.2",
+}
+URL = "/api/v1/users/me/login-history"
+
+
+async def _login(client: AsyncClient, email: str) -> tuple[dict, str]:
+    await client.post(
+        "/api/v1/auth/signup",
+        json={"email": email, "password": "TestPass123!", "name": "History User"},
+        headers=DEVICE_HEADERS,
+    )
+    response = await client.post(
+        "/api/v1/auth/login",
+        json={"email": email, "password": "TestPass123!"},
+        headers=DEVICE_HEADERS,
+    )
+    headers = {
+        **DEVICE_HEADERS,
+        "Authorization": f"Bearer {response.json()['data']['access_token']}",
+    }
+    me = await client.get("/api/v1/users/me", headers=headers)
+    return headers, me.json()["data"]["user_id"]
+
+
+async def _seed(db_session: AsyncSession, user_id: str, count: int) -> None:
+    # Pairs of rows share a login_at so pages have to break ties on id.
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    await db_session.execute(
+        insert(LoginHistory),
+        [
+            {
+                "user_id": user_id,
+                "device_id": f"device-{n % 3}",
+                "os_type": "iOS",
+                "login_at": base + timedelta(minutes=n // 2),
+                "login_type": "EMAIL",
+                "success": n % 4 != 0,
+                "failure_reason": None if n % 4 else "INVALID_PASSWORD",
+            }
+            for n in range(count)
+        ],
+    )
+    await db_session.commit()
+
+
+async def _all_pages(client: AsyncClient, headers: dict, **params) -> list[list[dict]]:
+    pages = []
+    cursor = None
+    while True:
+        query = {**params, **({"cursor": cursor} if cursor else {})}
+        response = await client.get(URL, params=query, headers=headers)
+        assert response.status_code == 200
+        data = response.json()["data"]
+        pages.append(data["items"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.asyncio
+async def test_login_history_pages_newest_first(client: AsyncClient, db_session: AsyncSession):
+    headers, user_id = await _login(client, "history-pages@example.com")
+    await _seed(db_session, user_id, 25)
+
+    pages = await _all_pages(client, headers, limit=10)
+    assert [len(p) for p in pages] == [10, 10, 6]  # 25 seeded + the login above
+    items = [item for page in pages for item in page]
+    assert items[0]["device_id"] == "test-device-history"
+    login_times = [item["login_at"] for item in items]
+    assert login_times == sorted(login_times, reverse=True)
+    assert "user_agent" not in items[0]
+
+
+@pytest.mark.asyncio
+async def test_login_history_filters(client: AsyncClient, db_session: AsyncSession):
+    headers, user_id = await _login(client, "history-filters@example.com")
+    await _seed(db_session, user_id, 24)
+
+    pages = await _all_pages(client, headers, success="false", limit=4)
+    failures = [item for page in pages for item in page]
+    assert len(failures) == 6
+    assert all(not i["success"] and i["failure_reason"] for i in failures)
+
+    pages = await _all_pages(client, headers, device_id="device-1", limit=3)
+    device = [item for page in pages for item in page]
+    assert len(device) == 8
+    assert {i["device_id"] for i in device} == {"device-1"}
+
+
+@pytest.mark.asyncio
+async def test_login_history_is_scoped_to_user(client: AsyncClient, db_session: AsyncSession):
+    _, other_id = await _login(client, "history-other@example.com")
+    await _seed(db_session, other_id, 5)
+    headers, _ = await _login(client, "history-mine@example.com")
+
+    response = await client.get(URL, headers=headers)
+    data = response.json()["data"]
+    assert len(data["items"]) == 1
+    assert data["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_login_history_rejects_bad_paging(client: AsyncClient):
+    headers, _ = await _login(client, "history-bad@example.com")
+
+    response = await client.get(URL, params={"cursor": "not-a-cursor"}, headers=headers)
+    assert response.status_code == 400
+    assert response.json()["error_code"] == "HISTORY_001"
+
+    response = await client.get(URL, params={"limit": 101}, headers=headers)
+    assert response.status_code == 422
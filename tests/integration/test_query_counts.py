@@ -0,0 +1,139 @@
+"""SQL statement budgets for the hot endpoints.
+
+A change that adds a query to one of these paths should update the budget
+here deliberately rather than slip in unnoticed.
+"""
+import pytest
+from httpx import AsyncClient
+
+DEVICE_HEADERS = {
+    "X-Device-Id": "test-device-sql",
+    "X-Device-Name": "Test Device",
+    "X-App-Version": "1.0.0",
+    "X-OS-Type": "iOS",
+    "X-OS-Version": "17.2",
+}
+
+
+async def _login(client: AsyncClient, email: str) -> dict:
+    await client.post(
+        "/api/v1/auth/signup",
+        json={"email": email, "password": "TestPass123!", "name": "Query User"},
+        headers=DEVICE_HEADERS,
+    )
+    response = await client.post(
+        "/api/v1/auth/login",
+        json={"email": email, "password": "TestPass123!"},
+        headers=DEVICE_HEADERS,
+    )
+    return response.json()["data"]
+
+
+def _auth_headers(tokens: dict) -> dict:
+    return {**DEVICE_HEADERS, "Authorization": f"Bearer {tokens['access_token']}"}
+
+
+@pytest.mark.asyncio
+async def test_login_query_budget(client: AsyncClient, sql_statements: list[str]):
+    await _login(client, "login-budget@example.com")
+    sql_statements.clear()
+
+    response = await client.post(
+        "/api/v1/auth/login",
+        json={"email": "login-budget@example.com", "password": "TestPass123!"},
+        headers=DEVICE_HEADERS,
+    )
+    assert response.status_code == 200
+    # credentials, device upsert, last_login update, history (one flush at commit)
+    assert len(sql_statements) == 4
+    assert "ON CONFLICT (user_id, device_id) DO UPDATE" in sql_statements[1]
+    assert sql_statements[0].startswith(
+        "SELECT users.id, users.email, users.name, users.hashed_password, users.status "
+    )
+    # no eager load of User.devices
+    assert not any("user_devices.user_id IN" in s for s in sql_statements)
+
+
+@pytest.mark.asyncio
+async def test_failed_login_query_budget(client: AsyncClient, sql_statements: list[str]):
+    await _login(client, "failed-budget@example.com")
+    sql_statements.clear()
+
+    response = await client.post(
+        "/api/v1/auth/login",
+        json={"email": "failed-budget@example.com", "password": "WrongPass123!"},
+        headers=DEVICE_HEADERS,
+    )
+    assert response.status_code == 401
+    # credentials; the pending history row is discarded with the failed request
+    assert len(sql_statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_get_me_query_budget(client: AsyncClient, sql_statements: list[str]):
+    tokens = await _login(client, "me-budget@example.com")
+    sql_statements.clear()
+
+    response = await client.get("/api/v1/users/me", headers=_auth_headers(tokens))
+    assert response.status_code == 200
+    assert len(sql_statements) == 1
+    assert "hashed_password" not in sql_statements[0]
+
+
+@pytest.mark.asyncio
+async def test_update_me_query_budget(client: AsyncClient, sql_statements: list[str]):
+    tokens = await _login(client, "update-budget@example.com")
+    sql_statements.clear()
+
+    response = await client.patch(
+        "/api/v1/users/me", json={"name": "Renamed"}, headers=_auth_headers(tokens)
+    )
+    assert response.status_code == 200
+    assert len(sql_statements) == 2
+
+
+@pytest.mark.asyncio
+async def test_change_password_query_budget(client: AsyncClient, sql_statements: list[str]):
+    tokens = await _login(client, "password-budget@example.com")
+    sql_statements.clear()
+
+    response = await client.put(
+        "/api/v1/users/me/password",
+        json={"current_password": "TestPass123!", "new_password": "NewPass123!!"},
+        headers=_auth_headers(tokens),
+    )
+    assert response.status_code == 200
+    # credentials, password update, one set-based device deactivation
+    assert len(sql_statements) == 3
+
+
+@pytest.mark.asyncio
+async def test_get_devices_query_budget(client: AsyncClient, sql_statements: list[str]):
+    tokens = await _login(client, "devices-budget@example.com")
+    sql_statements.clear()
+
+    response = await client.get("/api/v1/users/me/devices", headers=_auth_headers(tokens))
+    assert response.status_code == 200
+    assert len(sql_statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_login_history_query_budget(client: AsyncClient, sql_statements: list[str]):
+    await _login(client, "history-budget@example.com")
+    tokens = await _login(client, "history-budget@example.com")
+    response = await client.get(
+        "/api/v1/users/me/login-history", params={"limit": 1}, headers=_auth_headers(tokens)
+    )
+    cursor = response.json()["data"]["next_cursor"]
+    sql_statements.clear()
+
+    response = await client.get(
+        "/api/v1/users/me/login-history",
+        params={"limit": 1, "cursor": cursor},
+        headers=_auth_headers(tokens),
+    )
+    assert response.status_code == 200
+    assert len(sql_statements) == 1
+    # seeks past the cursor instead of skipping rows (SQLite always renders OFFSET 0)
+    assert "login_histories.login_at <= ? AND (login_histories.login_at < ?" in sql_statements[0]
+    assert "ORDER BY login_histories.login_at DESC, login_histories.id DESC" in sql_statements[0]
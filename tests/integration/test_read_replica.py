@@ -0,0 +1,191 @@
+import os
+import time
+from datetime import datetime, timezone
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import insert, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core import database as database_module
+from app.dependencies.auth import CurrentUser
+from app.dependencies.database import get_read_db
+from app.models import Base, User
+from app.services import read_routing as read_routing_module
+from app.services.read_routing import MemoryRecentWriteMarker
+
+REPLICA_PATH = "./test_replica_db.db"
+DEVICE_HEADERS = {
+    "X-Device-Id": "test-device-replica",
+    "X-Device-Name": "Test Device",
+    "X-App-Version": "1.0.0",
+    "X-OS-Type": "iOS",
+    "X-OS-Version": "17.2",
+}
+
+
+@pytest_asyncio.fixture
+async def replica(monkeypatch) -> async_sessionmaker:
+    """A second SQLite file standing in for the read replica, never replicated to.
+
+    The app reads it through a read-only engine like the configured replica;
+    the returned factory writes to it directly, playing replication.
+    """
+    url = f"sqlite+aiosqlite:///{REPLICA_PATH}"
+    writer = create_async_engine(url, isolation_level="AUTOCOMMIT")
+    async with writer.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    reader = database_module.enforce_read_only(
+        create_async_engine(url, isolation_level="AUTOCOMMIT")
+    )
+    monkeypatch.setattr(
+        database_module,
+        "replica_session_factory",
+        async_sessionmaker(reader, class_=AsyncSession, expire_on_commit=False),
+    )
+    yield async_sessionmaker(writer, class_=AsyncSession, expire_on_commit=False)
+    await reader.dispose()
+    await writer.dispose()
+    os.remove(REPLICA_PATH)
+
+
+async def _login(client: AsyncClient, email: str) -> dict:
+    await client.post(
+        "/api/v1/auth/signup",
+        json={"email": email, "password": "TestPass123!", "name": "Primary Name"},
+        headers=DEVICE_HEADERS,
+    )
+    response = await client.post(
+        "/api/v1/auth/login",
+        json={"email": email, "password": "TestPass123!"},
+        headers=DEVICE_HEADERS,
+    )
+    data = response.json()["data"]
+    return {**DEVICE_HEADERS, "Authorization": f"Bearer {data['access_token']}"}
+
+
+def _replica_caught_up(monkeypatch) -> None:
+    """Move the clock past the replica lag window, expiring every marker."""
+    later = time.time() + read_routing_module.settings.database_replica_max_lag_seconds + 1
+    monkeypatch.setattr(read_routing_module.time, "time", lambda: later)
+
+
+async def _user_id(client: AsyncClient, headers: dict) -> str:
+    response = await client.get("/api/v1/users/me", headers=headers)
+    return response.json()["data"]["user_id"]
+
+
+async def _copy_user_to_replica(
+    db_session: AsyncSession, replica: async_sessionmaker, email: str, name: str
+) -> None:
+    user = (await db_session.execute(select(User).where(User.email == email))).scalar_one()
+    row = {c.key: getattr(user, c.key) for c in User.__table__.columns}
+    async with replica() as session:
+        await session.execute(insert(User), [{**row, "name": name}])
+
+
+@pytest.mark.asyncio
+async def test_reads_go_to_replica_after_lag_window(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    replica: async_sessionmaker,
+    monkeypatch,
+):
+    headers = await _login(client, "replica-read@example.com")
+    await _copy_user_to_replica(db_session, replica, "replica-read@example.com", "Replica Name")
+
+    # login just wrote: read your own writes from the primary
+    response = await client.get("/api/v1/users/me", headers=headers)
+    assert response.json()["data"]["name"] == "Primary Name"
+
+    _replica_caught_up(monkeypatch)
+    response = await client.get("/api/v1/users/me", headers=headers)
+    assert response.json()["data"]["name"] == "Replica Name"
+    response = await client.get("/api/v1/users/me/devices", headers=headers)
+    assert response.json()["data"] == []  # the replica has no device rows
+
+
+@pytest.mark.asyncio
+async def test_update_pins_reads_to_primary(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    replica: async_sessionmaker,
+    monkeypatch,
+):
+    headers = await _login(client, "replica-update@example.com")
+    await _copy_user_to_replica(db_session, replica, "replica-update@example.com", "Stale Name")
+    _replica_caught_up(monkeypatch)
+
+    await client.patch("/api/v1/users/me", json={"name": "New Name"}, headers=headers)
+    response = await client.get("/api/v1/users/me", headers=headers)
+    assert response.json()["data"]["name"] == "New Name"
+
+
+@pytest.mark.asyncio
+async def test_no_marker_without_replica(
+    client: AsyncClient, recent_writes: MemoryRecentWriteMarker
+):
+    headers = await _login(client, "replica-none@example.com")
+    assert await recent_writes.is_marked(await _user_id(client, headers)) is False
+
+    response = await client.get("/api/v1/users/me", headers=headers)
+    assert response.json()["data"]["name"] == "Primary Name"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("method", "path", "body"),
+    [
+        (
+            "PUT",
+            "/api/v1/users/me/password",
+            {"current_password": "TestPass123!", "new_password": "NewPass456!"},
+        ),
+        ("DELETE", "/api/v1/users/me", {"password": "TestPass123!"}),
+        ("POST", "/api/v1/auth/logout/all", None),
+    ],
+    ids=["change-password", "delete-account", "logout-all"],
+)
+async def test_account_wide_writes_mark_the_user(
+    client: AsyncClient,
+    replica: async_sessionmaker,
+    recent_writes: MemoryRecentWriteMarker,
+    monkeypatch,
+    method: str,
+    path: str,
+    body: dict | None,
+):
+    headers = await _login(client, f"replica-{method.lower()}@example.com")
+    user_id = await _user_id(client, headers)
+    _replica_caught_up(monkeypatch)
+    assert await recent_writes.is_marked(user_id) is False
+
+    response = await client.request(method, path, json=body, headers=headers)
+
+    assert response.status_code == 200
+    assert await recent_writes.is_marked(user_id) is True
+
+
+@pytest.mark.asyncio
+async def test_replica_session_rejects_writes(replica: async_sessionmaker):
+    current_user = CurrentUser(
+        user_id="user-1",
+        email="replica-write@example.com",
+        name="Name",
+        device_id="device-a",
+        token_jti="jti",
+        token_exp=datetime.now(timezone.utc),
+    )
+    sessions = get_read_db(current_user, MemoryRecentWriteMarker(), primary=None)
+    session = await anext(sessions)
+    try:
+        with pytest.raises(OperationalError, match="readonly"):
+            await session.execute(
+                insert(User),
+                [{"id": "user-1", "email": "x@example.com", "hashed_password": "x", "name": "X"}],
+            )
+    finally:
+        await sessions.aclose()
@@ -0,0 +1,99 @@
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.core.config import get_settings
+from app.services import blacklist_cache as blacklist_module
+from app.services.blacklist_cache import BlacklistCache
+from app.services.redis_token_store import RedisTokenStore
+
+settings = get_settings()
+
+
+def test_entries_expire_at_token_expiry():
+    cache = BlacklistCache(redis=AsyncMock())
+    now = time.time()
+    cache.add("live-jti", now + 60)
+    cache.add("expired-jti", now - 1)
+
+    assert cache.contains("live-jti") is True
+    assert cache.contains("expired-jti") is False
+    assert cache.contains("unknown-jti") is False
+    assert len(cache) == 1
+
+
+def test_pubsub_event_is_applied():
+    cache = BlacklistCache(redis=AsyncMock())
+    cache._apply(json.dumps({"jti": "published-jti", "exp": time.time() + 60}))
+    cache._apply("not json")
+
+    assert cache.contains("published-jti") is True
+
+
+@pytest.mark.asyncio
+async def test_token_store_uses_live_cache_without_redis(monkeypatch, mock_redis: AsyncMock):
+    cache = BlacklistCache(redis=mock_redis)
+    cache._live = True
+    cache.add("revoked-jti", time.time() + 60)
+    monkeypatch.setattr(blacklist_module, "blacklist_cache", cache)
+
+    store = RedisTokenStore(mock_redis)
+    assert await store.is_token_blacklisted("revoked-jti") is True
+    assert await store.is_token_blacklisted("other-jti") is False
+    mock_redis.exists.assert_not_called()
+
+    cache._live = False
+    assert await store.is_token_blacklisted("other-jti") is False
+    mock_redis.exists.assert_awaited_once_with("auth:blacklist:other-jti")
+
+
+def test_epoch_keeps_latest_value_and_expires():
+    cache = BlacklistCache(redis=AsyncMock())
+    now = time.time()
+    cache.set_epoch("user-1", now, now + 60)
+    cache.set_epoch("user-1", now - 100, now + 60)
+    cache._apply(json.dumps({"type": "epoch", "scope": "user-2", "epoch": now, "exp": now - 1}))
+
+    assert cache.get_epoch("user-1") == now
+    assert cache.get_epoch("user-2") == 0.0
+    assert cache.get_epoch("unknown") == 0.0
+
+
+@pytest.mark.asyncio
+async def test_epoch_revokes_tokens_issued_before(monkeypatch, mock_redis: AsyncMock):
+    cache = BlacklistCache(redis=mock_redis)
+    cache._live = True
+    monkeypatch.setattr(blacklist_module, "blacklist_cache", cache)
+    store = RedisTokenStore(mock_redis)
+
+    issued = datetime.now(timezone.utc)
+    epoch = await store.revoke_tokens_issued_before("user-1", at=issued + timedelta(seconds=1))
+    mock_redis.pipeline.return_value.set.assert_called_once_with(
+        "auth:epoch:user-1", epoch, ex=settings.jwt_access_token_expire_seconds
+    )
+
+    assert await store.is_access_token_revoked("jti", "user-1", "device-a", issued) is True
+    assert await store.is_access_token_revoked(
+        "jti", "user-1", "device-a", issued + timedelta(seconds=2)
+    ) is False
+    assert await store.is_access_token_revoked("jti", "user-2", "device-a", issued) is False
+
+    await store.revoke_tokens_issued_before("user-2", "device-a", at=issued + timedelta(seconds=1))
+    assert await store.is_access_token_revoked("jti", "user-2", "device-a", issued) is True
+    assert await store.is_access_token_revoked("jti", "user-2", "device-b", issued) is False
+
+
+@pytest.mark.asyncio
+async def test_revocation_check_falls_back_to_one_redis_round_trip(mock_redis: AsyncMock):
+    issued = datetime.now(timezone.utc)
+    pipeline = mock_redis.pipeline.return_value
+    pipeline.execute.return_value = [[str(issued.timestamp() + 1), None], 0]
+
+    store = RedisTokenStore(mock_redis)
+    assert await store.is_access_token_revoked("jti", "user-1", "device-a", issued) is True
+    pipeline.mget.assert_called_once_with("auth:epoch:user-1", "auth:epoch:user-1:device-a")
+    pipeline.exists.assert_called_once_with("auth:blacklist:jti")
+    pipeline.execute.assert_awaited_once()
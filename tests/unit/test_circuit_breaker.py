@@ -0,0 +1,92 @@
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.core import circuit_breaker as breaker_module
+from app.core.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+from app.exceptions.system import TokenStoreUnavailableError
+from app.services import breaker_token_store as guarded_module
+from app.services.breaker_token_store import CircuitBreakerTokenStore
+from app.services.redis_token_store import RedisTokenStore
+
+
+async def _fail() -> None:
+    raise RedisConnectionError("down")
+
+
+async def _ok() -> str:
+    return "ok"
+
+
+@pytest.mark.asyncio
+async def test_breaker_opens_fails_fast_and_recovers(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(breaker_module.time, "monotonic", lambda: now[0])
+    breaker = CircuitBreaker(
+        "test", failure_threshold=2, reset_timeout=10, failure_types=(RedisConnectionError,)
+    )
+
+    for _ in range(2):
+        with pytest.raises(RedisConnectionError):
+            await breaker.call(_fail)
+    assert breaker.state == OPEN
+
+    dependency = AsyncMock()
+    with pytest.raises(CircuitOpenError) as exc_info:
+        await breaker.call(dependency)
+    dependency.assert_not_awaited()
+    assert exc_info.value.retry_after == 10
+
+    now[0] += 10
+    assert breaker.state == HALF_OPEN
+    assert await breaker.call(_ok) == "ok"
+    assert breaker.state == CLOSED
+
+
+@pytest.mark.asyncio
+async def test_failed_trial_reopens(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(breaker_module.time, "monotonic", lambda: now[0])
+    breaker = CircuitBreaker("test_trial", failure_threshold=1, reset_timeout=5)
+
+    with pytest.raises(RedisConnectionError):
+        await breaker.call(_fail)
+    now[0] += 5
+    with pytest.raises(RedisConnectionError):
+        await breaker.call(_fail)
+    assert breaker.state == OPEN
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fail_open", [True, False])
+async def test_revocation_check_fail_open_or_closed(monkeypatch, mock_redis, fail_open):
+    monkeypatch.setattr(guarded_module.settings, "redis_revocation_fail_open", fail_open)
+    mock_redis.pipeline.return_value.execute.side_effect = RedisConnectionError("down")
+    store = CircuitBreakerTokenStore(
+        RedisTokenStore(mock_redis),
+        CircuitBreaker("test_revocation", failure_threshold=5, reset_timeout=10),
+    )
+    issued = datetime.now(timezone.utc)
+
+    if fail_open:
+        assert await store.is_access_token_revoked("jti", "user-1", "device-a", issued) is False
+    else:
+        with pytest.raises(TokenStoreUnavailableError):
+            await store.is_access_token_revoked("jti", "user-1", "device-a", issued)
+
+
+@pytest.mark.asyncio
+async def test_open_breaker_returns_retry_after(mock_redis):
+    breaker = CircuitBreaker("test_store", failure_threshold=1, reset_timeout=7)
+    mock_redis.register_script.return_value.side_effect = RedisConnectionError("down")
+    store = CircuitBreakerTokenStore(RedisTokenStore(mock_redis), breaker)
+
+    with pytest.raises(TokenStoreUnavailableError):
+        await store.delete_all_refresh_tokens("user-1")
+    with pytest.raises(TokenStoreUnavailableError) as exc_info:
+        await store.delete_all_refresh_tokens("user-1")
+    assert exc_info.value.headers["Retry-After"] == "7"
+    assert exc_info.value.error_code == "SYS_005"  # distinct from validation's SYS_004
+    assert mock_redis.register_script.return_value.await_count == 1
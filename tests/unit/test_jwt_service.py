@@ -1,3 +1,5 @@
+import json
+
 import pytest
 
 from app.services.jwt import JWTService
@@ -58,3 +60,179 @@ def test_decode_refresh_as_access_raises_error(jwt_service: JWTService):
     )
     with pytest.raises(InvalidTokenError):
         jwt_service.decode_access_token(refresh_token)
+
+
+def _write_keypair(algorithm: str, private_path, public_path) -> None:
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+    if algorithm == "RS256":
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    elif algorithm == "ES256":
+        private_key = ec.generate_private_key(ec.SECP256R1())
+    else:
+        private_key = ed25519.Ed25519PrivateKey.generate()
+
+    private_path.write_bytes(
+        private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    )
+    public_path.write_bytes(
+        private_key.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+    )
+
+
+@pytest.mark.parametrize("algorithm", ["RS256", "ES256", "EdDSA"])
+def test_supported_algorithms_roundtrip(algorithm: str, tmp_path):
+    private_path = tmp_path / "private.pem"
+    public_path = tmp_path / "public.pem"
+    _write_keypair(algorithm, private_path, public_path)
+
+    service = JWTService(
+        algorithm=algorithm,
+        private_key_path=private_path,
+        public_key_path=public_path,
+    )
+    service.validate_keys()
+    token, jti, _ = service.create_access_token(
+        user_id="test-user-id",
+        email="test@example.com",
+        name="Test User",
+        device_id="test-device-id",
+    )
+    assert service.decode_access_token(token).jti == jti
+
+
+def test_unsupported_algorithm_rejected():
+    with pytest.raises(ValueError):
+        JWTService(algorithm="HS256")
+
+
+def test_key_rotation_keeps_old_tokens_valid(tmp_path):
+    import os
+
+    import jwt
+
+    from app.exceptions.auth import InvalidTokenError
+
+    private_path = tmp_path / "private.pem"
+    public_path = tmp_path / "public.pem"
+    retired_dir = tmp_path / "retired"
+    retired_dir.mkdir()
+    _write_keypair("EdDSA", private_path, public_path)
+
+    service = JWTService(
+        algorithm="EdDSA",
+        private_key_path=private_path,
+        public_key_path=public_path,
+        verification_keys_dir=retired_dir,
+    )
+    old_token, old_jti, _ = service.create_access_token(
+        user_id="u", email="u@example.com", name="U", device_id="d"
+    )
+    old_kid = jwt.get_unverified_header(old_token)["kid"]
+    assert service.reload_keys_if_changed() is False
+
+    # Rotate: retire the current public key, then install a new pair.
+    os.replace(public_path, retired_dir / "old.pem")
+    _write_keypair("EdDSA", private_path, public_path)
+    assert service.reload_keys_if_changed() is True
+
+    new_token, _, _ = service.create_access_token(
+        user_id="u", email="u@example.com", name="U", device_id="d"
+    )
+    assert jwt.get_unverified_header(new_token)["kid"] != old_kid
+    assert service.decode_access_token(old_token).jti == old_jti
+    assert {k["kid"] for k in json.loads(service.keyring.jwks_json)["keys"]} == {
+        old_kid,
+        service.keyring.signing_key.kid,
+    }
+
+    # Dropping the retired key revokes everything it signed.
+    (retired_dir / "old.pem").unlink()
+    assert service.reload_keys_if_changed() is True
+    with pytest.raises(InvalidTokenError):
+        service.decode_access_token(old_token)
+
+
+def test_mismatched_key_pair_rejected(tmp_path):
+    _write_keypair("ES256", tmp_path / "private.pem", tmp_path / "unused.pem")
+    _write_keypair("ES256", tmp_path / "other.pem", tmp_path / "public.pem")
+
+    service = JWTService(
+        algorithm="ES256",
+        private_key_path=tmp_path / "private.pem",
+        public_key_path=tmp_path / "public.pem",
+    )
+    with pytest.raises(ValueError):
+        service.validate_keys()
+
+
+def test_verified_access_token_is_cached(jwt_service: JWTService, monkeypatch):
+    import jwt as pyjwt
+
+    token, jti, _ = jwt_service.create_access_token(
+        user_id="test-user-id",
+        email="test@example.com",
+        name="Test User",
+        device_id="test-device-id",
+    )
+    assert jwt_service.decode_access_token(token).jti == jti
+
+    def fail(*args, **kwargs):
+        raise AssertionError("signature verified twice")
+
+    monkeypatch.setattr(pyjwt, "decode", fail)
+    assert jwt_service.decode_access_token(token).jti == jti
+
+
+def test_verified_token_cache_honours_expiry_and_size():
+    from dataclasses import dataclass
+    from datetime import datetime, timedelta, timezone
+
+    from app.services.token_cache import VerifiedTokenCache
+
+    @dataclass(frozen=True)
+    class Payload:
+        exp: datetime
+
+    now = datetime.now(timezone.utc)
+    cache: VerifiedTokenCache[Payload] = VerifiedTokenCache(max_size=2)
+    cache.put("expired", Payload(exp=now - timedelta(seconds=1)))
+    assert cache.get("expired") is None
+    assert len(cache) == 0
+
+    live = Payload(exp=now + timedelta(minutes=5))
+    cache.put("a", live)
+    cache.put("b", live)
+    assert cache.get("a") is live
+    cache.put("c", live)
+    assert cache.get("b") is None
+    assert cache.get("a") is live
+
+
+@pytest.mark.asyncio
+async def test_async_variants_use_thread_pool():
+    service = JWTService(executor_workers=2)
+    try:
+        access_token, at_jti, _ = await service.create_access_token_async(
+            user_id="test-user-id",
+            email="test@example.com",
+            name="Test User",
+            device_id="test-device-id",
+        )
+        refresh_token, rt_jti, _ = await service.create_refresh_token_async(
+            user_id="test-user-id",
+            device_id="test-device-id",
+        )
+        assert service._executor is not None
+        assert (await service.decode_access_token_async(access_token)).jti == at_jti
+        assert (await service.decode_refresh_token_async(refresh_token)).jti == rt_jti
+    finally:
+        service.close()
@@ -0,0 +1,111 @@
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy import insert, select
+
+from app.models.login_history import LoginHistory
+from app.services.login_history_retention import (
+    LoginHistoryRetention,
+    add_months,
+    partition_definitions,
+    partition_month,
+)
+
+
+def test_monthly_partition_definitions():
+    ddl = partition_definitions(date(2026, 11, 20), date(2027, 1, 1))
+
+    assert ddl == (
+        "PARTITION p202611 VALUES LESS THAN ('2026-12-01'), "
+        "PARTITION p202612 VALUES LESS THAN ('2027-01-01'), "
+        "PARTITION p202701 VALUES LESS THAN ('2027-02-01'), "
+        "PARTITION p_future VALUES LESS THAN (MAXVALUE)"
+    )
+    assert partition_month("p202612") == date(2026, 12, 1)
+    assert partition_month("p_future") is None
+    assert partition_month("p_archive") is None
+    assert partition_month("p202613") is None
+    assert partition_month("pmax") is None
+    assert add_months(date(2026, 12, 1), 1) == date(2027, 1, 1)
+    assert add_months(date(2027, 1, 1), -13) == date(2025, 12, 1)
+
+
+def _partitioned_retention(partitions, oldest=None):
+    conn = MagicMock()
+    conn.dialect.name = "mysql"
+    conn.execute = AsyncMock(return_value=MagicMock(scalar=MagicMock(return_value=oldest)))
+    engine = MagicMock()
+
+    @asynccontextmanager
+    async def begin():
+        yield conn
+
+    engine.begin = begin
+    retention = LoginHistoryRetention(engine)
+    retention._partitions = AsyncMock(return_value=partitions)
+    return retention, conn
+
+
+def _executed_sql(conn):
+    return [str(call.args[0]) for call in conn.execute.await_args_list]
+
+
+@pytest.mark.asyncio
+async def test_ensure_partitions_extends_past_the_last_month():
+    retention, conn = _partitioned_retention(["p202609", "p202610", "p_future"])
+
+    created = await retention.ensure_partitions(months_ahead=1, today=date(2026, 10, 17))
+
+    assert created == ["p202611"]
+    assert _executed_sql(conn) == [
+        "ALTER TABLE login_histories REORGANIZE PARTITION p_future INTO "
+        "(PARTITION p202611 VALUES LESS THAN ('2026-12-01'), "
+        "PARTITION p_future VALUES LESS THAN (MAXVALUE))"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_ensure_partitions_recovers_when_only_p_future_is_left():
+    # every monthly partition was dropped by purge; rows since then sit in p_future
+    retention, conn = _partitioned_retention(["p_future"], oldest=datetime(2026, 9, 3, tzinfo=timezone.utc))
+
+    created = await retention.ensure_partitions(months_ahead=1, today=date(2026, 10, 17))
+
+    assert created == ["p202609", "p202610", "p202611"]
+    assert _executed_sql(conn)[-1] == (
+        "ALTER TABLE login_histories REORGANIZE PARTITION p_future INTO "
+        "(PARTITION p202609 VALUES LESS THAN ('2026-10-01'), "
+        "PARTITION p202610 VALUES LESS THAN ('2026-11-01'), "
+        "PARTITION p202611 VALUES LESS THAN ('2026-12-01'), "
+        "PARTITION p_future VALUES LESS THAN (MAXVALUE))"
+    )
+
+    # an empty table restarts from the current month
+    retention, conn = _partitioned_retention(["p_future"])
+    created = await retention.ensure_partitions(months_ahead=0, today=date(2026, 10, 17))
+    assert created == ["p202610"]
+
+
+@pytest.mark.asyncio
+async def test_purge_deletes_expired_rows_in_batches(db_session):
+    now = datetime.now(timezone.utc)
+    ages = [400, 300, 200, 190, 10, 1]  # days, in insertion order
+    await db_session.execute(
+        insert(LoginHistory),
+        [
+            {"device_id": f"device-{days}", "login_at": now - timedelta(days=days)}
+            for days in ages
+        ],
+    )
+    await db_session.commit()
+
+    retention = LoginHistoryRetention(db_session.bind)
+    assert await retention.ensure_partitions() == []
+    result = await retention.purge(retention_days=180, batch_size=2, now=now)
+
+    assert result.deleted_rows == 4
+    assert result.dropped_partitions == []
+    remaining = (await db_session.execute(select(LoginHistory.device_id))).scalars().all()
+    assert sorted(remaining) == ["device-1", "device-10"]
@@ -0,0 +1,62 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models.login_history import LoginHistory
+from app.repositories.login_history_writer import LoginHistoryWriter
+
+
+def _row(n: int) -> dict:
+    return {
+        "user_id": None,
+        "device_id": f"device-{n}",
+        "ip_address": None,
+        "user_agent": None,
+        "os_type": "iOS",
+        "app_version": None,
+        "login_at": datetime.now(timezone.utc),
+        "login_type": "EMAIL",
+        "success": False,
+        "failure_reason": "INVALID_CREDENTIALS",
+    }
+
+
+async def _count(db_session) -> int:
+    return await db_session.scalar(select(func.count()).select_from(LoginHistory))
+
+
+@pytest.mark.asyncio
+async def test_writes_full_batches_and_flushes_the_rest_on_close(db_session):
+    writer = LoginHistoryWriter(db_session.bind, batch_size=2, flush_interval=60)
+    writer.start()
+    for n in range(3):
+        assert writer.submit(_row(n)) is True
+
+    await asyncio.sleep(0.1)
+    assert await _count(db_session) == 2
+
+    await writer.close()
+    assert await _count(db_session) == 3
+
+
+@pytest.mark.asyncio
+async def test_writes_partial_batch_after_interval(db_session):
+    writer = LoginHistoryWriter(db_session.bind, batch_size=100, flush_interval=0.05)
+    writer.start()
+    writer.submit(_row(0))
+
+    await asyncio.sleep(0.2)
+    assert await _count(db_session) == 1
+    await writer.close()
+
+
+@pytest.mark.asyncio
+async def test_full_queue_hands_the_row_back(db_session):
+    writer = LoginHistoryWriter(db_session.bind, queue_size=1)
+
+    assert writer.submit(_row(0)) is True
+    assert writer.submit(_row(1)) is False
+    await writer.close()
+    assert await _count(db_session) == 1
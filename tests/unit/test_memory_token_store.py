@@ -0,0 +1,143 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.services import memory_token_store as memory_module
+from app.services.memory_token_store import MemoryTokenStore
+from app.services.token_store import RotationResult
+
+
+async def _store(store: MemoryTokenStore, device_id: str, token_id: str, seconds: int) -> list[str]:
+    return await store.store_refresh_token(
+        user_id="user-1",
+        device_id=device_id,
+        token_id=token_id,
+        device_name="Pixel",
+        os_type="Android",
+        app_version="1.0.0",
+        ip_address=None,
+        expires_at=datetime.now(timezone.utc) + timedelta(seconds=seconds),
+    )
+
+
+@pytest.mark.asyncio
+async def test_sessions_expire_by_ttl(monkeypatch):
+    store = MemoryTokenStore()
+    await _store(store, "device-a", "jti-a", 60)
+    await _store(store, "device-b", "jti-b", 3600)
+    assert (await store.get_refresh_token("user-1", "device-a"))["token_id"] == "jti-a"
+
+    now = datetime.now(timezone.utc).timestamp()
+    monkeypatch.setattr(memory_module.time, "time", lambda: now + 120)
+
+    assert await store.get_refresh_token("user-1", "device-a") is None
+    assert await store.get_active_device_ids("user-1") == {"device-b"}
+    assert await store.delete_all_refresh_tokens("user-1") == 1
+
+
+@pytest.mark.asyncio
+async def test_session_cap_evicts_least_recently_refreshed(monkeypatch):
+    monkeypatch.setattr(memory_module.settings, "max_sessions_per_user", 2)
+    store = MemoryTokenStore()
+    assert await _store(store, "device-a", "jti-a", 100) == []
+    assert await _store(store, "device-b", "jti-b", 200) == []
+    assert await _store(store, "device-c", "jti-c", 300) == ["device-a"]
+    assert await store.get_active_device_ids("user-1") == {"device-b", "device-c"}
+
+
+@pytest.mark.asyncio
+async def test_rotation_detects_reuse():
+    store = MemoryTokenStore()
+    await _store(store, "device-a", "jti-1", 3600)
+    expires_at = datetime.now(timezone.utc) + timedelta(days=30)
+    rotate = {
+        "user_id": "user-1",
+        "device_id": "device-a",
+        "device_name": None,
+        "os_type": None,
+        "app_version": None,
+        "ip_address": None,
+        "expires_at": expires_at,
+    }
+
+    assert await store.rotate_refresh_token(
+        old_token_id="jti-1", new_token_id="jti-2", **rotate
+    ) is RotationResult.OK
+    assert await store.rotate_refresh_token(
+        old_token_id="jti-1", new_token_id="jti-3", **rotate
+    ) is RotationResult.REUSED
+    assert await store.rotate_refresh_token(
+        old_token_id="jti-2", new_token_id="jti-4", **rotate
+    ) is RotationResult.NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_rotation_grace_window(monkeypatch):
+    monkeypatch.setattr(memory_module.settings, "refresh_grace_seconds", 5)
+    store = MemoryTokenStore()
+    await _store(store, "device-a", "jti-1", 3600)
+    rotate = {
+        "user_id": "user-1",
+        "device_id": "device-a",
+        "device_name": None,
+        "os_type": None,
+        "app_version": None,
+        "ip_address": None,
+        "expires_at": datetime.now(timezone.utc) + timedelta(days=30),
+    }
+    response = {"access_token": "at-2", "refresh_token": "rt-2"}
+
+    assert await store.rotate_refresh_token(
+        old_token_id="jti-1", new_token_id="jti-2", grace_response=response, **rotate
+    ) is RotationResult.OK
+    assert await store.rotate_refresh_token(
+        old_token_id="jti-1", new_token_id="jti-3", **rotate
+    ) is RotationResult.GRACE
+    assert await store.get_rotation_grace("user-1", "device-a", "jti-1") == response
+
+    now = datetime.now(timezone.utc).timestamp()
+    monkeypatch.setattr(memory_module.time, "time", lambda: now + 6)
+
+    assert await store.get_rotation_grace("user-1", "device-a", "jti-1") is None
+    assert await store.rotate_refresh_token(
+        old_token_id="jti-1", new_token_id="jti-3", **rotate
+    ) is RotationResult.REUSED
+
+
+@pytest.mark.asyncio
+async def test_epochs_and_blacklist():
+    store = MemoryTokenStore()
+    issued = datetime.now(timezone.utc)
+    await store.revoke_tokens_issued_before("user-1", "device-a", at=issued + timedelta(seconds=1))
+    await store.blacklist_token("jti-x", "user-2", "device-a", "logout", ttl_seconds=60)
+
+    assert await store.is_access_token_revoked("jti", "user-1", "device-a", issued) is True
+    assert await store.is_access_token_revoked("jti", "user-1", "device-b", issued) is False
+    assert await store.is_access_token_revoked("jti-x", "user-2", "device-a", issued) is True
+
+
+@pytest.mark.asyncio
+async def test_heap_stays_bounded_across_rotations():
+    store = MemoryTokenStore()
+    expires_at = datetime.now(timezone.utc) + timedelta(days=30)
+    for user in range(10):
+        await _store(store, "device-a", "jti-0", 3600)
+        for n in range(500):
+            await store.rotate_refresh_token(
+                user_id="user-1",
+                device_id="device-a",
+                old_token_id=f"jti-{n}",
+                new_token_id=f"jti-{n + 1}",
+                device_name=None,
+                os_type=None,
+                app_version=None,
+                ip_address=None,
+                expires_at=expires_at,
+            )
+            await store.set_user_claims(f"user-{user}", {"email": "", "name": "", "status": ""})
+        await store.delete_all_refresh_tokens("user-1")
+
+    # 15,000 writes, a handful of live keys
+    assert len(store._heap) <= memory_module._MIN_HEAP_LIMIT
+    await _store(store, "device-a", "jti-live", 60)
+    assert (await store.get_refresh_token("user-1", "device-a"))["token_id"] == "jti-live"
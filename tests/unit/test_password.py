@@ -1,3 +1,5 @@
+import pytest
+
 from app.core.security import hash_password, verify_password
 
 
@@ -15,3 +17,75 @@ def test_verify_password_correct():
 def test_verify_password_incorrect():
     hashed = hash_password("TestPass123!")
     assert verify_password("WrongPass456!", hashed) is False
+
+
+@pytest.mark.asyncio
+async def test_async_hash_and_verify():
+    from app.core.security import hash_password_async, verify_password_async
+
+    hashed = await hash_password_async("TestPass123!")
+    assert hashed.startswith("$2b$")
+    assert await verify_password_async("TestPass123!", hashed) is True
+    assert await verify_password_async("WrongPass456!", hashed) is False
+
+
+@pytest.mark.asyncio
+async def test_process_pool_runs_jobs():
+    from app.core.hash_pool import PasswordHashPool
+
+    pool = PasswordHashPool(workers=1, queue_size=2)
+    # never fork the (multi-threaded) server process
+    assert pool._executor._mp_context.get_start_method() in ("forkserver", "spawn")
+    try:
+        hashed = await pool.run(hash_password, "TestPass123!")
+        assert await pool.run(verify_password, "TestPass123!", hashed) is True
+    finally:
+        pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_pool_rejects_when_queue_full():
+    import asyncio
+    import time
+
+    from app.core.hash_pool import PasswordHashPool
+    from app.exceptions.system import ServerBusyError
+
+    pool = PasswordHashPool(workers=0, queue_size=1, max_in_flight=1)
+    running = asyncio.create_task(pool.run(time.sleep, 0.2))
+    queued = asyncio.create_task(pool.run(time.sleep, 0))
+    await asyncio.sleep(0.01)
+    assert pool.queue_depth == 1
+
+    with pytest.raises(ServerBusyError) as exc_info:
+        await pool.run(time.sleep, 0)
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.headers == {"Retry-After": "1"}
+
+    await asyncio.gather(running, queued)
+
+
+def test_argon2id_hasher_roundtrip():
+    from app.core.hashers import Argon2idHasher
+
+    hasher = Argon2idHasher(time_cost=1, memory_cost=1024, parallelism=1)
+    hashed = hasher.hash("TestPass123!")
+    assert hashed.startswith("$argon2id$")
+    assert hasher.verify("TestPass123!", hashed) is True
+    assert hasher.verify("WrongPass456!", hashed) is False
+    assert hasher.needs_rehash(hashed) is False
+    assert Argon2idHasher(time_cost=2, memory_cost=1024, parallelism=1).needs_rehash(hashed)
+
+
+def test_verify_password_accepts_other_registered_schemes():
+    from app.core.hashers import BcryptHasher
+    from app.core.security import password_needs_rehash
+
+    legacy = BcryptHasher(rounds=4).hash("TestPass123!")
+    assert verify_password("TestPass123!", legacy) is True
+    assert password_needs_rehash(legacy) is True
+    assert password_needs_rehash(hash_password("TestPass123!")) is False
+
+
+def test_verify_password_rejects_unknown_hash():
+    assert verify_password("TestPass123!", "not-a-hash") is False
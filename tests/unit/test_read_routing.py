@@ -0,0 +1,45 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from app.services import read_routing as read_routing_module
+from app.services.read_routing import MemoryRecentWriteMarker, RedisRecentWriteMarker
+from app.services.redis_keys import LEGACY_KEYS, TAGGED_KEYS
+
+
+@pytest.mark.asyncio
+async def test_memory_marker_expires(monkeypatch):
+    marker = MemoryRecentWriteMarker()
+    assert await marker.is_marked("user-1") is False
+    await marker.mark("user-1", 5)
+    assert await marker.is_marked("user-1") is True
+    assert await marker.is_marked("user-2") is False
+
+    now = datetime.now(timezone.utc).timestamp()
+    monkeypatch.setattr(read_routing_module.time, "time", lambda: now + 6)
+    assert await marker.is_marked("user-1") is False
+
+
+@pytest.mark.asyncio
+async def test_memory_marker_sweeps_expired_users(monkeypatch):
+    marker = MemoryRecentWriteMarker()
+    now = datetime.now(timezone.utc).timestamp()
+    for n in range(5 * read_routing_module._MIN_SWEEP_AT):
+        monkeypatch.setattr(read_routing_module.time, "time", lambda n=n: now + n * 10)
+        await marker.mark(f"user-{n}", 5)
+
+    # users that never read again do not pile up
+    assert len(marker._expires_at) <= read_routing_module._MIN_SWEEP_AT + 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("keys", [LEGACY_KEYS, TAGGED_KEYS], ids=["legacy", "tagged"])
+async def test_redis_marker_sets_an_expiring_key(fake_redis, keys):
+    marker = RedisRecentWriteMarker(fake_redis, keys=keys)
+    assert await marker.is_marked("user-1") is False
+
+    await marker.mark("user-1", 5)
+
+    assert await marker.is_marked("user-1") is True
+    assert await marker.is_marked("user-2") is False
+    assert 0 < await fake_redis.pttl(keys.recent_write("user-1")) <= 5000
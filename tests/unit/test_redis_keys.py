@@ -0,0 +1,81 @@
+from unittest.mock import MagicMock
+
+import pytest
+from redis.asyncio.cluster import RedisCluster
+from redis.crc import key_slot
+
+from app.services.redis_keys import LEGACY_KEYS, TAGGED_KEYS, epoch_scope
+from app.services.redis_token_store import RedisTokenStore
+
+
+def _slots(keys) -> set[int]:
+    return {
+        key_slot(k.encode())
+        for k in (
+            keys.refresh_token("user-1", "device-a"),
+            keys.refresh_token("user-1", "device-b"),
+            keys.devices("user-1"),
+            keys.sessions("user-1"),
+            keys.epoch("user-1"),
+            keys.epoch("user-1", "device-a"),
+            keys.recent_write("user-1"),
+        )
+    }
+
+
+def test_tagged_keys_of_one_user_share_a_slot():
+    assert len(_slots(TAGGED_KEYS)) == 1
+    assert len(_slots(LEGACY_KEYS)) > 1
+    assert LEGACY_KEYS.refresh_token("user-1", "device-a") == "auth:rt:user-1:device-a"
+    assert TAGGED_KEYS.refresh_token("user-1", "device-a") == "auth:{user-1}:rt:device-a"
+
+
+def test_epoch_scope_parses_both_schemes():
+    for keys in (LEGACY_KEYS, TAGGED_KEYS):
+        assert epoch_scope(keys.epoch("user-1")) == "user-1"
+        assert epoch_scope(keys.epoch("user-1", "device-a")) == "user-1:device-a"
+    assert epoch_scope("auth:blacklist:jti") is None
+
+
+@pytest.mark.asyncio
+async def test_legacy_fallback_migrates_before_session_operations(mock_redis):
+    store = RedisTokenStore(mock_redis, keys=TAGGED_KEYS, legacy_fallback=True)
+    await store.delete_all_refresh_tokens("user-1")
+
+    script = mock_redis.register_script.return_value
+    migrate, index = script.await_args_list
+    assert migrate.kwargs["keys"] == [
+        "auth:devices:user-1",
+        "auth:{user-1}:devices",
+        "auth:sessions:user-1",
+        "auth:{user-1}:sessions",
+    ]
+    assert index.kwargs["keys"][1] == "auth:{user-1}:devices"
+    assert index.kwargs["args"][0] == "auth:{user-1}:rt:"
+
+
+@pytest.mark.asyncio
+async def test_no_migration_without_fallback(mock_redis):
+    await RedisTokenStore(mock_redis, keys=TAGGED_KEYS).delete_all_refresh_tokens("user-1")
+    assert mock_redis.register_script.return_value.await_count == 1
+
+
+@pytest.mark.parametrize("device_id", ["device-a", "{device}", "dev}ice", ""])
+def test_script_derived_keys_share_the_declared_slot(device_id):
+    # The index scripts declare the device index (and the device's own session)
+    # in KEYS but build other devices' session keys from the ARGV prefix.
+    declared = key_slot(TAGGED_KEYS.devices("user-1").encode())
+    derived = TAGGED_KEYS.refresh_token_prefix("user-1") + device_id
+    assert key_slot(derived.encode()) == declared
+    assert key_slot(TAGGED_KEYS.rotation_grace("user-1", "jti").encode()) == declared
+    assert key_slot(TAGGED_KEYS.claims("user-1").encode()) == declared
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{"keys": LEGACY_KEYS}, {"keys": TAGGED_KEYS, "legacy_fallback": True}]
+)
+def test_cluster_client_requires_single_slot_keys(kwargs):
+    cluster = MagicMock(spec=RedisCluster)
+    with pytest.raises(ValueError):
+        RedisTokenStore(cluster, **kwargs)
+    assert RedisTokenStore(cluster, keys=TAGGED_KEYS).keys is TAGGED_KEYS
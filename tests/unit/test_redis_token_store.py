@@ -0,0 +1,140 @@
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.services.redis_token_store import (
+    RedisHashTokenStore,
+    RedisTokenStore,
+    decode_session,
+    encode_session,
+)
+from app.services.token_store import RotationResult
+
+
+def test_session_record_round_trip_is_compact():
+    data = encode_session("jti-1", 100, 200, "iPhone", "iOS", "1.0.0", "10.0.0.1")
+    record = decode_session("user-1", "device-a", data)
+
+    assert record["token_id"] == "jti-1"
+    assert record["user_id"] == "user-1"
+    assert record["device_id"] == "device-a"
+    assert record["expires_at"] == 200
+    assert "device_name" not in data
+
+
+@pytest.mark.asyncio
+async def test_expired_session_reads_as_missing(mock_redis: AsyncMock):
+    mock_redis.hget = AsyncMock(
+        return_value=encode_session("jti-1", 0, int(time.time()) - 1, None, None, None, None)
+    )
+    store = RedisHashTokenStore(mock_redis)
+
+    assert await store.get_refresh_token("user-1", "device-a") is None
+    mock_redis.hdel.assert_awaited_once_with("auth:sessions:user-1", "device-a")
+
+
+@pytest.mark.asyncio
+async def test_dual_read_falls_back_to_legacy_key(mock_redis: AsyncMock):
+    mock_redis.hget = AsyncMock(return_value=None)
+    mock_redis.get = AsyncMock(return_value=json.dumps({"token_id": "legacy-jti"}))
+
+    assert await RedisHashTokenStore(mock_redis).get_refresh_token("user-1", "device-a") is None
+    stored = await RedisHashTokenStore(mock_redis, dual_read=True).get_refresh_token(
+        "user-1", "device-a"
+    )
+    assert stored == {"token_id": "legacy-jti"}
+    mock_redis.get.assert_awaited_once_with("auth:rt:user-1:device-a")
+
+
+@pytest.mark.asyncio
+async def test_logout_all_is_one_transaction(mock_redis: AsyncMock):
+    pipeline = mock_redis.pipeline.return_value
+    pipeline.execute.return_value = [3, 1]
+
+    assert await RedisHashTokenStore(mock_redis).delete_all_refresh_tokens("user-1") == 3
+    pipeline.hlen.assert_called_once_with("auth:sessions:user-1")
+    pipeline.delete.assert_called_once_with("auth:sessions:user-1")
+    mock_redis.smembers.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_rotation_passes_dual_read_flag(mock_redis: AsyncMock):
+    store = RedisHashTokenStore(mock_redis, dual_read=True)
+    result = await store.rotate_refresh_token(
+        user_id="user-1",
+        device_id="device-a",
+        old_token_id="old-jti",
+        new_token_id="new-jti",
+        device_name=None,
+        os_type=None,
+        app_version=None,
+        ip_address=None,
+        expires_at=datetime.now(timezone.utc) + timedelta(days=30),
+    )
+
+    assert result is RotationResult.OK
+    call = mock_redis.register_script.return_value.await_args.kwargs
+    assert call["keys"][0] == "auth:sessions:user-1"
+    assert call["args"][0] == "old-jti"
+    assert json.loads(call["args"][1])[0] == "new-jti"
+    assert call["args"][5] == "1"
+
+
+@pytest.mark.asyncio
+async def test_rotation_grace_requires_the_rotated_token_to_be_current(mock_redis: AsyncMock):
+    pipeline = mock_redis.pipeline.return_value
+    grace = json.dumps({"token_id": "new-jti", "response": {"refresh_token": "rt"}})
+    store = RedisTokenStore(mock_redis)
+
+    pipeline.execute.return_value = [grace, json.dumps({"token_id": "new-jti"})]
+    assert await store.get_rotation_grace("user-1", "device-a", "old-jti") == {
+        "refresh_token": "rt"
+    }
+    pipeline.get.assert_any_call("auth:rt_grace:user-1:old-jti")
+
+    # rotated again since: a repeat of old-jti is reuse, not a retry
+    pipeline.execute.return_value = [grace, json.dumps({"token_id": "newer-jti"})]
+    assert await store.get_rotation_grace("user-1", "device-a", "old-jti") is None
+
+
+@pytest.mark.asyncio
+async def test_store_returns_devices_evicted_by_session_cap(monkeypatch, mock_redis: AsyncMock):
+    from app.services import redis_token_store as token_store_module
+
+    monkeypatch.setattr(token_store_module.settings, "max_sessions_per_user", 2)
+    mock_redis.register_script.return_value.return_value = ["device-old"]
+
+    evicted = await RedisTokenStore(mock_redis).store_refresh_token(
+        user_id="user-1",
+        device_id="device-new",
+        token_id="jti",
+        device_name=None,
+        os_type=None,
+        app_version=None,
+        ip_address=None,
+        expires_at=datetime.now(timezone.utc) + timedelta(days=30),
+    )
+
+    assert evicted == ["device-old"]
+    call = mock_redis.register_script.return_value.await_args.kwargs
+    assert call["keys"] == ["auth:rt:user-1:device-new", "auth:devices:user-1"]
+    assert call["args"][0] == "auth:rt:user-1:"
+    assert call["args"][-1] == 2
+
+
+@pytest.mark.asyncio
+async def test_scripts_are_registered_once(mock_redis: AsyncMock):
+    from app.services import redis_token_store as token_store_module
+
+    first = token_store_module.create_redis_token_store(mock_redis)
+    registered = mock_redis.register_script.call_count
+    for _ in range(3):
+        store = token_store_module.create_redis_token_store(mock_redis)
+        await store.delete_all_refresh_tokens("user-1")
+        await store.delete_refresh_token("user-1", "device-a")
+
+    assert store is first
+    assert mock_redis.register_script.call_count == registered
@@ -0,0 +1,271 @@
+"""Token store Lua scripts run against fakeredis (the other Redis tests mock them out)."""
+import json
+import time
+from datetime import datetime, timedelta, timezone
+
+import fakeredis
+import pytest
+
+from app.services import redis_token_store as token_store_module
+from app.services.redis_keys import TAGGED_KEYS
+from app.services.redis_token_store import RedisHashTokenStore, RedisTokenStore, encode_session
+from app.services.token_store import RotationResult
+
+
+async def _store(store: RedisTokenStore, device_id: str, token_id: str, days: int = 30) -> list:
+    return await store.store_refresh_token(
+        user_id="user-1",
+        device_id=device_id,
+        token_id=token_id,
+        device_name="Pixel",
+        os_type="Android",
+        app_version="1.0.0",
+        ip_address="203.0.113.10",
+        expires_at=datetime.now(timezone.utc) + timedelta(days=days),
+    )
+
+
+async def _rotate(
+    store: RedisTokenStore, old: str, new: str, grace_response: dict | None = None
+) -> RotationResult:
+    return await store.rotate_refresh_token(
+        user_id="user-1",
+        device_id="device-a",
+        old_token_id=old,
+        new_token_id=new,
+        device_name="Pixel",
+        os_type="Android",
+        app_version="1.0.1",
+        ip_address="203.0.113.10",
+        expires_at=datetime.now(timezone.utc) + timedelta(days=30),
+        grace_response=grace_response,
+    )
+
+
+@pytest.mark.asyncio
+async def test_store_indexes_session(fake_redis: fakeredis.FakeAsyncRedis):
+    store = RedisTokenStore(fake_redis)
+    assert await _store(store, "device-a", "jti-a") == []
+
+    assert (await store.get_refresh_token("user-1", "device-a"))["token_id"] == "jti-a"
+    assert await store.get_active_device_ids("user-1") == {"device-a"}
+    assert await fake_redis.type("auth:devices:user-1") == "zset"
+    assert await fake_redis.ttl("auth:devices:user-1") > 29 * 24 * 3600
+
+
+@pytest.mark.asyncio
+async def test_rotation_swaps_token_and_detects_reuse(fake_redis: fakeredis.FakeAsyncRedis):
+    store = RedisTokenStore(fake_redis)
+    await _store(store, "device-a", "jti-1")
+
+    assert await _rotate(store, "jti-1", "jti-2") is RotationResult.OK
+    stored = await store.get_refresh_token("user-1", "device-a")
+    assert stored["token_id"] == "jti-2"
+    assert stored["app_version"] == "1.0.1"
+
+    # no grace record: presenting jti-1 again revokes the session
+    assert await _rotate(store, "jti-1", "jti-3") is RotationResult.REUSED
+    assert await store.get_refresh_token("user-1", "device-a") is None
+    assert await store.get_active_device_ids("user-1") == set()
+    assert await _rotate(store, "jti-2", "jti-4") is RotationResult.NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_rotation_grace_window(monkeypatch, fake_redis: fakeredis.FakeAsyncRedis):
+    monkeypatch.setattr(token_store_module.settings, "refresh_grace_seconds", 5)
+    store = RedisTokenStore(fake_redis)
+    await _store(store, "device-a", "jti-1")
+
+    response = {"refresh_token": "rt-2"}
+    assert await _rotate(store, "jti-1", "jti-2", response) is RotationResult.OK
+    assert 0 < await fake_redis.pttl("auth:rt_grace:user-1:jti-1") <= 5000
+
+    assert await _rotate(store, "jti-1", "jti-x") is RotationResult.GRACE
+    assert await store.get_rotation_grace("user-1", "device-a", "jti-1") == response
+    assert (await store.get_refresh_token("user-1", "device-a"))["token_id"] == "jti-2"
+
+    # once the session moves on, the old token is reuse again
+    assert await _rotate(store, "jti-2", "jti-3") is RotationResult.OK
+    assert await store.get_rotation_grace("user-1", "device-a", "jti-1") is None
+    assert await _rotate(store, "jti-1", "jti-y") is RotationResult.REUSED
+    assert await store.get_refresh_token("user-1", "device-a") is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("store_class", [RedisTokenStore, RedisHashTokenStore])
+async def test_refresh_state_reads_claims_and_grace_together(
+    monkeypatch, fake_redis: fakeredis.FakeAsyncRedis, store_class
+):
+    monkeypatch.setattr(token_store_module.settings, "refresh_grace_seconds", 5)
+    store = store_class(fake_redis)
+    claims = {"email": "u@example.com", "name": "U", "status": "ACTIVE"}
+    await store.set_user_claims("user-1", claims)
+    await _store(store, "device-a", "jti-1")
+
+    assert await store.get_refresh_state("user-1", "device-a", "jti-1") == (claims, None)
+    await _rotate(store, "jti-1", "jti-2", {"refresh_token": "rt-2"})
+    assert await store.get_refresh_state("user-1", "device-a", "jti-1") == (
+        claims,
+        {"refresh_token": "rt-2"},
+    )
+    await _rotate(store, "jti-2", "jti-3")
+    assert await store.get_refresh_state("user-1", "device-a", "jti-1") == (claims, None)
+
+
+@pytest.mark.asyncio
+async def test_session_cap_evicts_earliest_expiry(
+    monkeypatch, fake_redis: fakeredis.FakeAsyncRedis
+):
+    monkeypatch.setattr(token_store_module.settings, "max_sessions_per_user", 2)
+    store = RedisTokenStore(fake_redis)
+    assert await _store(store, "device-a", "jti-a", days=10) == []
+    assert await _store(store, "device-b", "jti-b", days=20) == []
+    assert await _store(store, "device-c", "jti-c", days=30) == ["device-a"]
+
+    assert await store.get_active_device_ids("user-1") == {"device-b", "device-c"}
+    assert await fake_redis.exists("auth:rt:user-1:device-a") == 0
+    # re-storing an existing device does not count against the cap
+    assert await _store(store, "device-b", "jti-b2", days=40) == []
+
+
+@pytest.mark.asyncio
+async def test_delete_and_delete_all(fake_redis: fakeredis.FakeAsyncRedis):
+    store = RedisTokenStore(fake_redis)
+    for device_id in ("device-a", "device-b", "device-c"):
+        await _store(store, device_id, f"jti-{device_id}")
+
+    await store.delete_refresh_token("user-1", "device-a")
+    assert await store.get_active_device_ids("user-1") == {"device-b", "device-c"}
+    assert await store.delete_all_refresh_tokens("user-1") == 2
+    assert await fake_redis.keys("auth:*") == []
+
+
+@pytest.mark.asyncio
+async def test_plain_set_index_is_converted(fake_redis: fakeredis.FakeAsyncRedis):
+    record = json.dumps({"token_id": "jti-a"})
+    await fake_redis.set("auth:rt:user-1:device-a", record, ex=3600)
+    await fake_redis.sadd("auth:devices:user-1", "device-a", "device-gone")
+
+    store = RedisTokenStore(fake_redis)
+    assert await store.get_active_device_ids("user-1") == {"device-a"}
+    assert await fake_redis.type("auth:devices:user-1") == "zset"
+    score = await fake_redis.zscore("auth:devices:user-1", "device-a")
+    assert time.time() + 3500 < score <= time.time() + 3600
+
+
+@pytest.mark.asyncio
+async def test_migrate_legacy_keys(fake_redis: fakeredis.FakeAsyncRedis):
+    await _store(RedisTokenStore(fake_redis), "device-a", "jti-a")
+    store = RedisTokenStore(fake_redis, keys=TAGGED_KEYS, legacy_fallback=True)
+
+    assert (await store.get_refresh_token("user-1", "device-a"))["token_id"] == "jti-a"
+    assert await fake_redis.exists("auth:rt:user-1:device-a", "auth:devices:user-1") == 0
+    assert await fake_redis.exists("auth:{user-1}:rt:device-a") == 1
+    assert await store.migrate_legacy_keys("user-1") == 0
+
+
+@pytest.mark.asyncio
+async def test_hash_store_sweeps_expired_fields(fake_redis: fakeredis.FakeAsyncRedis):
+    expired = encode_session("jti-old", 0, int(time.time()) - 1, None, None, None, None)
+    await fake_redis.hset("auth:sessions:user-1", "device-old", expired)
+    store = RedisHashTokenStore(fake_redis)
+
+    assert await _store(store, "device-a", "jti-a") == []
+    sessions = await fake_redis.hgetall("auth:sessions:user-1")
+    assert list(sessions) == ["device-a"]
+    assert json.loads(sessions["device-a"])[0] == "jti-a"
+    assert (await store.get_refresh_token("user-1", "device-a"))["device_name"] == "Pixel"
+    assert await fake_redis.ttl("auth:sessions:user-1") > 29 * 24 * 3600
+
+
+@pytest.mark.asyncio
+async def test_hash_session_cap(monkeypatch, fake_redis: fakeredis.FakeAsyncRedis):
+    monkeypatch.setattr(token_store_module.settings, "max_sessions_per_user", 2)
+    store = RedisHashTokenStore(fake_redis)
+    await _store(store, "device-a", "jti-a", days=10)
+    await _store(store, "device-b", "jti-b", days=20)
+
+    assert await _store(store, "device-c", "jti-c", days=30) == ["device-a"]
+    assert await store.get_active_device_ids("user-1") == {"device-b", "device-c"}
+    assert await store.delete_all_refresh_tokens("user-1") == 2
+    assert await fake_redis.exists("auth:sessions:user-1") == 0
+
+
+@pytest.mark.asyncio
+async def test_hash_rotation(monkeypatch, fake_redis: fakeredis.FakeAsyncRedis):
+    monkeypatch.setattr(token_store_module.settings, "refresh_grace_seconds", 5)
+    store = RedisHashTokenStore(fake_redis)
+    await _store(store, "device-a", "jti-1")
+
+    assert await _rotate(store, "jti-1", "jti-2", {"refresh_token": "rt-2"}) is RotationResult.OK
+    assert (await store.get_refresh_token("user-1", "device-a"))["token_id"] == "jti-2"
+    assert await _rotate(store, "jti-1", "jti-x") is RotationResult.GRACE
+    assert await store.get_rotation_grace("user-1", "device-a", "jti-1") == {
+        "refresh_token": "rt-2"
+    }
+
+    assert await _rotate(store, "jti-2", "jti-3") is RotationResult.OK
+    assert await _rotate(store, "jti-2", "jti-y") is RotationResult.REUSED
+    assert await fake_redis.hexists("auth:sessions:user-1", "device-a") == 0
+    assert await _rotate(store, "jti-3", "jti-4") is RotationResult.NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_hash_rotation_of_expired_session(fake_redis: fakeredis.FakeAsyncRedis):
+    expired = encode_session("jti-1", 0, int(time.time()) - 1, None, None, None, None)
+    await fake_redis.hset("auth:sessions:user-1", "device-a", expired)
+    store = RedisHashTokenStore(fake_redis)
+
+    assert await store.get_refresh_token("user-1", "device-a") is None
+    await fake_redis.hset("auth:sessions:user-1", "device-a", expired)
+    assert await _rotate(store, "jti-1", "jti-2") is RotationResult.NOT_FOUND
+    assert await fake_redis.hexists("auth:sessions:user-1", "device-a") == 0
+
+
+@pytest.mark.asyncio
+async def test_hash_dual_read_moves_legacy_session(fake_redis: fakeredis.FakeAsyncRedis):
+    await _store(RedisTokenStore(fake_redis), "device-a", "jti-1")
+    store = RedisHashTokenStore(fake_redis, dual_read=True)
+    assert await store.get_active_device_ids("user-1") == {"device-a"}
+
+    assert await _rotate(store, "jti-1", "jti-2") is RotationResult.OK
+    assert await fake_redis.exists("auth:rt:user-1:device-a") == 0
+    assert await fake_redis.zcard("auth:devices:user-1") == 0
+    assert json.loads(await fake_redis.hget("auth:sessions:user-1", "device-a"))[0] == "jti-2"
+    assert await RedisHashTokenStore(fake_redis).get_active_device_ids("user-1") == {"device-a"}
+
+
+@pytest.mark.asyncio
+async def test_hash_dual_read_grace_keeps_legacy_session(
+    monkeypatch, fake_redis: fakeredis.FakeAsyncRedis
+):
+    monkeypatch.setattr(token_store_module.settings, "refresh_grace_seconds", 5)
+    # rotated by an instance still on the flat layout, which left a grace record
+    legacy_store = RedisTokenStore(fake_redis)
+    await _store(legacy_store, "device-a", "jti-1")
+    assert await _rotate(legacy_store, "jti-1", "jti-2", {"refresh_token": "rt-2"}) is (
+        RotationResult.OK
+    )
+    store = RedisHashTokenStore(fake_redis, dual_read=True)
+
+    # the retried rotation is a duplicate: the legacy session stays where it is
+    assert await _rotate(store, "jti-1", "jti-x") is RotationResult.GRACE
+    assert json.loads(await fake_redis.get("auth:rt:user-1:device-a"))["token_id"] == "jti-2"
+    assert await fake_redis.zscore("auth:devices:user-1", "device-a") is not None
+    assert await store.get_active_device_ids("user-1") == {"device-a"}
+
+    # and still moves into the hash on its next real rotation
+    assert await _rotate(store, "jti-2", "jti-3") is RotationResult.OK
+    assert await fake_redis.exists("auth:rt:user-1:device-a") == 0
+    assert json.loads(await fake_redis.hget("auth:sessions:user-1", "device-a"))[0] == "jti-3"
+
+
+@pytest.mark.asyncio
+async def test_hash_dual_read_reuse_revokes_legacy_session(fake_redis: fakeredis.FakeAsyncRedis):
+    await _store(RedisTokenStore(fake_redis), "device-a", "jti-2")
+    store = RedisHashTokenStore(fake_redis, dual_read=True)
+
+    assert await _rotate(store, "jti-1", "jti-x") is RotationResult.REUSED
+    assert await fake_redis.exists("auth:rt:user-1:device-a") == 0
+    assert await fake_redis.zcard("auth:devices:user-1") == 0
+    assert await fake_redis.hexists("auth:sessions:user-1", "device-a") == 0
@@ -0,0 +1,92 @@
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+
+from app.models.user import User
+from app.repositories.user_device import UserDeviceRepository, upsert_device_statement
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("dialect", "clause"),
+    [
+        (sqlite.dialect(), "ON CONFLICT (user_id, device_id) DO UPDATE SET"),
+        (postgresql.dialect(), "ON CONFLICT (user_id, device_id) DO UPDATE SET"),
+        (mysql.dialect(), "ON DUPLICATE KEY UPDATE"),
+    ],
+    ids=["sqlite", "postgresql", "mysql"],
+)
+async def test_upsert_device_is_one_native_statement(dialect, clause):
+    session = MagicMock()
+    session.get_bind.return_value.dialect = dialect
+    session.execute = AsyncMock()
+
+    await UserDeviceRepository(session).upsert_device(
+        user_id="user-1",
+        device_id="device-a",
+        device_name=None,
+        os_type="iOS",
+        os_version="17.2",
+        app_version=None,
+        ip_address="10.0.0.1",
+    )
+
+    session.execute.assert_awaited_once()
+    session.flush.assert_not_called()
+    statement = session.execute.await_args.args[0]
+    sql = str(statement.compile(dialect=dialect))
+    # no SELECT round trip: the single statement is the INSERT itself
+    assert sql.startswith("INSERT INTO user_devices")
+    assert "SELECT" not in sql
+    assert clause in sql
+    # optional fields the client omitted keep their stored value
+    assert "coalesce" in sql.lower()
+    assert statement.compile(dialect=dialect).params["last_login_at"] <= datetime.now(timezone.utc)
+
+
+@pytest.mark.asyncio
+async def test_upsert_device_falls_back_to_select_then_write(db_session, monkeypatch):
+    db_session.add(User(id="user-1", email="u1@example.com", hashed_password="x", name="U"))
+    await db_session.flush()
+    # pretend the bound dialect has no native upsert
+    monkeypatch.setattr(
+        "app.repositories.user_device.upsert_device_statement", lambda *_: None
+    )
+    repo = UserDeviceRepository(db_session)
+
+    await repo.upsert_device("user-1", "device-a", "iPhone", "iOS", "17.2", "1.0", "10.0.0.1")
+    await repo.deactivate_device("user-1", "device-a")
+    await repo.upsert_device("user-1", "device-a", None, "iOS", None, "1.1", "10.0.0.2")
+
+    device = await repo.get_by_user_and_device("user-1", "device-a")
+    assert device is not None
+    assert device.is_active is True
+    assert device.device_name == "iPhone"
+    assert device.os_version == "17.2"
+    assert device.app_version == "1.1"
+    assert device.last_login_ip == "10.0.0.2"
+
+
+def test_upsert_statement_is_none_for_unknown_dialects():
+    assert upsert_device_statement("mssql", {}) is None
+
+
+@pytest.mark.asyncio
+async def test_deactivation_is_set_based_and_counts_rows(db_session):
+    repo = UserDeviceRepository(db_session)
+    for n in range(3):
+        db_session.add(
+            User(id=f"user-{n}", email=f"u{n}@example.com", hashed_password="x", name="U")
+        )
+    await db_session.flush()
+    for n in range(3):
+        for d in range(2):
+            await repo.upsert_device(f"user-{n}", f"device-{d}", None, "iOS", None, None, None)
+
+    assert await repo.deactivate_device("user-0", "device-0") is True
+    assert await repo.deactivate_device("user-0", "device-0") is False
+    assert await repo.deactivate_all_devices("user-0") == 1
+    assert await repo.deactivate_devices_for_users(["user-1", "user-2"], batch_size=1) == 4
+    assert await repo.get_active_devices("user-2") == []